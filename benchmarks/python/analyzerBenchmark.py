@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+End-to-end and micro-benchmarks of the Python analytics tracking analyzer.
+
+Runs analyze_python_code over a synthetic corpus (see syntheticCorpus.py) or
+over real files, and reports throughput in files/s and events/s, per-file
+latency percentiles and the peak RSS of the process. Micro-benchmarks time the
+hot TrackingVisitor methods _extract_property_type and infer_sequence_item_type
+on every property value and sequence node of the corpus.
+
+Results are written as JSON to stdout (or --output); a readable summary goes to stderr.
+
+Usage: python3 benchmarks/python/analyzerBenchmark.py [--files N] [--repeat N] [--output FILE] [paths ...]
+"""
+
+import argparse
+import ast
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'analyze', 'python'))
+
+from phaseProfiler import distribution  # noqa: E402
+from pythonTrackingAnalyzer import TrackingVisitor, analyze_python_code, find_python_files, read_source  # noqa: E402
+from syntheticCorpus import CUSTOM_FUNCTION, add_corpus_arguments, corpus_options, generate_corpus  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def peak_rss():
+    """Peak resident set size of the process in bytes, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def benchmark_files(corpus, repeat):
+    """
+    Analyze every file of the corpus repeat times.
+    
+    Throughput is taken from the fastest run; latency percentiles cover every run.
+    """
+    best = None
+    latencies = []
+    events = 0
+    for _ in range(repeat):
+        events = 0
+        start = time.perf_counter()
+        for filepath, code in corpus:
+            file_start = time.perf_counter()
+            events += len(json.loads(analyze_python_code(code, filepath, CUSTOM_FUNCTION)))
+            latencies.append(time.perf_counter() - file_start)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    
+    latencies.sort()
+    return {
+        "files": len(corpus),
+        "events": events,
+        "bytes": sum(len(code.encode('utf-8', 'surrogatepass')) for _, code in corpus),
+        "seconds": best,
+        "filesPerSecond": len(corpus) / best if best else 0.0,
+        "eventsPerSecond": events / best if best else 0.0,
+        "latency": distribution(latencies),
+    }
+
+def collect_nodes(corpus):
+    """Collect the property value and sequence nodes of tracking-like dictionaries in the corpus."""
+    values = []
+    sequences = []
+    for _, code in corpus:
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError, RecursionError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Dict):
+                values.extend(value for value in node.values if value is not None)
+            elif isinstance(node, (ast.List, ast.Tuple)):
+                sequences.append(node)
+    return values, sequences
+
+def benchmark_method(method, nodes, repeat):
+    """Time a visitor method over nodes; report the best run in nanoseconds per call."""
+    if not nodes:
+        return {"calls": 0, "nsPerCall": None}
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for node in nodes:
+            method(node)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {"calls": len(nodes), "nsPerCall": best / len(nodes) * 1e9}
+
+def benchmark_methods(corpus, repeat):
+    """Micro-benchmark the property type inference methods of TrackingVisitor."""
+    values, sequences = collect_nodes(corpus)
+    visitor = TrackingVisitor('benchmark.py', CUSTOM_FUNCTION)
+    visitor.var_types.update({f'var_{i}': var_type for i, var_type in enumerate(('string', 'number', 'object', 'boolean'))})
+    visitor.var_types.update({'user_id': 'string', 'count': 'number'})
+    return {
+        "_extract_property_type": benchmark_method(visitor._extract_property_type, values, repeat),
+        "infer_sequence_item_type": benchmark_method(visitor.infer_sequence_item_type, sequences, repeat),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='*', help='Python files or directories to analyze instead of a synthetic corpus')
+    add_corpus_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark; the best is reported (default: 3)')
+    parser.add_argument('--micro-repeat', type=int, default=20, help='Runs per micro-benchmark (default: 20)')
+    parser.add_argument('--output', metavar='FILE', help='Write the JSON results to FILE instead of stdout')
+    args = parser.parse_args()
+    
+    rss_before = peak_rss()
+    if args.paths:
+        corpus = []
+        for filepath in find_python_files(args.paths):
+            try:
+                corpus.append((filepath, read_source(filepath)))
+            except OSError:
+                continue
+        source = {"paths": args.paths}
+    else:
+        options = corpus_options(args)
+        corpus = [(filepath, code) for filepath, code, _ in generate_corpus(args.files, **options)]
+        source = {"synthetic": dict(options, files=args.files)}
+    
+    results = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "corpus": source,
+        "analyze": benchmark_files(corpus, args.repeat),
+        "methods": benchmark_methods(corpus, args.micro_repeat),
+        "peakRss": peak_rss(),
+        "peakRssBeforeAnalysis": rss_before,
+    }
+    
+    analyze = results['analyze']
+    print(
+        f"{analyze['files']} files, {analyze['bytes']} bytes, {analyze['events']} events in {analyze['seconds'] * 1000:.1f} ms: "
+        f"{analyze['filesPerSecond']:.0f} files/s, {analyze['eventsPerSecond']:.0f} events/s",
+        file=sys.stderr
+    )
+    print('per-file latency ms: ' + '  '.join(f"{k} {v * 1000:.3f}" for k, v in analyze['latency'].items()), file=sys.stderr)
+    for name, method in results['methods'].items():
+        if method['nsPerCall'] is not None:
+            print(f"{name:<26} {method['nsPerCall']:10.0f} ns/call over {method['calls']} nodes", file=sys.stderr)
+    if results['peakRss'] is not None:
+        print(f"peak RSS {results['peakRss'] / 2**20:.1f} MiB", file=sys.stderr)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
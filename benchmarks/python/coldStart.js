@@ -0,0 +1,134 @@
+/**
+ * @fileoverview Cold-start benchmark of the Python analyzer on both engines
+ *
+ * Every run starts a fresh process, so each measurement includes interpreter
+ * startup, module imports and the analysis of one small file:
+ *
+ * - native: `python3 pythonTrackingAnalyzer.py FILE`, which compiles the analyzer
+ *   source on every start, against `python3 bytecodeBundle.py FILE`, which imports
+ *   it from a precompiled bytecode bundle. `python3 -c pass` is the floor.
+ * - pyodide: a fresh Node process initializing the Pyodide engine with bytecode
+ *   bundles disabled, against one loading the bundle built by an earlier run.
+ *
+ * Usage: node --experimental-vm-modules benchmarks/python/coldStart.js [runs]
+ */
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { spawnSync } = require('child_process');
+const { performance } = require('perf_hooks');
+const { findPythonInterpreter } = require('../../src/analyze/python/nativeWorker');
+
+const PYTHON_DIR = path.join(__dirname, '..', '..', 'src', 'analyze', 'python');
+const FIXTURE_PATH = path.join(__dirname, '..', '..', 'tests', 'fixtures', 'python', 'main.py');
+
+// Child script timing the Pyodide engine initialization, printed in milliseconds
+const PYODIDE_CHILD = `
+const { performance } = require('perf_hooks');
+const start = performance.now();
+require(${JSON.stringify(PYTHON_DIR)})._initPyodide()
+  .then(() => console.log(performance.now() - start))
+  .catch((error) => { console.error(error.message); process.exit(1); });
+`;
+
+function summarize(samples) {
+  const sorted = [...samples].sort((a, b) => a - b);
+  return {
+    min: sorted[0],
+    median: sorted[Math.floor(sorted.length / 2)],
+    max: sorted[sorted.length - 1],
+  };
+}
+
+function report(label, samples) {
+  const { min, median, max } = summarize(samples);
+  console.log(`${label.padEnd(34)} median ${median.toFixed(1).padStart(8)} ms  min ${min.toFixed(1).padStart(8)} ms  max ${max.toFixed(1).padStart(8)} ms`);
+  return median;
+}
+
+function timeProcess(command, args, env) {
+  const start = performance.now();
+  const result = spawnSync(command, args, { env, stdio: ['ignore', 'ignore', 'pipe'] });
+  const elapsed = performance.now() - start;
+  if (result.status !== 0) {
+    throw new Error(`${command} ${args.join(' ')} failed: ${result.stderr}`);
+  }
+  return elapsed;
+}
+
+function measureNative(python, runs, bytecodeDir) {
+  const env = { ...process.env, ANALYZE_TRACKING_BYTECODE_DIR: bytecodeDir };
+  const variants = [
+    ['interpreter only (python -c pass)', ['-c', 'pass']],
+    ['source (pythonTrackingAnalyzer.py)', [path.join(PYTHON_DIR, 'pythonTrackingAnalyzer.py'), FIXTURE_PATH]],
+    ['bundle (bytecodeBundle.py)', [path.join(PYTHON_DIR, 'bytecodeBundle.py'), FIXTURE_PATH]],
+  ];
+
+  // Build the bundle before measuring
+  timeProcess(python, variants[2][1], env);
+
+  console.log(`native: ${python}, ${runs} runs each`);
+  const medians = variants.map(([label, args]) => {
+    const samples = [];
+    for (let i = 0; i < runs; i++) {
+      samples.push(timeProcess(python, args, env));
+    }
+    return report(label, samples);
+  });
+  console.log(`bundle saves ${(medians[1] - medians[2]).toFixed(1)} ms per start\n`);
+}
+
+function measurePyodide(runs, bytecodeDir) {
+  const nodeArgs = ['--no-warnings=ExperimentalWarning', '--experimental-vm-modules', '-e', PYODIDE_CHILD];
+  const initialize = (dir) => {
+    const result = spawnSync(process.execPath, nodeArgs, {
+      env: { ...process.env, ANALYZE_TRACKING_BYTECODE_DIR: dir },
+      encoding: 'utf8',
+    });
+    if (result.status !== 0) {
+      throw new Error(result.stderr.trim());
+    }
+    return parseFloat(result.stdout);
+  };
+
+  try {
+    // Build the bundle before measuring
+    initialize(bytecodeDir);
+  } catch (error) {
+    console.log(`pyodide: skipped (${error.message})`);
+    return;
+  }
+
+  console.log(`pyodide: ${runs} runs each, engine initialization only`);
+  const medians = [
+    ['source', 'off'],
+    ['bundle', bytecodeDir],
+  ].map(([label, dir]) => {
+    const samples = [];
+    for (let i = 0; i < runs; i++) {
+      samples.push(initialize(dir));
+    }
+    return report(label, samples);
+  });
+  console.log(`bundle saves ${(medians[0] - medians[1]).toFixed(1)} ms per start`);
+}
+
+function main() {
+  const runs = parseInt(process.argv[2], 10) || 20;
+  const bytecodeDir = fs.mkdtempSync(path.join(os.tmpdir(), 'analyze-tracking-bytecode-'));
+
+  try {
+    const python = findPythonInterpreter();
+    if (python) {
+      measureNative(python, runs, bytecodeDir);
+    } else {
+      console.log('native: skipped (no system Python interpreter)\n');
+    }
+    measurePyodide(Math.max(1, Math.floor(runs / 4)), bytecodeDir);
+  } finally {
+    fs.rmSync(bytecodeDir, { recursive: true, force: true });
+  }
+}
+
+main();
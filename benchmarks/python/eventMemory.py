@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Memory held by analysis results, as __slots__ events versus JSON-shaped dicts.
+
+Analyzes a synthetic corpus (see syntheticCorpus.py) until the requested number
+of events is collected, then measures the deep size of the TrackingEvent and
+PropertySchema objects the visitor builds and of the same events converted to
+JSON-shaped dicts, which is how events used to be held. Every object is counted
+once, so strings shared by both representations weigh the same on both sides.
+With --no-intern each file gets its own intern table instead of one shared by
+the whole scan.
+
+Usage: python3 benchmarks/python/eventMemory.py [--events N] [--files N] [--no-intern]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'analyze', 'python'))
+
+from eventModel import InternTable  # noqa: E402
+from pythonTrackingAnalyzer import _analyze_source, provider_registry  # noqa: E402
+from syntheticCorpus import CUSTOM_FUNCTION, generate_corpus  # noqa: E402
+
+PER_EVENTS = 100_000
+
+def deep_size(root):
+    """Total size of an object and everything it references, counting each object once."""
+    seen = set()
+    stack = [root]
+    total = 0
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        total += sys.getsizeof(value)
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif hasattr(type(value), '__slots__'):
+            stack.extend(getattr(value, slot) for slot in type(value).__slots__)
+    return total
+
+def collect_events(corpus, registry, events_wanted, intern):
+    """Analyze the corpus, cycling through it, until events_wanted events are found."""
+    events = []
+    for filepath, code in itertools.cycle(corpus):
+        _analyze_source(code, filepath, registry, events.append, intern=intern)
+        if len(events) >= events_wanted:
+            return events
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=PER_EVENTS, help=f'Events to collect (default: {PER_EVENTS})')
+    parser.add_argument('--files', type=int, default=200, help='Distinct synthetic modules (default: 200)')
+    parser.add_argument('--no-intern', dest='intern', action='store_false', help='Do not share an intern table across files')
+    args = parser.parse_args()
+    
+    corpus = [(filepath, code) for filepath, code, _ in generate_corpus(args.files)]
+    intern = InternTable() if args.intern else None
+    events = collect_events(corpus, provider_registry(CUSTOM_FUNCTION), args.events, intern)
+    representations = {
+        'dicts': [event.to_json() for event in events],
+        'slots': events,
+    }
+    
+    results = {}
+    for label, held in representations.items():
+        size = deep_size(held)
+        results[label] = {"events": len(held), "bytes": size, "bytesPer100kEvents": size * PER_EVENTS / len(held)}
+    
+    saved = results['dicts']['bytesPer100kEvents'] - results['slots']['bytesPer100kEvents']
+    results['savedPer100kEvents'] = saved
+    results['savedRatio'] = saved / results['dicts']['bytesPer100kEvents']
+    
+    for label in ('dicts', 'slots'):
+        print(f"{label:<6} {results[label]['bytesPer100kEvents'] / 2**20:8.1f} MiB per 100k events", file=sys.stderr)
+    print(f"saved  {saved / 2**20:8.1f} MiB per 100k events ({results['savedRatio']:.0%})", file=sys.stderr)
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
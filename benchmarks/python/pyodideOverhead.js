@@ -0,0 +1,74 @@
+/**
+ * @fileoverview Benchmark of the per-file overhead of calling the Python analyzer through Pyodide
+ *
+ * Compares the legacy path, which re-executed pythonTrackingAnalyzer.py and passed
+ * input through `py.globals` for every file, with the module handle that is imported
+ * once per runtime.
+ *
+ * Usage: node --experimental-vm-modules benchmarks/python/pyodideOverhead.js [iterations]
+ */
+
+const fs = require('fs');
+const path = require('path');
+const { performance } = require('perf_hooks');
+const { _initPyodide } = require('../../src/analyze/python');
+
+const ANALYZER_PATH = path.join(__dirname, '..', '..', 'src', 'analyze', 'python', 'pythonTrackingAnalyzer.py');
+const FIXTURE_PATH = path.join(__dirname, '..', '..', 'tests', 'fixtures', 'python', 'main.py');
+const CUSTOM_FUNCTION = 'customTrackFunction';
+
+function legacyAnalyze(py, filePath) {
+  const code = fs.readFileSync(filePath, 'utf8');
+  const analyzerCode = fs.readFileSync(ANALYZER_PATH, 'utf8');
+  py.globals.set('code', code);
+  py.globals.set('filepath', filePath);
+  py.globals.set('custom_function', CUSTOM_FUNCTION);
+  py.globals.set('__name__', null);
+  py.runPython(analyzerCode);
+  return py.runPython('analyze_python_code(code, filepath, custom_function)');
+}
+
+function moduleAnalyze(analyzePythonCode, filePath) {
+  const code = fs.readFileSync(filePath, 'utf8');
+  return analyzePythonCode(code, filePath, CUSTOM_FUNCTION);
+}
+
+function measure(label, iterations, fn) {
+  // Warm up once so both paths start from a loaded runtime
+  fn();
+
+  const start = performance.now();
+  for (let i = 0; i < iterations; i++) {
+    fn();
+  }
+  const totalMs = performance.now() - start;
+  const perFileMs = totalMs / iterations;
+
+  console.log(`${label.padEnd(28)} ${totalMs.toFixed(1).padStart(10)} ms total  ${perFileMs.toFixed(3).padStart(8)} ms/file`);
+  return perFileMs;
+}
+
+async function main() {
+  const iterations = parseInt(process.argv[2], 10) || 500;
+  const py = await _initPyodide();
+
+  const analyzerModule = py.pyimport('pythonTrackingAnalyzer');
+  const analyzePythonCode = analyzerModule.analyze_python_code;
+
+  if (legacyAnalyze(py, FIXTURE_PATH) !== moduleAnalyze(analyzePythonCode, FIXTURE_PATH)) {
+    throw new Error('Legacy and module paths returned different results');
+  }
+
+  console.log(`Analyzing ${path.basename(FIXTURE_PATH)} ${iterations} times\n`);
+  const legacy = measure('runPython per file (legacy)', iterations, () => legacyAnalyze(py, FIXTURE_PATH));
+  const current = measure('imported module handle', iterations, () => moduleAnalyze(analyzePythonCode, FIXTURE_PATH));
+  console.log(`\nPer-file overhead removed: ${(legacy - current).toFixed(3)} ms (${(legacy / current).toFixed(1)}x faster)`);
+
+  analyzePythonCode.destroy();
+  analyzerModule.destroy();
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
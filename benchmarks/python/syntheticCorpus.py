@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Synthetic corpus generator for benchmarking the Python analytics tracking analyzer.
+
+Generates modules that look like application code: classes and functions with
+annotated and unannotated variables, ordinary statements that are not tracking
+calls, and tracking calls for every supported provider nested in if/for/with
+blocks. Property dictionaries mix constants, variables, lists and nested
+dictionaries. Generation is deterministic for a given seed and every module
+reports how many tracking events it contains.
+
+Usage: python3 benchmarks/python/syntheticCorpus.py OUTPUT_DIR [--files N] [--calls N] [--seed N] ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterator, List, Optional, Tuple
+
+CUSTOM_FUNCTION = 'customTrackFunction'
+
+# Tracking call templates per provider, formatted with the user id, event name and properties
+PROVIDER_TEMPLATES = {
+    'segment': 'analytics.track({user}, "{event}", {props})',
+    'mixpanel': 'mp.track({user}, "{event}", {props})',
+    'rudderstack': 'rudder_analytics.track({user}, "{event}", {props})',
+    'posthog': 'posthog.capture({user}, "{event}", {props})',
+    'amplitude': 'client.track(BaseEvent(event_type="{event}", user_id={user}, event_properties={props}))',
+    'snowplow': 'tracker.track(StructuredEvent(action="{event}", category="shop", label={user}, value=1.5))',
+    'custom': CUSTOM_FUNCTION + '("{event}", {props})',
+}
+
+# Default number of tracking calls per provider in each module
+DEFAULT_CALLS = dict.fromkeys(PROVIDER_TEMPLATES, 2)
+
+# Statements that are not tracking calls, formatted with a counter
+NOISE_STATEMENTS = [
+    'total_{i} = sum(item["price"] * item.get("qty", 1) for item in items if item)',
+    'ratio_{i} = (len(items) + {i}) / max(1, len(items)) - ({i} % 7) * 3.5',
+    'labels_{i} = [label.strip().lower() for label in str(user_id).split(",")]',
+    'logger.info("processed %s items", len(items))',
+    'self.metrics.track_time("handler_{i}", ratio_{i} if "ratio_{i}" in locals() else 0)',
+    'cache.set(f"user:{{user_id}}", {{"seen": True, "count": {i}}})',
+    'result_{i} = helpers.track_record(items, limit={i})',
+    'if not items:\n    return None',
+]
+
+# Block headers used to nest tracking calls
+BLOCK_HEADERS = [
+    'if user_id:',
+    'for item in items:',
+    'with lock:',
+    'while count > {depth}:',
+    'try:',
+]
+
+def _property_value(rng: random.Random, depth: int, dict_size: int, variables: List[str]) -> str:
+    """Pick a property value expression, nesting dictionaries up to depth levels."""
+    choices = ['string', 'number', 'boolean', 'none', 'variable', 'list']
+    if depth > 0:
+        choices.append('dict')
+    kind = rng.choice(choices)
+    
+    if kind == 'string':
+        return repr(f"value-{rng.randrange(1000)}")
+    if kind == 'number':
+        return str(rng.choice([rng.randrange(1000), round(rng.random() * 100, 2)]))
+    if kind == 'boolean':
+        return rng.choice(['True', 'False'])
+    if kind == 'none':
+        return 'None'
+    if kind == 'variable':
+        return rng.choice(variables)
+    if kind == 'list':
+        items = [rng.choice([repr('a'), str(rng.randrange(10)), rng.choice(variables)]) for _ in range(rng.randrange(0, 5))]
+        return '[' + ', '.join(items) + ']'
+    return _properties(rng, depth - 1, max(1, dict_size // 2), variables)
+
+def _properties(rng: random.Random, depth: int, dict_size: int, variables: List[str]) -> str:
+    """Build a property dictionary literal with dict_size keys."""
+    entries = [
+        f'"prop_{key}": {_property_value(rng, depth, dict_size, variables)}'
+        for key in range(dict_size)
+    ]
+    return '{' + ', '.join(entries) + '}'
+
+def _indent(lines: List[str], level: int) -> List[str]:
+    """Indent every line of a block by level steps of four spaces."""
+    prefix = '    ' * level
+    return [prefix + line if line else line for statement in lines for line in statement.split('\n')]
+
+def generate_module(
+    index: int,
+    rng: random.Random,
+    calls: Dict[str, int],
+    functions: int = 4,
+    nesting: int = 2,
+    dict_size: int = 4,
+    dict_depth: int = 2,
+    annotated: float = 0.5,
+    noise: int = 6,
+) -> Tuple[str, int]:
+    """
+    Generate one synthetic module.
+    
+    Args:
+        index: Module number, used in event names
+        rng: Random number generator
+        calls: Tracking calls per provider in the module (see PROVIDER_TEMPLATES)
+        functions: Number of methods the calls are spread over
+        nesting: Number of blocks each tracking call is nested in
+        dict_size: Number of keys in property dictionaries
+        dict_depth: Deepest nesting of dictionaries inside property dictionaries
+        annotated: Fraction of local variables with a type annotation
+        noise: Non-tracking statements per method
+    
+    Returns:
+        Tuple of (source, number of tracking events in the source)
+    """
+    lines = [
+        'import threading',
+        'from typing import Any, Dict, List',
+        '',
+        'import segment.analytics as analytics',
+        'from amplitude import Amplitude, BaseEvent',
+        'from snowplow_tracker import StructuredEvent',
+        '',
+        'lock = threading.Lock()',
+        'client = Amplitude("KEY")',
+        '',
+    ]
+    
+    pending = [provider for provider, count in calls.items() for _ in range(count)]
+    rng.shuffle(pending)
+    per_function = -(-len(pending) // max(1, functions))
+    
+    for function in range(functions):
+        variables = []
+        body = []
+        for v in range(4):
+            name = f'var_{v}'
+            value, annotation = rng.choice([
+                ('"text"', 'str'), ('42', 'int'), ('3.5', 'float'), ('True', 'bool'),
+                ('{"a": 1}', 'Dict[str, Any]'), ('[1, 2]', 'List[int]'),
+            ])
+            if rng.random() < annotated:
+                body.append(f'{name}: {annotation} = {value}')
+            else:
+                body.append(f'{name} = {value}')
+            variables.append(name)
+        variables += ['user_id', 'count', 'items']
+        
+        body += [rng.choice(NOISE_STATEMENTS).format(i=n) for n in range(noise)]
+        
+        for provider in pending[function * per_function:(function + 1) * per_function]:
+            call = PROVIDER_TEMPLATES[provider].format(
+                user='user_id',
+                event=f'{provider.title()} Event {index}.{function}.{rng.randrange(10000)}',
+                props=_properties(rng, dict_depth, dict_size, variables),
+            )
+            block = [call]
+            for depth in range(nesting):
+                header = rng.choice(BLOCK_HEADERS).format(depth=depth)
+                block = [header] + _indent(block, 1)
+                if header == 'try:':
+                    block += ['except Exception:', '    pass']
+            body += block
+        
+        body.append('return count')
+        lines += [
+            f'class Handler{index}_{function}:',
+            f'    def handle(self, user_id: str, items: list, count: int = {function}):',
+        ]
+        lines += _indent(body, 2)
+        lines.append('')
+    
+    return '\n'.join(lines), len(pending)
+
+def generate_corpus(
+    files: int,
+    seed: int = 0,
+    calls: Optional[Dict[str, int]] = None,
+    **options: int,
+) -> Iterator[Tuple[str, str, int]]:
+    """
+    Generate a synthetic corpus deterministically.
+    
+    Args:
+        files: Number of modules
+        seed: Random seed
+        calls: Tracking calls per provider in each module, defaults to DEFAULT_CALLS
+        **options: Other generate_module options
+    
+    Yields:
+        Tuples of (relative file path, source, number of tracking events)
+    """
+    rng = random.Random(seed)
+    calls = DEFAULT_CALLS if calls is None else calls
+    for index in range(files):
+        source, events = generate_module(index, rng, calls, **options)
+        yield f'pkg_{index // 100}/module_{index}.py', source, events
+
+def add_corpus_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the corpus shape options to an argument parser."""
+    parser.add_argument('--files', type=int, default=200, help='Number of modules (default: 200)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument(
+        '--calls',
+        type=int,
+        default=2,
+        help='Tracking calls per provider per module (default: 2)'
+    )
+    parser.add_argument(
+        '--provider-calls',
+        action='append',
+        default=[],
+        metavar='PROVIDER=N',
+        help='Override the calls per module for one provider, e.g. segment=10; repeatable'
+    )
+    parser.add_argument('--functions', type=int, default=4, help='Methods per module (default: 4)')
+    parser.add_argument('--nesting', type=int, default=2, help='Blocks around each tracking call (default: 2)')
+    parser.add_argument('--dict-size', type=int, default=4, help='Keys per property dictionary (default: 4)')
+    parser.add_argument('--dict-depth', type=int, default=2, help='Nested dictionary depth (default: 2)')
+    parser.add_argument('--annotated', type=float, default=0.5, help='Fraction of annotated variables (default: 0.5)')
+    parser.add_argument('--noise', type=int, default=6, help='Non-tracking statements per method (default: 6)')
+
+def corpus_options(args: argparse.Namespace) -> Dict[str, object]:
+    """Turn parsed corpus arguments into generate_corpus keyword arguments."""
+    calls = dict.fromkeys(PROVIDER_TEMPLATES, args.calls)
+    for override in args.provider_calls:
+        provider, _, count = override.partition('=')
+        if provider not in calls or not count.isdigit():
+            raise SystemExit(f'Invalid --provider-calls {override!r}; providers: {", ".join(PROVIDER_TEMPLATES)}')
+        calls[provider] = int(count)
+    
+    return {
+        'seed': args.seed,
+        'calls': calls,
+        'functions': args.functions,
+        'nesting': args.nesting,
+        'dict_size': args.dict_size,
+        'dict_depth': args.dict_depth,
+        'annotated': args.annotated,
+        'noise': args.noise,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('output', help='Directory to write the corpus to')
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+    
+    total_bytes = total_events = 0
+    for relative_path, source, events in generate_corpus(args.files, **corpus_options(args)):
+        filepath = os.path.join(args.output, relative_path)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(source)
+        total_bytes += len(source)
+        total_events += events
+    
+    print(f"Wrote {args.files} files, {total_bytes} bytes, {total_events} tracking calls to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the TrackingVisitor traversal on large files.
+
+Compares the iterative, type-dispatched walk of TrackingVisitor.visit with the
+recursive ast.NodeVisitor.generic_visit traversal it replaced. Both run the
+same handlers on the same pre-parsed trees, so only traversal cost is measured.
+
+Usage: python3 benchmarks/python/visitorTraversal.py [--functions N] [--repeat N] [paths ...]
+"""
+
+import argparse
+import ast
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'analyze', 'python'))
+
+from pythonTrackingAnalyzer import TrackingVisitor, find_python_files, read_source  # noqa: E402
+
+CUSTOM_FUNCTION = 'customTrackFunction'
+
+class RecursiveTrackingVisitor(TrackingVisitor):
+    """TrackingVisitor driven by the previous recursive ast.NodeVisitor traversal."""
+    
+    def visit(self, node):
+        handler = getattr(self, 'visit_' + node.__class__.__name__, None)
+        if handler is None:
+            self.generic_visit(node)
+            return
+        handler(node)
+    
+    def generic_visit(self, node):
+        ast.NodeVisitor.generic_visit(self, node)
+    
+    def visit_FunctionDef(self, node):
+        super().visit_FunctionDef(node)
+        self.generic_visit(node)
+        self._exit_scope()
+    
+    def visit_ClassDef(self, node):
+        super().visit_ClassDef(node)
+        self.generic_visit(node)
+        self._exit_scope()
+    
+    def visit_AnnAssign(self, node):
+        super().visit_AnnAssign(node)
+        self.generic_visit(node)
+    
+    def visit_Assign(self, node):
+        super().visit_Assign(node)
+        self.generic_visit(node)
+    
+    def visit_Call(self, node):
+        super().visit_Call(node)
+        self.generic_visit(node)
+
+def synthetic_source(functions):
+    """Build a large module mixing ordinary code with tracking calls."""
+    lines = ['import analytics', '']
+    for i in range(functions):
+        lines += [
+            f'class Handler{i}:',
+            f'    def handle(self, user_id: str, items: list, count: int = {i}):',
+            '        total = sum(item["price"] * item.get("qty", 1) for item in items if item)',
+            '        ratio = (total + count) / max(1, len(items)) - (count % 7) * 3.5',
+            '        label = "big" if total > 100 and ratio < 2 or not items else "small"',
+            '        tags = [t.strip().lower() for t in label.split(",")] + ["a", "b", "c"]',
+            f'        analytics.track(user_id, "Event {i}", {{"total": total, "tags": tags, "count": count}})',
+            f'        {CUSTOM_FUNCTION}("Custom {i}", {{"label": label, "nested": {{"ratio": ratio}}}})',
+            '        return {"total": total, "ratio": ratio, "label": label}',
+            '',
+        ]
+    return '\n'.join(lines)
+
+def measure(label, visitor_class, trees, repeat):
+    """Walk every tree repeat times and report the best run."""
+    best = None
+    events = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        events = []
+        for filepath, tree in trees:
+            visitor = visitor_class(filepath, CUSTOM_FUNCTION)
+            visitor.visit(tree)
+            events.extend(visitor.events)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    
+    print(f"{label:<28} {best * 1000:10.1f} ms  {len(events):8d} events")
+    return best, events
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='*', help='Python files or directories to walk instead of the synthetic module')
+    parser.add_argument('--functions', type=int, default=2000, help='Classes in the synthetic module (default: 2000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per traversal; the best is reported (default: 5)')
+    args = parser.parse_args()
+    
+    if args.paths:
+        trees = []
+        for filepath in find_python_files(args.paths):
+            try:
+                trees.append((filepath, ast.parse(read_source(filepath))))
+            except (SyntaxError, ValueError, RecursionError):
+                continue
+    else:
+        trees = [('synthetic.py', ast.parse(synthetic_source(args.functions)))]
+    
+    nodes = sum(1 for _, tree in trees for _ in ast.walk(tree))
+    print(f"{len(trees)} files, {nodes} AST nodes")
+    
+    recursive, recursive_events = measure('recursive generic_visit', RecursiveTrackingVisitor, trees, args.repeat)
+    iterative, iterative_events = measure('iterative targeted walk', TrackingVisitor, trees, args.repeat)
+    
+    if recursive_events != iterative_events:
+        raise SystemExit('Traversals returned different events')
+    print(f"speedup: {recursive / iterative:.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -3,15 +3,36 @@
  * @module analyze-tracking/analyze
  */
 
+const crypto = require('crypto');
 const path = require('path');
 const ts = require('typescript');
 const { getAllFiles } = require('../utils/fileProcessor');
 const { analyzeJsFile } = require('./javascript');
 const { analyzeTsFile } = require('./typescript');
-const { analyzePythonFile } = require('./python');
+const { analyzePythonFiles } = require('./python');
 const { analyzeRubyFile } = require('./ruby');
 const { analyzeGoFile } = require('./go');
 
+// Number of Python files sent to the Python analyzer per call
+const PYTHON_BATCH_SIZE = 200;
+
+async function analyzePythonFilesInBatches(pythonFiles, customFunction, projectRoot) {
+  const eventsByFile = new Map(pythonFiles.map(file => [file, []]));
+  // Files under the project root are listed and re-indexed once per scan, not once per batch
+  const scanId = crypto.randomUUID();
+
+  for (let i = 0; i < pythonFiles.length; i += PYTHON_BATCH_SIZE) {
+    const batch = pythonFiles.slice(i, i + PYTHON_BATCH_SIZE);
+    // Event names defined as constants in files of other batches resolve against the whole project
+    const events = await analyzePythonFiles(batch, customFunction, { projectRoot, scanId });
+    events.forEach((event) => {
+      eventsByFile.get(event.filePath).push(event);
+    });
+  }
+
+  return eventsByFile;
+}
+
 async function analyzeDirectory(dirPath, customFunction) {
   const allEvents = {};
 
@@ -21,6 +42,8 @@ async function analyzeDirectory(dirPath, customFunction) {
     target: ts.ScriptTarget.ESNext,
     module: ts.ModuleKind.CommonJS,
   });
+  const pythonFiles = files.filter(file => /\.(py)$/.test(file));
+  const pythonEventsByFile = await analyzePythonFilesInBatches(pythonFiles, customFunction, dirPath);
 
   for (const file of files) {
     let events = [];
@@ -36,7 +59,7 @@ async function analyzeDirectory(dirPath, customFunction) {
     } else if (isTsFile) {
       events = analyzeTsFile(file, tsProgram, customFunction);
     } else if (isPythonFile) {
-      events = await analyzePythonFile(file, customFunction);
+      events = pythonEventsByFile.get(file);
     } else if (isRubyFile) {
       events = await analyzeRubyFile(file, customFunction);
     } else if (isGoFile) {
@@ -0,0 +1,325 @@
+"""
+Compact columnar binary format for analysis results.
+
+Results are stored as fixed-width little-endian columns with string and schema
+tables, so a reader can seek straight to any event with struct.unpack_from and
+decode it without touching the rest of the file:
+
+    header          HEADER: magic, version, counts and section offsets
+    string offsets  u32 x (strings + 1), byte offsets into the string data
+    string data     UTF-8 strings, concatenated
+    schema offsets  u32 x (schemas + 1), word offsets into the schema words
+    schema words    u32 per schema: type, items (or NONE), property count (NONE
+                    when the schema has no properties), then (name, schema) pairs
+    columns         u32 x events for each of COLUMNS, one column after the other
+    name kinds      u8 x events: NAME_STRING, or NAME_JSON when the event name is
+                    not a string and is stored as its JSON text
+    property offsets u32 x (events + 1), word offsets into the property words
+    property words  u32 (name, schema) pairs of every event
+
+Strings and schemas are stored once and referred to by index; NONE marks a
+missing value. Only the standard library (struct, array) is needed to read or
+write the format.
+
+Usage: python3 binaryResults.py FILE  (prints the results as JSON)
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from eventModel import PropertySchema, TrackingEvent
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Tuple, Union
+
+MAGIC = b'PTAR'
+
+# Bumped whenever the layout changes; readers reject other versions
+FORMAT_VERSION = 1
+
+# magic, version, flags, events, strings, schemas, then the offsets of the sections
+HEADER = struct.Struct('<4sHHIII8Q')
+
+# Event fields stored as u32 columns, in file order
+COLUMNS = ('eventName', 'source', 'filePath', 'functionName', 'line')
+
+# Index marking a missing string or schema
+NONE = 0xFFFFFFFF
+
+# Event name kinds
+NAME_STRING = 0
+NAME_JSON = 1
+
+_U32 = struct.Struct('<I')
+
+def _u32_array(values: Iterable[int]) -> array:
+    """Build a little-endian u32 array."""
+    words = array('I', values)
+    if sys.byteorder == 'big':
+        words.byteswap()
+    return words
+
+def _json_key(key: Any) -> str:
+    """Convert a property name to the string json.dumps would write for it."""
+    if type(key) is str:
+        return key
+    return next(iter(json.loads(json.dumps({key: None}))))
+
+class _Tables:
+    """String and schema tables built while writing."""
+    
+    def __init__(self):
+        self.strings: List[str] = []
+        self.string_ids: Dict[str, int] = {}
+        self.schema_words: List[int] = []
+        self.schema_offsets: List[int] = []
+        self.schema_ids: Dict[Tuple[Any, ...], int] = {}
+        # Interned PropertySchema instances recur constantly; remember their ids by identity
+        self._schema_objects: Dict[int, Tuple[PropertySchema, int]] = {}
+    
+    def string(self, value: Any) -> int:
+        if value is None:
+            return NONE
+        index = self.string_ids.get(value)
+        if index is None:
+            index = self.string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+    
+    def properties(self, properties: Dict[Any, Any]) -> List[int]:
+        words = []
+        for name, schema in properties.items():
+            words.append(self.string(_json_key(name)))
+            words.append(self.schema(schema))
+        return words
+    
+    def schema(self, schema: Any) -> int:
+        if isinstance(schema, PropertySchema):
+            known = self._schema_objects.get(id(schema))
+            if known is not None:
+                return known[1]
+            schema_type, items, properties = schema.type, schema.items, schema.properties
+        else:
+            schema_type, items, properties = schema['type'], schema.get('items'), schema.get('properties')
+        
+        words = [
+            self.string(schema_type),
+            NONE if items is None else self.schema(items),
+            NONE if properties is None else len(properties),
+        ]
+        if properties is not None:
+            words += self.properties(properties)
+        
+        key = tuple(words)
+        index = self.schema_ids.get(key)
+        if index is None:
+            index = self.schema_ids[key] = len(self.schema_offsets)
+            self.schema_offsets.append(len(self.schema_words))
+            self.schema_words.extend(words)
+        if isinstance(schema, PropertySchema):
+            self._schema_objects[id(schema)] = (schema, index)
+        return index
+
+def dumps(events: Iterable[Union[TrackingEvent, Dict[str, Any]]]) -> bytes:
+    """
+    Encode events in the binary format.
+    
+    Args:
+        events: Events, as TrackingEvent objects or in JSON shape
+    
+    Returns:
+        The encoded results
+    """
+    tables = _Tables()
+    columns: Dict[str, List[int]] = {column: [] for column in COLUMNS}
+    name_kinds = bytearray()
+    property_offsets = [0]
+    property_words: List[int] = []
+    
+    for event in events:
+        if isinstance(event, TrackingEvent):
+            name, source, file_path, function_name, line, properties = (
+                event.event_name, event.source, event.file_path, event.function_name, event.line, event.properties
+            )
+        else:
+            name, source, file_path, function_name, line, properties = (
+                event['eventName'], event['source'], event['filePath'], event['functionName'], event['line'], event['properties']
+            )
+        
+        if type(name) is str:
+            name_kinds.append(NAME_STRING)
+        else:
+            name_kinds.append(NAME_JSON)
+            name = json.dumps(name)
+        columns['eventName'].append(tables.string(name))
+        columns['source'].append(tables.string(source))
+        columns['filePath'].append(tables.string(file_path))
+        columns['functionName'].append(tables.string(function_name))
+        columns['line'].append(line)
+        property_words += tables.properties(properties)
+        property_offsets.append(len(property_words))
+    
+    encoded = [string.encode('utf-8', 'surrogatepass') for string in tables.strings]
+    string_offsets = [0]
+    for data in encoded:
+        string_offsets.append(string_offsets[-1] + len(data))
+    tables.schema_offsets.append(len(tables.schema_words))
+    
+    sections = [
+        _u32_array(string_offsets).tobytes(),
+        b''.join(encoded),
+        _u32_array(tables.schema_offsets).tobytes(),
+        _u32_array(tables.schema_words).tobytes(),
+        b''.join(_u32_array(columns[column]).tobytes() for column in COLUMNS),
+        bytes(name_kinds),
+        _u32_array(property_offsets).tobytes(),
+        _u32_array(property_words).tobytes(),
+    ]
+    
+    offsets = []
+    body = bytearray()
+    for section in sections:
+        # Keep every section 4-byte aligned
+        body += b'\0' * (-(HEADER.size + len(body)) % 4)
+        offsets.append(HEADER.size + len(body))
+        body += section
+    
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, len(name_kinds), len(tables.strings), len(tables.schema_offsets) - 1, *offsets
+    )
+    return header + bytes(body)
+
+def write_results(events: Iterable[Union[TrackingEvent, Dict[str, Any]]], stream: BinaryIO) -> None:
+    """
+    Write events to a binary stream in the binary format.
+    
+    Args:
+        events: Events, as TrackingEvent objects or in JSON shape
+        stream: Binary stream to write to
+    """
+    stream.write(dumps(events))
+
+class BinaryResults:
+    """
+    Random-access reader for results in the binary format.
+    
+    Events are decoded on demand; indexing reads only the columns, strings and
+    schemas of the requested event.
+    
+    Attributes:
+        events: Number of events
+        strings: Number of strings in the string table
+        schemas: Number of schemas in the schema table
+    """
+    
+    def __init__(self, data: Union[bytes, bytearray, memoryview, mmap.mmap]):
+        """
+        Open encoded results.
+        
+        Args:
+            data: The encoded results, e.g. the contents of a file or an mmap of it
+        
+        Raises:
+            ValueError: If data is not in a supported version of the format
+        """
+        if len(data) < HEADER.size:
+            raise ValueError('Truncated binary results')
+        (magic, version, _, self.events, self.strings, self.schemas,
+         self._string_offsets, self._string_data, self._schema_offsets, self._schema_words,
+         self._columns, self._name_kinds, self._property_offsets, self._property_words) = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('Not binary analysis results')
+        if version != FORMAT_VERSION:
+            raise ValueError(f'Unsupported binary results version {version}')
+        self._data = data
+        self._string_cache: Dict[int, str] = {}
+    
+    @classmethod
+    def open(cls, path: str) -> 'BinaryResults':
+        """Memory-map a results file and open it."""
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    
+    def _u32(self, offset: int) -> int:
+        return _U32.unpack_from(self._data, offset)[0]
+    
+    def string(self, index: int) -> Any:
+        """Return a string of the string table, or None for NONE."""
+        if index == NONE:
+            return None
+        value = self._string_cache.get(index)
+        if value is None:
+            start = self._u32(self._string_offsets + 4 * index)
+            end = self._u32(self._string_offsets + 4 * index + 4)
+            data = self._data[self._string_data + start:self._string_data + end]
+            value = self._string_cache[index] = bytes(data).decode('utf-8', 'surrogatepass')
+        return value
+    
+    def schema(self, index: int) -> Dict[str, Any]:
+        """Decode a schema of the schema table to its JSON shape."""
+        offset = self._schema_words + 4 * self._u32(self._schema_offsets + 4 * index)
+        schema_type, items, count = struct.unpack_from('<3I', self._data, offset)
+        result: Dict[str, Any] = {"type": self.string(schema_type)}
+        if count != NONE:
+            result['properties'] = self._properties(offset + 12, count)
+        if items != NONE:
+            result['items'] = self.schema(items)
+        return result
+    
+    def _properties(self, offset: int, count: int) -> Dict[str, Any]:
+        words = struct.unpack_from(f'<{2 * count}I', self._data, offset)
+        return {self.string(words[i]): self.schema(words[i + 1]) for i in range(0, len(words), 2)}
+    
+    def column(self, name: str, index: int) -> int:
+        """Return the raw u32 value of a column (see COLUMNS) for an event."""
+        return self._u32(self._columns + 4 * (COLUMNS.index(name) * self.events + index))
+    
+    def __len__(self) -> int:
+        return self.events
+    
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Decode one event to its JSON shape."""
+        if index < 0:
+            index += self.events
+        if not 0 <= index < self.events:
+            raise IndexError('event index out of range')
+        
+        values = [self._u32(self._columns + 4 * (column * self.events + index)) for column in range(len(COLUMNS))]
+        name = self.string(values[0])
+        if self._data[self._name_kinds + index] == NAME_JSON:
+            name = json.loads(name)
+        
+        start, end = struct.unpack_from('<2I', self._data, self._property_offsets + 4 * index)
+        return {
+            "eventName": name,
+            "source": self.string(values[1]),
+            "properties": self._properties(self._property_words + 4 * start, (end - start) // 2),
+            "filePath": self.string(values[2]),
+            "line": values[4],
+            "functionName": self.string(values[3]),
+        }
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self.events):
+            yield self[index]
+    
+    def to_json(self) -> List[Dict[str, Any]]:
+        """Decode every event to its JSON shape."""
+        return list(self)
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 1:
+        print('Usage: binaryResults.py FILE', file=sys.stderr)
+        return 2
+    print(json.dumps(BinaryResults.open(argv[0]).to_json()))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
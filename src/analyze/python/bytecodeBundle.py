@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Precompiled bytecode bundle of the Python analytics tracking analyzer.
+
+Running pythonTrackingAnalyzer.py as a script compiles its source on every
+start: CPython never caches the bytecode of the __main__ script, and read-only
+installs or PYTHONDONTWRITEBYTECODE leave no __pycache__ for the modules it
+imports. Pyodide starts from an empty in-memory file system, so it recompiles
+every module each time the analyzer is loaded.
+
+This module compiles the analyzer modules once into a zip archive of .pyc files
+that zipimport loads directly, in CPython and in Pyodide alike. Bundles are kept
+in a cache directory and named after the interpreter's cache tag and bytecode
+magic number and a checksum of the sources, so interpreters of different
+versions keep separate bundles and any change to the sources is recompiled.
+
+Usage: python3 bytecodeBundle.py [analyzer arguments ...]
+
+runs the analyzer command line (see pythonTrackingAnalyzer.main) from the
+bundle, building it first if needed. The bundle directory defaults to
+$XDG_CACHE_HOME/analyze-tracking (~/.cache/analyze-tracking) and can be set
+with the ANALYZE_TRACKING_BYTECODE_DIR environment variable, or set to "off"
+to import the analyzer from source.
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+import sys
+import zlib
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Optional
+
+# Analyzer modules compiled into the bundle
+BUNDLE_MODULES = (
+    'pythonTrackingAnalyzer',
+    'eventModel',
+    'providerRegistry',
+    'importScan',
+    'phaseProfiler',
+    'resultCache',
+    'skipPolicy',
+    'incrementalScan',
+    'binaryResults',
+    'constantIndex',
+    'resultStore',
+    'scanManifest',
+)
+
+# Environment variable naming the bundle directory, or "off"
+BUNDLE_DIR_VARIABLE = 'ANALYZE_TRACKING_BYTECODE_DIR'
+
+# .pyc flags of an unchecked hash-based pyc (PEP 552): the bundle name already pins the sources
+_UNCHECKED_HASH_FLAGS = 0b01
+
+def default_bundle_dir() -> Optional[str]:
+    """
+    Return the directory bundles are kept in, or None when bundles are disabled.
+    
+    Returns:
+        The ANALYZE_TRACKING_BYTECODE_DIR directory, or the analyze-tracking
+        directory of the user cache directory
+    """
+    configured = os.environ.get(BUNDLE_DIR_VARIABLE)
+    if configured == 'off':
+        return None
+    if configured:
+        return configured
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'analyze-tracking')
+
+def _read_sources(source_dir: str) -> Dict[str, bytes]:
+    """Read the source of every bundled module."""
+    sources = {}
+    for module in BUNDLE_MODULES:
+        with open(os.path.join(source_dir, module + '.py'), 'rb') as f:
+            sources[module] = f.read()
+    return sources
+
+def _magic_number() -> bytes:
+    from importlib.util import MAGIC_NUMBER
+    return MAGIC_NUMBER
+
+def bundle_name(sources: Dict[str, bytes]) -> str:
+    """
+    Name the bundle of a set of sources for the running interpreter.
+    
+    Args:
+        sources: Source bytes of every bundled module, by module name
+    
+    Returns:
+        File name of the bundle
+    """
+    crc, adler = 0, 1
+    for module in BUNDLE_MODULES:
+        data = module.encode() + b'\0' + sources[module] + b'\0'
+        crc = zlib.crc32(data, crc)
+        adler = zlib.adler32(data, adler)
+    tag = sys.implementation.cache_tag or sys.implementation.name
+    return f"analyzer-{tag}-{_magic_number().hex()}-{crc:08x}{adler:08x}.zip"
+
+def build_bundle(source_dir: str, path: str, sources: Optional[Dict[str, bytes]] = None) -> None:
+    """
+    Compile the analyzer modules into a bundle.
+    
+    The archive is written to a temporary file and renamed into place, so
+    concurrent builds never expose a partial bundle. Sources are stored next
+    to the bytecode for tracebacks and the result cache fingerprint.
+    
+    Args:
+        source_dir: Directory holding the analyzer sources
+        path: Path of the bundle to write
+        sources: Source bytes by module name, read from source_dir when omitted
+    
+    Raises:
+        OSError: If the bundle cannot be written
+        SyntaxError: If a module does not compile
+    """
+    import zipfile
+    from importlib.util import source_hash
+    
+    if sources is None:
+        sources = _read_sources(source_dir)
+    header_flags = _UNCHECKED_HASH_FLAGS.to_bytes(4, 'little')
+    
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_STORED) as bundle:
+            for module, source in sources.items():
+                source_path = os.path.join(source_dir, module + '.py')
+                code = compile(source, source_path, 'exec', dont_inherit=True)
+                pyc = _magic_number() + header_flags + source_hash(source) + marshal.dumps(code)
+                bundle.writestr(module + '.pyc', pyc)
+                bundle.writestr(module + '.py', source)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+def _remove_stale_bundles(bundle_dir: str, current: str) -> None:
+    """Remove the bundles of other sources built by the same interpreter."""
+    prefix = current[:current.rindex('-') + 1]
+    for name in os.listdir(bundle_dir):
+        if name.startswith(prefix) and name.endswith('.zip') and name != current:
+            try:
+                os.unlink(os.path.join(bundle_dir, name))
+            except OSError:
+                pass
+
+def load_bundle(source_dir: str, bundle_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Make the analyzer modules importable from their bytecode bundle.
+    
+    Builds the bundle for the running interpreter if it does not exist yet and
+    puts it first on sys.path. Any failure leaves sys.path untouched, so the
+    modules are then imported from source as usual.
+    
+    Args:
+        source_dir: Directory holding the analyzer sources
+        bundle_dir: Directory bundles are kept in; defaults to default_bundle_dir()
+    
+    Returns:
+        Path of the bundle, or None if the modules are imported from source
+    """
+    if bundle_dir is None:
+        bundle_dir = default_bundle_dir()
+        if bundle_dir is None:
+            return None
+    try:
+        sources = _read_sources(source_dir)
+        name = bundle_name(sources)
+        path = os.path.join(bundle_dir, name)
+        if not os.path.exists(path):
+            os.makedirs(bundle_dir, exist_ok=True)
+            build_bundle(source_dir, path, sources)
+            _remove_stale_bundles(bundle_dir, name)
+    except (OSError, SyntaxError, ValueError):
+        return None
+    sys.path.insert(0, path)
+    return path
+
+def main() -> int:
+    """Run the analyzer command line from the bundle."""
+    load_bundle(os.path.dirname(os.path.abspath(__file__)))
+    from pythonTrackingAnalyzer import main as analyzer_main
+    return analyzer_main()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,519 @@
+"""
+Project-wide index of module-level string constants for the Python analytics tracking analyzer.
+
+Event names are often defined once as module constants and referenced at the
+call sites:
+
+    # app/events.py
+    SIGNUP_COMPLETED = "Signup Completed"
+
+    # app/views.py
+    from app import events
+    analytics.track(user_id, events.SIGNUP_COMPLETED, {...})
+
+A ConstantIndex records, for every module of a project, its module-level string
+constants (including those of top-level classes, as "Class.NAME"), its
+module-level name aliases and its imports. Modules are not parsed: a few
+regular expressions run over the raw source bytes, so indexing costs a small
+fraction of analyzing the project. Call sites are then resolved by dictionary
+lookups, following imports and re-exports from module to module.
+
+Modules are named after their path (app/events.py is "...app.events"), and an
+imported module is the one whose name ends with the imported dotted name,
+preferring the one closest to the importing file, so no sys.path or package
+layout needs to be configured.
+
+Indexes can be saved and loaded; entries of files whose size and modification
+time are unchanged are reused without reading the files again.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+from importScan import IMPORT_STATEMENTS, imported_names
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Dict, Iterable, List, Optional, Pattern, Sequence, Set, Tuple, Union
+
+# Bumped whenever the layout of saved indexes changes
+INDEX_FORMAT_VERSION = 1
+
+# Most links (imports, aliases) followed while resolving one name, which also stops import cycles
+MAX_HOPS = 16
+
+# Files modified this recently may change again within the file system's timestamp
+# granularity, so their entries are not reused by stat alone
+RACY_WINDOW_NS = 2_000_000_000
+
+_STRING = rb'[rRuU]?(?:"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\')'
+_END = rb'[ \t]*(?:#[^\n]*)?\r?$'
+
+# Unindented statements the index records. Every alternative starts with the newline
+# ending the previous line (the source is scanned with one prepended), a literal prefix
+# the regex engine skips to quickly, where a "^" anchor would be tried at every byte.
+_STATEMENT_PATTERN = re.compile(
+    rb'\n(?:' + IMPORT_STATEMENTS
+    + rb'|class[ \t]+(?P<class>\w+)[^\n]*:' + _END + rb'(?P<body>(?:\n(?:[ \t]+[^\n]*|\r?(?=\n)))*)'
+    rb'|(?P<name>[A-Za-z_]\w*)[ \t]*(?::[^=\n]*)?=[ \t]*(?:(?P<string>' + _STRING + rb')|(?P<alias>[A-Za-z_][\w.]*))' + _END
+    + rb')',
+    re.M
+)
+_INDENT_PATTERN = re.compile(rb'\n([ \t]+)\S')
+
+_class_constant_patterns: Dict[bytes, Pattern[bytes]] = {}
+
+def module_name(filepath: str) -> Tuple[str, bool]:
+    """
+    Name a module after its path.
+    
+    Args:
+        filepath: Path of the Python file
+    
+    Returns:
+        The dotted name of the module, e.g. "home.me.app.events" for
+        /home/me/app/events.py or "home.me.app" for /home/me/app/__init__.py,
+        and whether the file is a package's __init__.py
+    """
+    parts = [part for part in re.split(r'[\\/]', os.path.splitext(os.path.abspath(filepath))[0]) if part]
+    is_package = bool(parts) and parts[-1] == '__init__'
+    if is_package:
+        parts.pop()
+    return '.'.join(parts), is_package
+
+def _string_value(literal: bytes) -> Optional[str]:
+    """Evaluate a single-line string literal."""
+    try:
+        value = ast.literal_eval(literal.decode('utf-8', 'replace'))
+    except (SyntaxError, ValueError):
+        return None
+    return value if isinstance(value, str) else None
+
+def _class_constant_pattern(indent: bytes) -> Pattern[bytes]:
+    """Return the pattern of string constants assigned at one indentation level of a class body."""
+    pattern = _class_constant_patterns.get(indent)
+    if pattern is None:
+        pattern = _class_constant_patterns[indent] = re.compile(
+            rb'\n' + re.escape(indent) + rb'([A-Za-z_]\w*)[ \t]*(?::[^=\n]*)?=[ \t]*(' + _STRING + rb')' + _END, re.M
+        )
+    return pattern
+
+class ModuleConstants:
+    """
+    Constants, aliases and imports of one module.
+    
+    Attributes:
+        name: Dotted name of the module (see module_name)
+        is_package: Whether the module is a package's __init__.py
+        constants: String value of each module-level constant, by name or "Class.NAME"
+        links: Target of each imported name and module-level alias, as a
+            (module, attribute) pair: (module, None) binds a module, (module,
+            name) a name imported from a module and (None, "a.b") an alias of
+            another name of this module
+        stars: Modules whose names are all imported with "from module import *"
+        size: Size of the file when it was indexed, or None if it was not read from disk
+        mtime_ns: Modification time of the file when it was indexed, or None
+    """
+    
+    __slots__ = ('name', 'is_package', 'constants', 'links', 'stars', 'size', 'mtime_ns')
+    
+    def __init__(
+        self,
+        name: str,
+        is_package: bool = False,
+        constants: Optional[Dict[str, str]] = None,
+        links: Optional[Dict[str, Tuple[Optional[str], Optional[str]]]] = None,
+        stars: Sequence[str] = (),
+        size: Optional[int] = None,
+        mtime_ns: Optional[int] = None,
+    ):
+        self.name = name
+        self.is_package = is_package
+        self.constants = constants if constants is not None else {}
+        self.links = links if links is not None else {}
+        self.stars = list(stars)
+        self.size = size
+        self.mtime_ns = mtime_ns
+    
+    @classmethod
+    def scan(cls, filepath: str, code: Union[str, bytes]) -> 'ModuleConstants':
+        """
+        Index the source of a module.
+        
+        Only unindented statements, and the unindented body statements of
+        top-level classes, are considered: single-line string assignments,
+        assignments of another name, and import statements.
+        
+        Args:
+            filepath: Path of the file, which names the module
+            code: Source code, as text or bytes
+        
+        Returns:
+            The module's index entry
+        """
+        if isinstance(code, str):
+            code = code.encode('utf-8', 'surrogatepass')
+        name, is_package = module_name(filepath)
+        module = cls(name, is_package)
+        constants = module.constants
+        links = module.links
+        
+        for match in _STATEMENT_PATTERN.finditer(b'\n' + code):
+            assigned, string, modules, names, body = match.group('name', 'string', 'modules', 'names', 'body')
+            if assigned is not None:
+                assigned = assigned.decode('ascii')
+                if string is not None:
+                    value = _string_value(string)
+                    if value is not None:
+                        constants[assigned] = value
+                        links.pop(assigned, None)
+                else:
+                    links[assigned] = (None, match.group('alias').decode('ascii'))
+                    constants.pop(assigned, None)
+            elif modules is not None:
+                for imported, alias in imported_names(modules):
+                    if alias is not None:
+                        links[alias] = (imported, None)
+                    else:
+                        # "import a.b" binds "a"; a.b.NAME is resolved from it
+                        head = imported.split('.', 1)[0]
+                        links[head] = (head, None)
+            elif names is not None:
+                source = module._absolute(len(match.group('level')), match.group('source').decode('ascii', 'replace'))
+                for imported, alias in imported_names(names):
+                    if imported == '*':
+                        module.stars.append(source)
+                    else:
+                        links[alias or imported] = (source, imported)
+            else:
+                indent = _INDENT_PATTERN.search(body)
+                if indent is None:
+                    continue
+                prefix = match.group('class').decode('ascii') + '.'
+                for constant in _class_constant_pattern(indent.group(1)).finditer(body):
+                    value = _string_value(constant.group(2))
+                    if value is not None:
+                        constants[prefix + constant.group(1).decode('ascii')] = value
+        return module
+    
+    def _absolute(self, level: int, name: str) -> str:
+        """Resolve a possibly relative imported module name against this module."""
+        if not level:
+            return name
+        parts = self.name.split('.')
+        if not self.is_package:
+            parts.pop()
+        if level > 1:
+            parts = parts[:len(parts) - (level - 1)]
+        if name:
+            parts.append(name)
+        return '.'.join(parts)
+    
+    def to_json(self) -> list:
+        """Serialize the entry compactly."""
+        return [
+            self.name, self.is_package, self.constants,
+            {name: list(target) for name, target in self.links.items()},
+            self.stars, self.size, self.mtime_ns,
+        ]
+    
+    @classmethod
+    def from_json(cls, data: list) -> 'ModuleConstants':
+        """Rebuild an entry serialized by to_json."""
+        name, is_package, constants, links, stars, size, mtime_ns = data
+        return cls(name, is_package, constants, {key: tuple(target) for key, target in links.items()}, stars, size, mtime_ns)
+
+class ConstantIndex:
+    """
+    Index of the constants of a project's modules.
+    
+    Attributes:
+        modules: Index entry of each file, by absolute path
+    """
+    
+    def __init__(self, modules: Optional[Dict[str, ModuleConstants]] = None):
+        self.modules = modules if modules is not None else {}
+        self._by_last_part: Optional[Dict[str, List[ModuleConstants]]] = None
+    
+    def add_source(self, filepath: str, code: Union[str, bytes]) -> None:
+        """Index a file from its source code rather than from disk."""
+        self.modules[os.path.abspath(filepath)] = ModuleConstants.scan(filepath, code)
+        self._by_last_part = None
+    
+    def update(self, filepaths: Iterable[str]) -> int:
+        """
+        Index exactly the given files, reading only those that changed.
+        
+        A file's previous entry is reused when its size and modification time
+        are unchanged; entries of files not listed are dropped. Files that
+        cannot be read are left out.
+        
+        Args:
+            filepaths: Paths of the project's Python files
+        
+        Returns:
+            Number of files read
+        """
+        previous = self.modules
+        modules: Dict[str, ModuleConstants] = {}
+        racy_after = time.time_ns() - RACY_WINDOW_NS
+        read = 0
+        for filepath in filepaths:
+            key = os.path.abspath(filepath)
+            try:
+                stat = os.stat(filepath)
+                entry = previous.get(key)
+                if entry is None or entry.size != stat.st_size or entry.mtime_ns != stat.st_mtime_ns:
+                    with open(filepath, 'rb') as f:
+                        entry = ModuleConstants.scan(filepath, f.read())
+                    read += 1
+                    if stat.st_mtime_ns < racy_after:
+                        entry.size, entry.mtime_ns = stat.st_size, stat.st_mtime_ns
+            except OSError:
+                continue
+            modules[key] = entry
+        self.modules = modules
+        self._by_last_part = None
+        return read
+    
+    def _find(self, name: str, importer: ModuleConstants) -> Optional[ModuleConstants]:
+        """Find the module a dotted name refers to, preferring the one closest to the importing module."""
+        if self._by_last_part is None:
+            by_last_part: Dict[str, List[ModuleConstants]] = {}
+            for module in self.modules.values():
+                by_last_part.setdefault(module.name.rpartition('.')[2], []).append(module)
+            self._by_last_part = by_last_part
+        
+        suffix = '.' + name
+        candidates = [
+            module for module in self._by_last_part.get(name.rpartition('.')[2], ())
+            if module.name == name or module.name.endswith(suffix)
+        ]
+        if len(candidates) <= 1:
+            return candidates[0] if candidates else None
+        return max(candidates, key=lambda module: len(os.path.commonprefix([module.name, importer.name])))
+    
+    def _resolve_in(self, module: ModuleConstants, parts: List[str], hops: int) -> Optional[str]:
+        """Resolve a dotted name within a module."""
+        if hops <= 0:
+            return None
+        value = module.constants.get('.'.join(parts))
+        if value is not None:
+            return value
+        
+        link = module.links.get(parts[0])
+        if link is not None:
+            target, attribute = link
+            rest = parts[1:]
+            if target is None:
+                return self._resolve_in(module, attribute.split('.') + rest, hops - 1)
+            if attribute is not None:
+                rest = [attribute] + rest
+            return self._resolve_from(target, rest, module, hops - 1)
+        
+        for target in module.stars:
+            value = self._resolve_from(target, parts, module, hops - 1)
+            if value is not None:
+                return value
+        return None
+    
+    def _resolve_from(self, target: str, parts: List[str], importer: ModuleConstants, hops: int) -> Optional[str]:
+        """Resolve names of an imported module; a.b.NAME may be NAME of module a.b or b.NAME of module a."""
+        for split in range(len(parts) - 1, -1, -1):
+            module = self._find('.'.join([target] + parts[:split]), importer)
+            if module is not None:
+                value = self._resolve_in(module, parts[split:], hops)
+                if value is not None:
+                    return value
+        return None
+    
+    def resolve(self, filepath: str, dotted: str) -> Optional[str]:
+        """
+        Resolve a name used in a file to the string constant it refers to.
+        
+        Args:
+            filepath: Path of the file using the name
+            dotted: The name, or a chain of attribute accesses such as "events.SIGNUP"
+        
+        Returns:
+            The string value, or None if the name does not resolve to a known constant
+        """
+        module = self.modules.get(os.path.abspath(filepath))
+        if module is None:
+            return None
+        return self._resolve_in(module, dotted.split('.'), MAX_HOPS)
+    
+    def dependents(self, filepaths: Iterable[str]) -> Set[str]:
+        """
+        Find the indexed files that may resolve names through the given modules.
+        
+        A module depends on the modules it imports from and, transitively, on
+        the modules they re-export names of. Imported names are matched as
+        loosely as _find and _resolve_from use them, so some files found may
+        not depend on the given modules after all.
+        
+        Args:
+            filepaths: Paths of changed, added or deleted modules, which need not be indexed
+        
+        Returns:
+            Absolute paths of the dependent files
+        """
+        importers: Dict[str, List[str]] = {}
+        for path, module in self.modules.items():
+            targets = {target for target, _ in module.links.values() if target is not None}
+            for target in targets.union(module.stars):
+                importers.setdefault(target, []).append(path)
+        
+        found: Set[str] = set()
+        pending = [module_name(filepath)[0] for filepath in filepaths]
+        while pending:
+            # An import of any dotted run of a module's name may end up resolving names in it
+            parts = pending.pop().split('.')
+            for start in range(len(parts)):
+                for end in range(start + 1, len(parts) + 1):
+                    for path in importers.get('.'.join(parts[start:end]), ()):
+                        if path not in found:
+                            found.add(path)
+                            pending.append(self.modules[path].name)
+        return found
+    
+    def save(self, path: str) -> None:
+        """
+        Save the index atomically.
+        
+        Args:
+            path: Path of the index file
+        
+        Raises:
+            OSError: If the file cannot be written
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        data = {
+            "version": INDEX_FORMAT_VERSION,
+            "modules": {filepath: module.to_json() for filepath, module in self.modules.items()},
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.tmp-', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    @classmethod
+    def load(cls, path: str) -> 'ConstantIndex':
+        """
+        Load a saved index; a missing, unreadable or outdated file yields an empty index.
+        
+        Args:
+            path: Path of the index file
+        
+        Returns:
+            The index
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_FORMAT_VERSION:
+                return cls()
+            return cls({filepath: ModuleConstants.from_json(entry) for filepath, entry in data['modules'].items()})
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return cls()
+
+class ProjectConstants:
+    """
+    Constant index of a project's files, built the first time a name is resolved.
+    
+    Scans whose event names are all literals never pay for the index. An index
+    kept between scans, such as by a long-lived worker, is refreshed for each
+    of them (see refresh).
+    
+    Attributes:
+        filepaths: Paths of the project's Python files
+        sources: Source code of files analyzed from memory rather than from disk, by path
+        cache_dir: Optional directory the index is saved in between runs
+    """
+    
+    def __init__(
+        self,
+        filepaths: Sequence[str],
+        sources: Optional[Dict[str, Union[str, bytes]]] = None,
+        cache_dir: Optional[str] = None,
+    ):
+        self.filepaths = list(filepaths)
+        self.sources = sources or {}
+        self.cache_dir = cache_dir
+        self._index: Optional[ConstantIndex] = None
+        self._list_files: Optional[Callable[[], Iterable[str]]] = None
+        self._scan_id: Optional[str] = None
+    
+    def refresh(self, list_files: Callable[[], Iterable[str]], scan_id: Optional[str] = None) -> None:
+        """
+        Mark the index stale, so the next build lists the project's files again.
+        
+        Files added, removed or changed since the previous build are then
+        re-indexed; the entries of unchanged files are reused by stat.
+        
+        Args:
+            list_files: Returns the paths of the project's Python files; only
+                called when a name next needs resolving
+            scan_id: Optional id of the scan the refresh is for; only the first
+                refresh of a scan marks the index stale, so a scan sent in
+                batches lists and stats the project's files once
+        """
+        if scan_id is not None and scan_id == self._scan_id:
+            return
+        self._scan_id = scan_id
+        self._list_files = list_files
+    
+    def _index_path(self) -> str:
+        """Path of the saved index, named after the directory holding the project."""
+        try:
+            root = os.path.commonpath([os.path.abspath(filepath) for filepath in self.filepaths])
+        except ValueError:
+            root = ''
+        digest = hashlib.sha256(root.encode('utf-8', 'surrogatepass')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, 'constants', f"{digest}.json")
+    
+    def build(self) -> ConstantIndex:
+        """Return the project's constant index, building or refreshing it if needed."""
+        if self._list_files is not None:
+            self.filepaths = list(self._list_files())
+            self._list_files = None
+        elif self._index is not None:
+            return self._index
+        
+        on_disk = [filepath for filepath in self.filepaths if filepath not in self.sources]
+        if self.cache_dir and on_disk:
+            path = self._index_path()
+            index = self._index if self._index is not None else ConstantIndex.load(path)
+            indexed = set(index.modules)
+            if index.update(on_disk) or set(index.modules) != indexed:
+                try:
+                    index.save(path)
+                except OSError:
+                    pass
+        else:
+            index = self._index if self._index is not None else ConstantIndex()
+            index.update(on_disk)
+        for filepath, code in self.sources.items():
+            index.add_source(filepath, code)
+        self._index = index
+        return self._index
+    
+    def resolve(self, filepath: str, dotted: str) -> Optional[str]:
+        """Resolve a name used in a file (see ConstantIndex.resolve)."""
+        return self.build().resolve(filepath, dotted)
+    
+    def resolver(self, filepath: str) -> Callable[[str], Optional[str]]:
+        """Return a function resolving names used in one file."""
+        return lambda dotted: self.resolve(filepath, dotted)
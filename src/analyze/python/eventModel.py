@@ -0,0 +1,279 @@
+"""
+Compact in-memory representation of tracking events and property schemas.
+
+The visitor builds events and property schemas as __slots__ objects rather than
+nested dictionaries: a slotted object has no per-instance __dict__ and is a
+fraction of the size of the equivalent dict. They are converted to the JSON
+shape returned by the analyzer only when they are serialized, through their
+to_json methods or the json_default hook for json.dumps.
+
+Schemas and strings are shared through an InternTable that lives for a whole
+scan, so the many identical schemas such as {"type": "string"} and repeated
+event and property names are held once. On output, StringTable can replace
+file paths and function names with indexes into a table of strings.
+"""
+
+from __future__ import annotations
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple, Union
+    
+    # A property schema, either built by the visitor or already in JSON shape (e.g. read from the result cache)
+    Schema = Union['PropertySchema', Dict[str, Any]]
+
+class PropertySchema:
+    """
+    JSON Schema fragment describing the type of a property.
+    
+    Attributes:
+        type: JSON Schema type name, e.g. "string" or "object"
+        items: Schema of the items of an array, if known
+        properties: Schemas of the properties of an object, if known
+    """
+    
+    __slots__ = ('type', 'items', 'properties')
+    
+    def __init__(
+        self,
+        type: str,
+        items: Optional['PropertySchema'] = None,
+        properties: Optional[Dict[str, 'Schema']] = None,
+    ):
+        self.type = type
+        self.items = items
+        self.properties = properties
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Convert to the JSON shape, e.g. {"type": "array", "items": {"type": "string"}}."""
+        result: Dict[str, Any] = {"type": self.type}
+        if self.properties is not None:
+            result['properties'] = properties_to_json(self.properties)
+        if self.items is not None:
+            result['items'] = schema_to_json(self.items)
+        return result
+    
+    def __repr__(self) -> str:
+        return f"PropertySchema({self.to_json()!r})"
+
+class TrackingEvent:
+    """
+    A tracking call found in the source.
+    
+    Attributes:
+        event_name: Name of the tracked event
+        source: Name of the analytics provider
+        properties: Schemas of the event properties, by property name
+        file_path: Path of the file containing the call
+        line: Line number of the call
+        function_name: Name of the enclosing function or class, or "global"
+    """
+    
+    __slots__ = ('event_name', 'source', 'properties', 'file_path', 'line', 'function_name')
+    
+    def __init__(
+        self,
+        event_name: Any,
+        source: str,
+        properties: Dict[str, Schema],
+        file_path: Optional[str],
+        line: int,
+        function_name: str,
+    ):
+        self.event_name = event_name
+        self.source = source
+        self.properties = properties
+        self.file_path = file_path
+        self.line = line
+        self.function_name = function_name
+    
+    @classmethod
+    def from_json(
+        cls,
+        data: Dict[str, Any],
+        file_path: Optional[str] = None,
+        intern: Optional['InternTable'] = None,
+    ) -> 'TrackingEvent':
+        """
+        Build an event from its JSON shape.
+        
+        Args:
+            data: Event in the shape returned by to_json
+            file_path: Path overriding the one in data
+            intern: Optional intern table; when given, strings and property
+                schemas are shared through it, otherwise schemas stay in JSON shape
+        
+        Returns:
+            The event
+        """
+        if file_path is None:
+            file_path = data.get('filePath')
+        if intern is None:
+            return cls(data['eventName'], data['source'], data['properties'], file_path, data['line'], data['functionName'])
+        return cls(
+            intern.string(data['eventName']),
+            data['source'],
+            intern.properties_from_json(data['properties']),
+            intern.string(file_path),
+            data['line'],
+            intern.string(data['functionName']),
+        )
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Convert to the JSON shape returned by the analyzer."""
+        return {
+            "eventName": self.event_name,
+            "source": self.source,
+            "properties": properties_to_json(self.properties),
+            "filePath": self.file_path,
+            "line": self.line,
+            "functionName": self.function_name,
+        }
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TrackingEvent):
+            return NotImplemented
+        return self.to_json() == other.to_json()
+    
+    def __repr__(self) -> str:
+        return f"TrackingEvent({self.to_json()!r})"
+
+class InternTable:
+    """
+    Scan-wide table of shared strings and property schemas.
+    
+    Schemas are hash-consed: a schema is identified by its type and by the
+    identity of its (already interned) item and property schemas, so equal
+    schemas built anywhere in the scan are the same instance. Interned schemas
+    must therefore never be modified.
+    """
+    
+    __slots__ = ('_strings', '_schemas')
+    
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+        self._schemas: Dict[Tuple[Hashable, ...], PropertySchema] = {}
+    
+    def string(self, value: Any) -> Any:
+        """Return the shared instance of a string; other values are returned unchanged."""
+        if type(value) is not str:
+            return value
+        return self._strings.setdefault(value, value)
+    
+    def schema(
+        self,
+        type: str,
+        items: Optional[PropertySchema] = None,
+        properties: Optional[Dict[str, PropertySchema]] = None,
+    ) -> PropertySchema:
+        """
+        Return the shared schema with the given type, items and properties.
+        
+        Args:
+            type: JSON Schema type name
+            items: Interned schema of array items
+            properties: Interned schemas of object properties
+        
+        Returns:
+            The interned schema
+        """
+        key = (type, items, None if properties is None else tuple(properties.items()))
+        schema = self._schemas.get(key)
+        if schema is None:
+            schema = self._schemas[key] = PropertySchema(type, items, properties)
+        return schema
+    
+    def schema_from_json(self, data: Schema) -> PropertySchema:
+        """Intern a schema given in JSON shape."""
+        if isinstance(data, PropertySchema):
+            return data
+        items = data.get('items')
+        properties = data.get('properties')
+        return self.schema(
+            self.string(data['type']),
+            None if items is None else self.schema_from_json(items),
+            None if properties is None else self.properties_from_json(properties),
+        )
+    
+    def properties_from_json(self, properties: Dict[str, Schema]) -> Dict[str, PropertySchema]:
+        """Intern a mapping of property schemas given in JSON shape."""
+        return {self.string(name): self.schema_from_json(schema) for name, schema in properties.items()}
+    
+    def stats(self) -> Dict[str, int]:
+        """Return the number of distinct strings and schemas held."""
+        return {"strings": len(self._strings), "schemas": len(self._schemas)}
+
+class StringTable:
+    """
+    Output table replacing file paths and function names with indexes.
+    
+    Each distinct string is assigned the next index the first time it is
+    encoded; strings holds them in index order.
+    """
+    
+    # Event fields whose values are replaced with string table indexes
+    FIELDS = ('filePath', 'functionName')
+    
+    __slots__ = ('strings', '_indexes')
+    
+    def __init__(self):
+        self.strings: List[str] = []
+        self._indexes: Dict[str, int] = {}
+    
+    def index(self, value: str) -> int:
+        """Return the index of a string, adding it to the table if needed."""
+        index = self._indexes.get(value)
+        if index is None:
+            index = self._indexes[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+    
+    def encode_event(self, event: Union[TrackingEvent, Dict[str, Any]]) -> Dict[str, Any]:
+        """Convert an event to its JSON shape with file path and function name replaced by indexes."""
+        data = event.to_json() if isinstance(event, TrackingEvent) else dict(event)
+        for field in self.FIELDS:
+            data[field] = self.index(data[field])
+        return data
+    
+    def encode_record(self, record: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Encode an NDJSON record for output with a string table.
+        
+        Event records have their file path and function name replaced by
+        indexes, and are preceded by a {"type": "string", "id": n, "value": ...}
+        record for every string not written before.
+        
+        Args:
+            record: Record as written by the streaming entry points
+        
+        Yields:
+            Records to write in order
+        """
+        if record.get('type') != 'event':
+            yield record
+            return
+        known = len(self.strings)
+        encoded = self.encode_event(record)
+        for index in range(known, len(self.strings)):
+            yield {"type": "string", "id": index, "value": self.strings[index]}
+        yield encoded
+
+def schema_to_json(schema: Schema) -> Dict[str, Any]:
+    """Convert a property schema to its JSON shape."""
+    return schema.to_json() if isinstance(schema, PropertySchema) else schema
+
+def properties_to_json(properties: Dict[str, Schema]) -> Dict[str, Any]:
+    """Convert a mapping of property schemas to its JSON shape."""
+    return {name: schema_to_json(schema) for name, schema in properties.items()}
+
+def json_default(value: Any) -> Any:
+    """
+    json.dumps default hook serializing events and property schemas.
+    
+    Raises:
+        TypeError: If value is neither an event nor a property schema
+    """
+    if isinstance(value, (TrackingEvent, PropertySchema)):
+        return value.to_json()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,89 @@
+"""
+Import scan for the Python analytics tracking analyzer.
+
+Tracking calls are recognized by the names they are made through, such as
+analytics.track(...) or BaseEvent(...). Modules often import those names under
+another one:
+
+    import segment.analytics as seg
+    from posthog import Posthog as PH
+
+scan_imports finds every import statement of a module, at any indentation,
+with one regular expression over the raw source, before it is parsed. It maps
+each name the statements bind to the dotted path it refers to, which the
+provider registry turns into the module's alias map (see
+ProviderRegistry.aliases), so detection stays a dictionary lookup per call.
+"""
+
+from __future__ import annotations
+
+import re
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterator, Optional, Tuple, Union
+
+# Alternatives matching an "import" statement (group "modules") or a "from" statement
+# (groups "level", "source" and "names"), from the statement's first word; parenthesized
+# "from" clauses may span lines. Shared with constantIndex._STATEMENT_PATTERN.
+IMPORT_STATEMENTS = (
+    rb'import[ \t]+(?P<modules>[^\n#;]+)'
+    rb'|from[ \t]+(?P<level>\.*)[ \t]*(?P<source>[\w.]*)[ \t]+import[ \t]*(?P<names>\([^)]*\)|[^\n#;]+)'
+)
+
+# Import statements, each starting with the newline ending the previous line (the
+# source is scanned with one prepended), a literal prefix the regex engine skips to
+# quickly.
+_IMPORT_PATTERN = re.compile(rb'\n[ \t]*(?:' + IMPORT_STATEMENTS + rb')')
+_COMMENT_PATTERN = re.compile(rb'#[^\n]*')
+
+def imported_names(clause: bytes) -> Iterator[Tuple[str, Optional[str]]]:
+    """Split an import clause such as "a.b as c, d" into (name, alias) pairs."""
+    clause = _COMMENT_PATTERN.sub(b'', clause).strip(b'()\\ \t\r\n')
+    for item in clause.split(b','):
+        words = item.split()
+        if len(words) == 1:
+            yield words[0].decode('ascii', 'replace'), None
+        elif len(words) == 3 and words[1] == b'as':
+            yield words[0].decode('ascii', 'replace'), words[2].decode('ascii', 'replace')
+
+def scan_imports(code: Union[str, bytes]) -> Dict[str, str]:
+    """
+    Find the names a module's import statements bind.
+    
+    Statements inside strings are picked up too, which only adds names no code
+    refers to. Names imported relatively keep their leading dots.
+    
+    Args:
+        code: Source code, as text or bytes
+    
+    Returns:
+        Dotted path of each imported name, e.g. {"seg": "segment.analytics",
+        "PH": "posthog.Posthog", "os": "os"} for "import segment.analytics as seg",
+        "from posthog import Posthog as PH" and "import os.path"
+    """
+    if isinstance(code, str):
+        code = code.encode('utf-8', 'surrogatepass')
+    if b'import' not in code:
+        return {}
+    
+    imports: Dict[str, str] = {}
+    for match in _IMPORT_PATTERN.finditer(b'\n' + code):
+        modules = match.group('modules')
+        if modules is not None:
+            for name, alias in imported_names(modules):
+                if alias:
+                    imports[alias] = name
+                else:
+                    # "import a.b" binds "a"
+                    root = name.split('.', 1)[0]
+                    imports[root] = root
+            continue
+        
+        source = (match.group('level') + match.group('source')).decode('ascii', 'replace')
+        prefix = source if source.endswith('.') else source + '.'
+        for name, alias in imported_names(match.group('names')):
+            if name != '*':
+                imports[alias or name] = prefix + name
+    return imports
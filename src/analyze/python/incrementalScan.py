@@ -0,0 +1,319 @@
+"""
+Git-driven incremental analysis for the Python analytics tracking analyzer.
+
+Given the output of a previous scan taken at a base revision, only the files
+that git reports as added, modified, renamed or copied since that revision
+(plus untracked files) are analyzed again. Events, errors and skipped files of
+every other file are carried over from the previous output, and files that no
+longer exist simply drop out, so the patched result is identical to a full scan
+of the working tree. Files are diffed against the base revision of the
+repository (or worktree) holding them; files outside any repository are always
+analyzed again.
+
+Files whose event names resolve through constants of other modules (see
+constantIndex.py) can change without being edited, so a dependents function
+can name further files to analyze again given the changed and deleted ones.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+
+from eventModel import StringTable
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+def _git(args: List[str], cwd: str) -> bytes:
+    """Run a git command and return its raw output."""
+    return subprocess.run(
+        ['git', *args],
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    ).stdout
+
+def repository_root(path: str) -> str:
+    """
+    Find the top-level directory of the git repository containing a path.
+    
+    Args:
+        path: Any file or directory inside the repository
+    
+    Returns:
+        Absolute path of the repository root
+    """
+    directory = path if os.path.isdir(path) else os.path.dirname(path) or '.'
+    return os.fsdecode(_git(['rev-parse', '--show-toplevel'], directory).strip())
+
+def group_by_repository(filepaths: Iterable[str]) -> Dict[Optional[str], List[str]]:
+    """
+    Group files by the top-level directory of the repository or worktree holding them.
+    
+    Like git, each file's directory and its parents are searched for a .git
+    directory (or, in worktrees and submodules, a .git file); every directory
+    is only looked at once.
+    
+    Args:
+        filepaths: Paths of the files
+    
+    Returns:
+        Files of each repository by its real path, with files outside any repository under None
+    """
+    roots: Dict[str, Optional[str]] = {}
+    
+    def find_root(directory: str) -> Optional[str]:
+        visited = []
+        root: Optional[str] = None
+        while directory not in roots:
+            visited.append(directory)
+            if os.path.exists(os.path.join(directory, '.git')):
+                root = directory
+                break
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+        else:
+            root = roots[directory]
+        for path in visited:
+            roots[path] = root
+        return root
+    
+    groups: Dict[Optional[str], List[str]] = {}
+    for filepath in filepaths:
+        groups.setdefault(find_root(os.path.dirname(os.path.realpath(filepath))), []).append(filepath)
+    return groups
+
+def changed_files(base: str, root: str) -> Tuple[Set[str], Set[str]]:
+    """
+    List files that differ between a base revision and the working tree.
+    
+    Renames and copies count as a change to their destination and, for renames,
+    a deletion of their source. Untracked files that are not ignored count as added.
+    
+    Args:
+        base: Base revision (commit, branch or tag)
+        root: Repository root
+    
+    Returns:
+        Tuple of (changed, deleted) repository-relative paths
+    """
+    changed: Set[str] = set()
+    deleted: Set[str] = set()
+    
+    entries = _git(['diff', '--name-status', '-z', '-M', base, '--'], root).split(b'\0')
+    i = 0
+    while i < len(entries) and entries[i]:
+        status = entries[i].decode('ascii')
+        if status[0] in 'RC':
+            source, destination = os.fsdecode(entries[i + 1]), os.fsdecode(entries[i + 2])
+            if status[0] == 'R':
+                deleted.add(source)
+            changed.add(destination)
+            i += 3
+            continue
+        
+        filepath = os.fsdecode(entries[i + 1])
+        if status[0] == 'D':
+            deleted.add(filepath)
+        else:
+            changed.add(filepath)
+        i += 2
+    
+    untracked = _git(['ls-files', '--others', '--exclude-standard', '-z'], root).split(b'\0')
+    changed.update(os.fsdecode(entry) for entry in untracked if entry)
+    
+    return changed, deleted
+
+def changed_paths(base: str, filepaths: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+    """
+    Find which of the given files differ from a base revision.
+    
+    Each repository holding some of the files is diffed on its own (see
+    changed_files); files outside any repository count as changed.
+    
+    Args:
+        base: Base revision (commit, branch or tag), looked up in every repository
+        filepaths: Paths of the files
+    
+    Returns:
+        Tuple of (changed, deleted) real paths; deleted files are those of the
+        repositories holding the given files
+    
+    Raises:
+        subprocess.CalledProcessError: If a repository has no such revision
+    """
+    changed: Set[str] = set()
+    deleted: Set[str] = set()
+    for root, files in group_by_repository(filepaths).items():
+        if root is None:
+            changed.update(os.path.realpath(filepath) for filepath in files)
+            continue
+        relative_changed, relative_deleted = changed_files(base, root)
+        changed.update(os.path.join(root, *path.split('/')) for path in relative_changed)
+        deleted.update(os.path.join(root, *path.split('/')) for path in relative_deleted)
+    return changed, deleted
+
+def load_previous_scan(data: bytes) -> Dict[str, Any]:
+    """
+    Read the output of a previous scan, in any of the formats the CLI writes.
+    
+    The JSON event array and the binary format hold events only, so their
+    "errors" and "skipped" are None. The object written with --string-table,
+    a result object with "events" (and optionally "errors" and "skipped") and
+    NDJSON records, with or without string records, are read in full.
+    
+    Args:
+        data: Contents of the output file
+    
+    Returns:
+        Dictionary with "events" in their JSON shape, and per-file "errors" and
+        "skipped" files, or None where the format does not record them
+    
+    Raises:
+        ValueError: If data is not a supported analyzer output
+    """
+    from binaryResults import MAGIC, BinaryResults
+    
+    if data.startswith(MAGIC):
+        return _checked({"events": BinaryResults(data).to_json(), "errors": None, "skipped": None})
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError("not JSON, NDJSON or binary analyzer output") from None
+    
+    try:
+        output = json.loads(text)
+    except ValueError:
+        return _checked(_read_records(text))
+    if isinstance(output, list):
+        return _checked({"events": output, "errors": None, "skipped": None})
+    if isinstance(output, dict) and 'type' in output:
+        return _checked(_read_records(text))
+    if isinstance(output, dict) and isinstance(output.get('events'), list):
+        strings = output.get('strings')
+        events = output['events'] if strings is None else [_decode_event(event, strings) for event in output['events']]
+        return _checked({"events": events, "errors": output.get('errors'), "skipped": output.get('skipped')})
+    raise ValueError("expected an event array, an object with \"events\" or NDJSON records")
+
+def _decode_event(event: Any, strings: Any) -> Any:
+    """Replace the string table indexes of an event with their strings."""
+    if not isinstance(event, dict):
+        return event
+    event = dict(event)
+    for field in StringTable.FIELDS:
+        index = event.get(field)
+        if isinstance(index, int):
+            try:
+                event[field] = strings[index]
+            except (IndexError, KeyError, TypeError):
+                raise ValueError(f"{field} refers to unknown string {index}") from None
+    return event
+
+def _read_records(text: str) -> Dict[str, Any]:
+    """Collect the events, errors and skipped files of NDJSON records written by the CLI."""
+    strings: Dict[int, str] = {}
+    events: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    skipped: List[Dict[str, Any]] = []
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise ValueError(f"line {number} is not JSON") from None
+        kind = record.get('type') if isinstance(record, dict) else None
+        if kind == 'string':
+            strings[record.get('id')] = record.get('value')
+        elif kind == 'event':
+            events.append(_decode_event({key: value for key, value in record.items() if key != 'type'}, strings))
+        elif kind == 'file_end':
+            if 'error' in record:
+                errors.append({"filePath": record.get('filePath'), "error": record['error']})
+            if 'skipped' in record:
+                skipped.append({"filePath": record.get('filePath'), "reason": record['skipped']})
+        elif kind not in ('file_start', 'summary'):
+            raise ValueError(f"line {number} is not an analyzer record")
+    return {"events": events, "errors": errors, "skipped": skipped}
+
+def _checked(previous: Dict[str, Any]) -> Dict[str, Any]:
+    """Check that every event, error and skipped file of a previous scan names its file."""
+    for key in ('events', 'errors', 'skipped'):
+        entries = previous[key]
+        if entries is None:
+            continue
+        if not isinstance(entries, list):
+            raise ValueError(f"\"{key}\" is not a list")
+        for entry in entries:
+            if not isinstance(entry, dict) or not isinstance(entry.get('filePath'), str):
+                raise ValueError(f"an entry of \"{key}\" has no file path")
+    return previous
+
+def _by_file(entries: Optional[Iterable[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group events, errors or skipped files by their file path."""
+    by_file: Dict[str, List[Dict[str, Any]]] = {}
+    for entry in entries or ():
+        by_file.setdefault(entry['filePath'], []).append(entry)
+    return by_file
+
+def incremental_scan(
+    filepaths: List[str],
+    previous: Dict[str, Any],
+    base: str,
+    analyze: Callable[[List[str]], Dict[str, Any]],
+    dependents: Optional[Callable[[List[str]], Iterable[str]]] = None,
+) -> Dict[str, Any]:
+    """
+    Patch a previous scan with results for the files changed since a base revision.
+    
+    Args:
+        filepaths: Every file a full scan would analyze, in full-scan order
+        previous: Output of a scan of the same paths at the base revision, as
+            read by load_previous_scan; errors and skipped files are carried over
+            where it records them
+        base: Base revision the previous output was produced from
+        analyze: Function analyzing a list of paths into {"events", "errors", "stats"}
+        dependents: Optional function returning the paths of files whose results
+            may depend on the given changed and deleted files, such as through
+            imported constants; those are analyzed again too
+    
+    Returns:
+        Dictionary with "events", per-file "errors", "skipped" files and scan
+        "stats", where stats["reused"] counts files whose results were carried over
+    """
+    if not filepaths:
+        return {"events": [], "errors": [], "skipped": [], "stats": {"files": 0, "reused": 0}}
+    
+    changed, deleted = changed_paths(base, filepaths)
+    to_analyze = [filepath for filepath in filepaths if os.path.realpath(filepath) in changed]
+    if dependents is not None and (to_analyze or deleted):
+        affected = {os.path.abspath(filepath) for filepath in dependents(to_analyze + sorted(deleted))}
+        to_analyze = [
+            filepath for filepath in filepaths
+            if os.path.realpath(filepath) in changed or os.path.abspath(filepath) in affected
+        ]
+    result = analyze(to_analyze)
+    
+    fresh = {key: _by_file(result.get(key)) for key in ('events', 'errors', 'skipped')}
+    carried = {key: _by_file(previous.get(key)) for key in ('events', 'errors', 'skipped')}
+    analyzed = set(to_analyze)
+    
+    patched: Dict[str, Any] = {"events": [], "errors": [], "skipped": []}
+    for filepath in filepaths:
+        source = fresh if filepath in analyzed else carried
+        for key, entries in patched.items():
+            entries.extend(source[key].get(filepath, ()))
+    
+    stats = dict(result['stats'])
+    stats['reused'] = len(filepaths) - len(to_analyze)
+    patched['stats'] = stats
+    if 'profile' in result:
+        patched['profile'] = result['profile']
+    return patched
@@ -3,17 +3,105 @@
  * @module analyze/python
  */
 
+const crypto = require('crypto');
 const fs = require('fs');
+const os = require('os');
 const path = require('path');
+const { getNativeWorker } = require('./nativeWorker');
+
+// Directory inside the Pyodide file system that holds the analyzer modules
+const PYODIDE_MODULE_DIR = '/analyze_tracking';
+const ANALYZER_MODULE_NAME = 'pythonTrackingAnalyzer';
+
+// Python modules the analyzer imports, copied into the Pyodide file system
+const ANALYZER_MODULES = [ANALYZER_MODULE_NAME, 'eventModel', 'phaseProfiler', 'providerRegistry', 'resultCache', 'skipPolicy',
+  'bytecodeBundle', 'incrementalScan', 'binaryResults', 'constantIndex', 'importScan', 'resultStore', 'scanManifest'];
+
+// Directory inside the Pyodide file system where host directories are mounted
+const PYODIDE_MOUNT_DIR = '/mnt';
 
 // Singleton instance of Pyodide
 let pyodide = null;
 
+// Function handles into the imported analyzer module inside the Pyodide runtime
+let analyzer = null;
+
+// Host directories mounted into the Pyodide file system, keyed by host path
+const mountedDirectories = new Map();
+
+/**
+ * Resolve the host directory holding precompiled bytecode bundles of the analyzer
+ * 
+ * Mirrors bytecodeBundle.default_bundle_dir: the `ANALYZE_TRACKING_BYTECODE_DIR`
+ * environment variable, `off` to disable bundles, or the user cache directory.
+ * 
+ * @returns {string|null} Bundle directory, or null if bundles are disabled
+ */
+function resolveBytecodeDir() {
+  const configured = process.env.ANALYZE_TRACKING_BYTECODE_DIR;
+  if (configured === 'off') {
+    return null;
+  }
+  if (configured) {
+    return path.resolve(configured);
+  }
+  const cacheHome = process.env.XDG_CACHE_HOME || path.join(os.homedir(), '.cache');
+  return path.join(cacheHome, 'analyze-tracking');
+}
+
+/**
+ * Register the Python analyzer as a module inside the Pyodide runtime
+ * 
+ * The analyzer source is written to the Pyodide file system and imported once,
+ * so its module-level state (provider tables, visitor class) is built a single
+ * time per runtime instead of once per analyzed file. The modules are imported
+ * from a bytecode bundle kept in a host directory (see bytecodeBundle.py), so
+ * they are only compiled the first time a given analyzer version is loaded.
+ * 
+ * @param {Object} py - The Pyodide instance
+ * @returns {Object} Function handles for the analyzer entry points
+ * @throws {Error} If the analyzer source cannot be found
+ */
+function loadAnalyzerModule(py) {
+  py.FS.mkdirTree(PYODIDE_MODULE_DIR);
+  for (const moduleName of ANALYZER_MODULES) {
+    const modulePath = path.join(__dirname, `${moduleName}.py`);
+    if (!fs.existsSync(modulePath)) {
+      throw new Error(`Python analyzer module not found at: ${modulePath}`);
+    }
+    py.FS.writeFile(`${PYODIDE_MODULE_DIR}/${moduleName}.py`, fs.readFileSync(modulePath));
+  }
+
+  const sys = py.pyimport('sys');
+  sys.path.insert(0, PYODIDE_MODULE_DIR);
+  sys.destroy();
+
+  const bytecodeDir = resolveBytecodeDir();
+  if (bytecodeDir) {
+    try {
+      const bytecodeBundle = py.pyimport('bytecodeBundle');
+      bytecodeBundle.load_bundle(PYODIDE_MODULE_DIR, mountHostDirectory(py, bytecodeDir));
+      bytecodeBundle.destroy();
+    } catch (error) {
+      // The modules are imported from source instead
+    }
+  }
+
+  const analyzerModule = py.pyimport(ANALYZER_MODULE_NAME);
+  const handles = {
+    analyzePythonFiles: analyzerModule.analyze_python_files,
+  };
+  analyzerModule.destroy();
+
+  return handles;
+}
+
 /**
  * Initialize Pyodide runtime lazily
  * 
  * This function loads Pyodide and required Python packages only when needed,
  * improving startup performance when Python analysis is not immediately required.
+ * The analyzer module is imported as part of initialization.
  * 
  * @returns {Promise<Object>} The initialized Pyodide instance
  * @throws {Error} If Pyodide fails to load
@@ -22,10 +110,13 @@ async function initPyodide() {
   if (!pyodide) {
     try {
       const { loadPyodide } = await import('pyodide');
-      pyodide = await loadPyodide();
+      const py = await loadPyodide();
       
       // Pre-load required Python packages
-      await pyodide.loadPackagesFromImports('import ast, json');
+      await py.loadPackagesFromImports('import ast, json');
+
+      analyzer = loadAnalyzerModule(py);
+      pyodide = py;
     } catch (error) {
       throw new Error(`Failed to initialize Pyodide: ${error.message}`);
     }
@@ -33,6 +124,275 @@ async function initPyodide() {
   return pyodide;
 }
 
+/**
+ * Get the analyzer function handles, initializing Pyodide if needed
+ * 
+ * @returns {Promise<Object>} Function handles for the analyzer entry points
+ */
+async function getAnalyzer() {
+  await initPyodide();
+  return analyzer;
+}
+
+/**
+ * Make a host directory visible inside the Pyodide file system
+ * 
+ * A directory inside an already mounted one is reached through that mount.
+ * Otherwise the directory is mounted at a point named after its host path, so
+ * it keeps its Pyodide path when mounted again, such as by a later batch.
+ * 
+ * @param {Object} py - The Pyodide instance
+ * @param {string} hostDir - Absolute path of the directory on the host
+ * @param {boolean} [create=true] - Create the directory if it does not exist
+ * @param {Array<string>|null} [batchMounts=null] - Collects the directory if it gets mounted,
+ *   for unmountHostDirectories to unmount once the batch needing it is done
+ * @returns {string} Path of the directory inside Pyodide
+ */
+function mountHostDirectory(py, hostDir, create = true, batchMounts = null) {
+  if (create) {
+    fs.mkdirSync(hostDir, { recursive: true });
+  }
+  for (const [mountedDir, mountPoint] of mountedDirectories) {
+    if (isInsideDirectory(mountedDir, hostDir)) {
+      const relative = path.relative(mountedDir, hostDir).split(path.sep).join('/');
+      return relative ? `${mountPoint}/${relative}` : mountPoint;
+    }
+  }
+
+  const digest = crypto.createHash('sha256').update(hostDir).digest('hex').slice(0, 16);
+  const mountPoint = `${PYODIDE_MOUNT_DIR}/${digest}`;
+  py.FS.mkdirTree(mountPoint);
+  py.FS.mount(py.FS.filesystems.NODEFS, { root: hostDir }, mountPoint);
+  mountedDirectories.set(hostDir, mountPoint);
+  if (batchMounts) {
+    batchMounts.push(hostDir);
+  }
+  return mountPoint;
+}
+
+/**
+ * Unmount host directories mounted for a batch
+ * 
+ * @param {Object} py - The Pyodide instance
+ * @param {Array<string>} hostDirs - Host directories collected by mountHostDirectory
+ */
+function unmountHostDirectories(py, hostDirs) {
+  for (const hostDir of hostDirs) {
+    const mountPoint = mountedDirectories.get(hostDir);
+    mountedDirectories.delete(hostDir);
+    py.FS.unmount(mountPoint);
+    py.FS.rmdir(mountPoint);
+  }
+}
+
+/**
+ * Check whether a path lies inside a directory
+ * 
+ * @param {string} dir - Absolute directory path
+ * @param {string} filePath - Absolute path
+ * @returns {boolean} True if filePath is inside dir
+ */
+function isInsideDirectory(dir, filePath) {
+  const relative = path.relative(dir, filePath);
+  return relative !== '..' && !relative.startsWith(`..${path.sep}`) && !path.isAbsolute(relative);
+}
+
+/**
+ * Make host files readable inside the Pyodide file system
+ * 
+ * The deepest directory holding all the files of a file system root is mounted
+ * with NODEFS, so the analyzer reads the bytes itself instead of receiving each
+ * file decoded into a JS string and converted again into a Python str.
+ * 
+ * @param {Object} py - The Pyodide instance
+ * @param {Array<string>} filePaths - Paths of the files on the host
+ * @param {string|null} [baseDir=null] - Directory to mount instead when it holds the files,
+ *   so their paths match those of a project root mounted with mountHostDirectory
+ * @param {Array<string>|null} [batchMounts=null] - Collects the directories mounted (see mountHostDirectory)
+ * @returns {Array<string>} Paths of the files inside Pyodide, in the same order
+ */
+function mountHostFiles(py, filePaths, baseDir = null, batchMounts = null) {
+  const absolutePaths = filePaths.map(filePath => path.resolve(filePath));
+
+  // Deepest common directory of the files on each root (drive), which is usually just one
+  const commonDirs = new Map();
+  for (const absolutePath of absolutePaths) {
+    const { root } = path.parse(absolutePath);
+    let dir = commonDirs.get(root)
+      || (baseDir && isInsideDirectory(baseDir, absolutePath) ? baseDir : path.dirname(absolutePath));
+    // Missing files are reported by the analyzer, but their directory cannot be mounted
+    while (!isInsideDirectory(dir, absolutePath) || !fs.existsSync(dir)) {
+      dir = path.dirname(dir);
+    }
+    commonDirs.set(root, dir);
+  }
+
+  return absolutePaths.map((absolutePath) => {
+    const dir = commonDirs.get(path.parse(absolutePath).root);
+    const relative = path.relative(dir, absolutePath).split(path.sep).join('/');
+    return `${mountHostDirectory(py, dir, false, batchMounts)}/${relative}`;
+  });
+}
+
+/**
+ * Resolve analysis options shared by both engines
+ * 
+ * @param {Object} options - Options passed by the caller
+ * @param {string} [options.cacheDir] - Result cache directory
+ * @param {Array<Object>|string} [options.providers] - Extra provider descriptions,
+ *   or the path of a JSON or YAML file holding them
+ * @param {Object|string} [options.skipPolicy] - Skip policy such as `{ maxBytes, maxLines,
+ *   skipGenerated, allow, deny }` (see skipPolicy.py), or its JSON text
+ * @param {number} [options.timeBudget] - Wall-clock seconds allowed per file; a file running
+ *   past it keeps the events found so far and is reported with a budget-exceeded error
+ * @param {number} [options.maxDepth] - Deepest nested property dictionary followed; deeper
+ *   ones are reported as plain objects
+ * @param {string} [options.projectRoot] - Directory whose Python files are indexed to resolve
+ *   event names given as module constants such as `events.SIGNUP`; defaults to the files analyzed
+ * @param {boolean} [options.resolveConstants=true] - Resolve event names given as module constants
+ * @param {boolean} [options.requireSdkImport] - Skip files that import no known analytics SDK and
+ *   mention no custom function, without parsing them
+ * @param {string|boolean} [options.manifest] - Scan manifest recording the stat of every file, so
+ *   files whose size, modification time and inode are unchanged reuse their cached results without
+ *   being read (see scanManifest.py); defaults to `scan-manifest.jsonl` in the cache directory,
+ *   `false` disables it. Only the native worker uses it: Pyodide sees files under per-process mounts
+ * @param {string} [options.scanId] - Id shared by the batches of one scan, so the `projectRoot` index
+ *   is listed and refreshed once per scan rather than for every batch
+ * @returns {Object} Normalized options
+ */
+function resolveOptions(options = {}) {
+  const cacheDir = options.cacheDir || process.env.ANALYZE_TRACKING_CACHE_DIR;
+  let providers = options.providers || process.env.ANALYZE_TRACKING_PYTHON_PROVIDERS || null;
+  if (typeof providers === 'string') {
+    const yaml = require('js-yaml');
+    const config = yaml.load(fs.readFileSync(providers, 'utf8'));
+    providers = Array.isArray(config) ? config : config && config.providers;
+  }
+  let skipPolicy = options.skipPolicy || process.env.ANALYZE_TRACKING_PYTHON_SKIP_POLICY || null;
+  if (typeof skipPolicy === 'string') {
+    skipPolicy = JSON.parse(skipPolicy);
+  }
+  const timeBudget = options.timeBudget || process.env.ANALYZE_TRACKING_PYTHON_TIME_BUDGET;
+  const maxDepth = options.maxDepth ?? process.env.ANALYZE_TRACKING_PYTHON_MAX_DEPTH;
+  let manifest = options.manifest ?? process.env.ANALYZE_TRACKING_PYTHON_MANIFEST;
+  if (manifest === undefined || manifest === true) {
+    manifest = cacheDir ? path.join(cacheDir, 'scan-manifest.jsonl') : null;
+  }
+  return {
+    cacheDir: cacheDir ? path.resolve(cacheDir) : null,
+    providers: providers || null,
+    skipPolicy: skipPolicy || null,
+    timeBudget: timeBudget ? Number(timeBudget) : null,
+    maxDepth: maxDepth !== undefined && maxDepth !== '' ? Number(maxDepth) : null,
+    projectRoot: options.projectRoot ? path.resolve(options.projectRoot) : null,
+    resolveConstants: options.resolveConstants !== false,
+    requireSdkImport: options.requireSdkImport ?? process.env.ANALYZE_TRACKING_PYTHON_REQUIRE_SDK_IMPORT === '1',
+    manifest: manifest && cacheDir ? path.resolve(manifest) : null,
+    scanId: options.scanId || null,
+  };
+}
+
+/**
+ * Analyze a batch of Python files with the Pyodide engine
+ * 
+ * @param {Array<string>} filePaths - Paths to the Python files to analyze
+ * @param {string|Array<string>|null} customFunction - Custom tracking function spec(s) to detect
+ * @param {Object} [options={}] - Analysis options (see resolveOptions)
+ * @returns {Promise<{events: Array<Object>, errors: Array<Object>, skipped: Array<Object>, stats: Object}>} Batch result
+ */
+async function analyzeBatchWithPyodide(filePaths, customFunction, options = {}) {
+  // No scan manifest: the Pyodide path of a file depends on the mount it is reached through,
+  // and NODEFS only reports modification times to the millisecond; the manifest is native-worker only
+  const {
+    cacheDir, providers, skipPolicy, timeBudget, maxDepth, projectRoot, resolveConstants, requireSdkImport, scanId,
+  } = resolveOptions(options);
+
+  const py = await initPyodide();
+  const { analyzePythonFiles: analyzeFiles } = await getAnalyzer();
+
+  // Directories kept mounted between batches are mounted first, so the files inside them reuse their mounts
+  const pyCacheDir = cacheDir ? mountHostDirectory(py, cacheDir) : null;
+  const pyProjectRoot = projectRoot && fs.existsSync(projectRoot) ? mountHostDirectory(py, projectRoot, false) : null;
+
+  // The analyzer reads each file from its mount, then reports it under its host path
+  const batchMounts = [];
+  const pyodidePaths = mountHostFiles(py, filePaths, projectRoot, batchMounts);
+  const hostPaths = new Map(pyodidePaths.map((pyodidePath, index) => [pyodidePath, filePaths[index]]));
+  const withHostPath = (entry) => ({ ...entry, filePath: hostPaths.get(entry.filePath) || entry.filePath });
+
+  const pyFiles = py.toPy(pyodidePaths.map(pyodidePath => [pyodidePath, null]));
+  const pyProviders = providers ? py.toPy(providers) : null;
+  const pySkipPolicy = skipPolicy ? py.toPy(skipPolicy) : null;
+  try {
+    const result = JSON.parse(analyzeFiles.callKwargs(pyFiles, customFunction, {
+      cache_dir: pyCacheDir,
+      providers: pyProviders,
+      skip_policy: pySkipPolicy,
+      time_budget: timeBudget,
+      max_depth: maxDepth,
+      resolve_constants: resolveConstants,
+      require_sdk_import: requireSdkImport,
+      project_root: pyProjectRoot,
+      scan_id: scanId,
+    }));
+    return {
+      events: result.events.map(withHostPath),
+      errors: result.errors.map(withHostPath),
+      skipped: result.skipped.map(withHostPath),
+      stats: result.stats,
+    };
+  } finally {
+    pyFiles.destroy();
+    for (const proxy of [pyProviders, pySkipPolicy]) {
+      if (proxy) {
+        proxy.destroy();
+      }
+    }
+    unmountHostDirectories(py, batchMounts);
+  }
+}
+
+/**
+ * Analyze a batch of Python files with the native CPython worker
+ * 
+ * @param {Array<string>} filePaths - Paths to the Python files to analyze
+ * @param {string|Array<string>|null} customFunction - Custom tracking function spec(s) to detect
+ * @param {Object} [options={}] - Analysis options (see resolveOptions)
+ * @returns {Promise<{events: Array<Object>, errors: Array<Object>, skipped: Array<Object>, stats: Object}|null>} Batch result,
+ *   or null if no system Python interpreter is available
+ */
+async function analyzeBatchWithNativeWorker(filePaths, customFunction, options = {}) {
+  const worker = getNativeWorker();
+  if (!worker) {
+    return null;
+  }
+  return worker.analyze(filePaths, customFunction, resolveOptions(options));
+}
+
+/**
+ * Analyze a batch of Python files with the best available engine
+ * 
+ * The native CPython worker is preferred; Pyodide is used when no system
+ * interpreter exists or the worker fails. Both engines run the same analyzer
+ * module and return identical results.
+ * 
+ * @param {Array<string>} filePaths - Paths to the Python files to analyze
+ * @param {string|Array<string>|null} customFunction - Custom tracking function spec(s) to detect
+ * @param {Object} [options={}] - Analysis options (see resolveOptions)
+ * @returns {Promise<{events: Array<Object>, errors: Array<Object>, skipped: Array<Object>, stats: Object}>} Batch result
+ */
+async function analyzeBatch(filePaths, customFunction, options = {}) {
+  try {
+    const result = await analyzeBatchWithNativeWorker(filePaths, customFunction, options);
+    if (result) {
+      return result;
+    }
+  } catch (error) {
+    console.warn(`Python worker failed, falling back to Pyodide: ${error.message}`);
+  }
+  return analyzeBatchWithPyodide(filePaths, customFunction, options);
+}
+
 /**
  * Analyze a Python file for analytics tracking calls
  * 
@@ -40,7 +400,13 @@ async function initPyodide() {
  * libraries, extracting event names, properties, and metadata.
  * 
  * @param {string} filePath - Path to the Python file to analyze
- * @param {string} [customFunction=null] - Name of a custom tracking function to detect
+ * @param {string|Array<string>} [customFunction=null] - Custom tracking function to detect, or a list of
+ *   function specs such as `'utils.track(1, 2)'` (event and properties argument positions or keywords)
+ * @param {Object} [options={}] - Analysis options
+ * @param {string} [options.cacheDir] - Result cache directory; defaults to the
+ *   `ANALYZE_TRACKING_CACHE_DIR` environment variable
+ * @param {Array<Object>|string} [options.providers] - Extra provider descriptions or a
+ *   JSON/YAML file holding them; defaults to the `ANALYZE_TRACKING_PYTHON_PROVIDERS` environment variable
  * @returns {Promise<Array<Object>>} Array of tracking events found in the file
  * @returns {Promise<Array>} Empty array if an error occurs
  * 
@@ -52,7 +418,7 @@ async function initPyodide() {
  * // With custom tracking function
  * const events = await analyzePythonFile('./app.py', 'track_event');
  */
-async function analyzePythonFile(filePath, customFunction = null) {
+async function analyzePythonFile(filePath, customFunction = null, options = {}) {
   // Validate inputs
   if (!filePath || typeof filePath !== 'string') {
     console.error('Invalid file path provided');
@@ -66,34 +432,7 @@ async function analyzePythonFile(filePath, customFunction = null) {
       return [];
     }
 
-    // Read the Python file
-    const code = fs.readFileSync(filePath, 'utf8');
-    
-    // Initialize Pyodide if not already done
-    const py = await initPyodide();
-    
-    // Load the Python analyzer code
-    const analyzerPath = path.join(__dirname, 'pythonTrackingAnalyzer.py');
-    if (!fs.existsSync(analyzerPath)) {
-      throw new Error(`Python analyzer not found at: ${analyzerPath}`);
-    }
-    
-    const analyzerCode = fs.readFileSync(analyzerPath, 'utf8');
-    
-    // Set up Python environment with necessary variables
-    py.globals.set('code', code);
-    py.globals.set('filepath', filePath);
-    py.globals.set('custom_function', customFunction);
-    // Set __name__ to null to prevent execution of main block
-    py.globals.set('__name__', null);
-    
-    // Load and run the analyzer
-    py.runPython(analyzerCode);
-    
-    // Execute the analysis and parse results
-    const result = py.runPython('analyze_python_code(code, filepath, custom_function)');
-    const events = JSON.parse(result);
-    
+    const { events } = await analyzeBatch([filePath], customFunction, options);
     return events;
   } catch (error) {
     // Log detailed error information for debugging
@@ -103,9 +442,76 @@ async function analyzePythonFile(filePath, customFunction = null) {
   }
 }
 
+/**
+ * Analyze a batch of Python files for analytics tracking calls
+ * 
+ * All files are analyzed in a single call to the Python engine, so the Node/Python
+ * boundary is crossed once per batch instead of once per file. Files that cannot be
+ * read or parsed are reported individually and do not affect the rest of the batch.
+ * 
+ * @param {Array<string>} filePaths - Paths to the Python files to analyze
+ * @param {string|Array<string>} [customFunction=null] - Custom tracking function to detect, or a list of
+ *   function specs such as `'utils.track(1, 2)'` (event and properties argument positions or keywords)
+ * @param {Object} [options={}] - Analysis options
+ * @param {string} [options.cacheDir] - Result cache directory; defaults to the
+ *   `ANALYZE_TRACKING_CACHE_DIR` environment variable
+ * @param {Array<Object>|string} [options.providers] - Extra provider descriptions or a
+ *   JSON/YAML file holding them; defaults to the `ANALYZE_TRACKING_PYTHON_PROVIDERS` environment variable
+ * @param {Object|string} [options.skipPolicy] - Skip oversized and generated files before parsing
+ *   (see resolveOptions); defaults to the JSON in the `ANALYZE_TRACKING_PYTHON_SKIP_POLICY` environment variable
+ * @param {number} [options.timeBudget] - Wall-clock seconds allowed per file; defaults to the
+ *   `ANALYZE_TRACKING_PYTHON_TIME_BUDGET` environment variable
+ * @param {number} [options.maxDepth] - Nesting-depth cap of property dictionaries; defaults to the
+ *   `ANALYZE_TRACKING_PYTHON_MAX_DEPTH` environment variable
+ * @param {string} [options.projectRoot] - Directory indexed to resolve event names given as module
+ *   constants, so names defined outside the batch resolve too
+ * @param {boolean} [options.requireSdkImport] - Skip files importing no known analytics SDK; defaults
+ *   to `ANALYZE_TRACKING_PYTHON_REQUIRE_SDK_IMPORT=1`
+ * @param {string|boolean} [options.manifest] - Scan manifest letting files with an unchanged stat skip
+ *   being read; defaults to the `ANALYZE_TRACKING_PYTHON_MANIFEST` environment variable, or a manifest
+ *   in the cache directory. Requires a cache directory, and only the native worker uses it
+ * @param {string} [options.scanId] - Id shared by the calls analyzing one scan in batches, so the
+ *   `projectRoot` index is only refreshed by the first of them
+ * @returns {Promise<Array<Object>>} Array of tracking events found across all files
+ * @returns {Promise<Array>} Empty array if the batch fails as a whole
+ * 
+ * @example
+ * const events = await analyzePythonFiles(['./app.py', './jobs/worker.py']);
+ */
+async function analyzePythonFiles(filePaths, customFunction = null, options = {}) {
+  if (!Array.isArray(filePaths) || filePaths.length === 0) {
+    return [];
+  }
+
+  try {
+    const result = await analyzeBatch(filePaths, customFunction, options);
+
+    result.errors.forEach(({ filePath, error }) => {
+      if (error.startsWith('BudgetExceeded:')) {
+        console.warn(`Partial results for Python file ${filePath}: ${error}`);
+      } else {
+        console.warn(`Skipping Python file ${filePath}: ${error}`);
+      }
+    });
+    (result.skipped || []).forEach(({ filePath, reason }) => {
+      console.warn(`Skipping Python file ${filePath}: ${reason}`);
+    });
+
+    return result.events;
+  } catch (error) {
+    console.error('Error analyzing Python files:', error);
+    console.error('Stack trace:', error.stack);
+    return [];
+  }
+}
+
 // Export the public API
 module.exports = { 
   analyzePythonFile,
+  analyzePythonFiles,
   // Export for testing purposes
-  _initPyodide: initPyodide
+  _initPyodide: initPyodide,
+  _analyzeBatchWithPyodide: analyzeBatchWithPyodide,
+  _analyzeBatchWithNativeWorker: analyzeBatchWithNativeWorker,
+  _analyzerModules: ANALYZER_MODULES
 };
@@ -0,0 +1,203 @@
+/**
+ * @fileoverview Native CPython worker for the Python analyzer
+ * @module analyze/python/nativeWorker
+ *
+ * Runs pythonTrackingAnalyzer.py in `--serve` mode under a system Python
+ * interpreter and talks to it using newline-delimited JSON over stdin/stdout.
+ * The worker is started through bytecodeBundle.py, which imports the analyzer
+ * from a precompiled bytecode bundle instead of compiling its source.
+ * CPython parses and walks ASTs several times faster than Pyodide and has no
+ * WASM cold start, so this worker is preferred whenever an interpreter exists.
+ */
+
+const { spawn, spawnSync } = require('child_process');
+const path = require('path');
+const readline = require('readline');
+
+const ANALYZER_PATH = path.join(__dirname, 'bytecodeBundle.py');
+
+// Interpreters tried, in order, when ANALYZE_TRACKING_PYTHON is not set
+const DEFAULT_INTERPRETERS = ['python3', 'python'];
+
+// Results match Pyodide's from Python 3.11 on: 3.8 wraps subscripts in ast.Index, and parsers before
+// 3.11 accept nesting that later ones reject as too deep
+const VERSION_CHECK = 'import sys; sys.exit(0 if sys.version_info >= (3, 11) else 1)';
+
+// Resolved interpreter: undefined until looked up, null when none is usable
+let interpreter;
+
+// Singleton worker instance
+let worker = null;
+
+/**
+ * Find a usable system Python interpreter
+ *
+ * The `ANALYZE_TRACKING_PYTHON` environment variable can point to a specific
+ * interpreter, or be set to `pyodide` to disable the native worker entirely.
+ *
+ * @returns {string|null} Interpreter command, or null if none is available
+ */
+function findPythonInterpreter() {
+  if (interpreter !== undefined) {
+    return interpreter;
+  }
+
+  const configured = process.env.ANALYZE_TRACKING_PYTHON;
+  if (configured === 'pyodide') {
+    interpreter = null;
+    return interpreter;
+  }
+
+  const candidates = configured ? [configured] : DEFAULT_INTERPRETERS;
+  interpreter = candidates.find((candidate) => {
+    const result = spawnSync(candidate, ['-c', VERSION_CHECK], { stdio: 'ignore' });
+    return result.status === 0;
+  }) || null;
+
+  return interpreter;
+}
+
+/**
+ * Long-lived Python analyzer process
+ *
+ * Requests are matched to responses by id, so several batches can be in flight
+ * at once. Results are requested in streaming mode: the worker writes one record
+ * per event as soon as it is found, so no single response line has to hold a
+ * whole batch. The process does not keep Node alive while it is idle.
+ */
+class NativeWorker {
+  /**
+   * @param {string} pythonPath - Interpreter used to run the analyzer
+   */
+  constructor(pythonPath) {
+    this.nextId = 1;
+    this.pending = new Map();
+    this.exited = false;
+
+    this.process = spawn(pythonPath, [ANALYZER_PATH, '--serve'], {
+      stdio: ['pipe', 'pipe', 'inherit'],
+    });
+    this.process.on('error', (error) => this._fail(error));
+    this.process.on('exit', (code, signal) => {
+      this._fail(new Error(`Python worker exited with ${signal || `code ${code}`}`));
+    });
+    this.process.stdin.on('error', (error) => this._fail(error));
+
+    readline
+      .createInterface({ input: this.process.stdout })
+      .on('line', (line) => this._handleResponse(line));
+
+    this._updateRef();
+  }
+
+  /**
+   * Analyze a batch of Python files
+   *
+   * @param {Array<string>} filePaths - Paths to the Python files to analyze
+   * @param {string|Array<string>|null} customFunction - Custom tracking function spec(s) to detect
+   * @param {Object} [options={}] - Additional request fields, such as `cacheDir`
+   * @returns {Promise<{events: Array<Object>, errors: Array<Object>, skipped: Array<Object>, stats: Object}>} Batch result
+   */
+  analyze(filePaths, customFunction, options = {}) {
+    if (this.exited) {
+      return Promise.reject(new Error('Python worker is not running'));
+    }
+
+    const id = this.nextId++;
+    const request = {
+      id,
+      files: filePaths.map(filePath => ({ path: filePath })),
+      customFunction,
+      stream: true,
+      ...options,
+    };
+
+    return new Promise((resolve, reject) => {
+      this.pending.set(id, { resolve, reject, events: [] });
+      this._updateRef();
+      this.process.stdin.write(`${JSON.stringify(request)}\n`);
+    });
+  }
+
+  /**
+   * Stop the worker by closing its input stream
+   */
+  close() {
+    this.process.stdin.end();
+  }
+
+  _handleResponse(line) {
+    let response;
+    try {
+      response = JSON.parse(line);
+    } catch (error) {
+      this._fail(new Error(`Invalid response from Python worker: ${line.slice(0, 200)}`));
+      return;
+    }
+
+    const request = this.pending.get(response.id);
+    if (!request) {
+      return;
+    }
+
+    const { id, type, ...record } = response;
+    if (type === 'event') {
+      request.events.push(record);
+      return;
+    }
+    if (type === 'file_start' || type === 'file_end') {
+      return;
+    }
+
+    this.pending.delete(id);
+    this._updateRef();
+
+    if (record.error) {
+      request.reject(new Error(record.error));
+    } else {
+      request.resolve({ events: request.events, errors: record.errors, skipped: record.skipped, stats: record.stats });
+    }
+  }
+
+  _fail(error) {
+    this.exited = true;
+    for (const { reject } of this.pending.values()) {
+      reject(error);
+    }
+    this.pending.clear();
+    this._updateRef();
+  }
+
+  _updateRef() {
+    // Only keep the Node event loop alive while requests are in flight
+    const method = this.pending.size > 0 ? 'ref' : 'unref';
+    this.process[method]();
+    this.process.stdin[method]();
+    this.process.stdout[method]();
+  }
+}
+
+/**
+ * Get the shared native worker, starting it if needed
+ *
+ * @returns {NativeWorker|null} The worker, or null if no system interpreter is available
+ */
+function getNativeWorker() {
+  if (worker && !worker.exited) {
+    return worker;
+  }
+
+  const pythonPath = findPythonInterpreter();
+  if (!pythonPath) {
+    return null;
+  }
+
+  worker = new NativeWorker(pythonPath);
+  return worker;
+}
+
+module.exports = {
+  getNativeWorker,
+  findPythonInterpreter,
+  NativeWorker,
+};
@@ -0,0 +1,249 @@
+"""
+Per-phase timing for the Python analytics tracking analyzer.
+
+When profiling is enabled, every analyzed file gets a FileProfile recording the
+wall-clock and CPU time spent in each phase of the pipeline, together with its
+size, AST node count and number of events. A RunProfile gathers the file
+profiles and summarizes them with totals, percentiles and the slowest files.
+
+Nothing in this module runs unless profiling is requested; the regular analysis
+path never imports it.
+"""
+
+from __future__ import annotations
+
+import time
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, List, Optional
+
+# Pipeline phases, in the order they run for a file
+PHASES = ('read', 'prefilter', 'parse', 'walk', 'extract', 'json')
+
+# Percentiles reported in run summaries
+PERCENTILES = (50, 90, 99)
+
+# Number of slowest files listed in run summaries
+SLOWEST_FILES = 10
+
+class _PhaseTimer:
+    """Context manager adding the time spent in its block to a phase."""
+    
+    __slots__ = ('profile', 'phase', 'wall', 'cpu')
+    
+    def __init__(self, profile: 'FileProfile', phase: str):
+        self.profile = profile
+        self.phase = phase
+    
+    def __enter__(self) -> None:
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.profile.add(self.phase, time.perf_counter() - self.wall, time.process_time() - self.cpu)
+
+class Stopwatch:
+    """Wall-clock and CPU time elapsed since creation, for work outside any file."""
+    
+    __slots__ = ('wall', 'cpu')
+    
+    def __init__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+    
+    def elapsed(self) -> Dict[str, float]:
+        """Return the elapsed {"wall", "cpu"} seconds."""
+        return {"wall": time.perf_counter() - self.wall, "cpu": time.process_time() - self.cpu}
+
+class FileProfile:
+    """
+    Timings and size metrics of one analyzed file.
+    
+    Attributes:
+        file_path: Path of the file
+        bytes: Size of the source in UTF-8 bytes
+        nodes: Number of AST nodes, 0 when the file was not parsed
+        events: Number of tracking events found
+        cached: Whether the result came from the result cache
+        prefiltered: Whether the prefilter skipped parsing
+        wall: Wall-clock seconds per phase
+        cpu: CPU seconds per phase
+    """
+    
+    __slots__ = ('file_path', 'bytes', 'nodes', 'events', 'cached', 'prefiltered', 'wall', 'cpu')
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.bytes = 0
+        self.nodes = 0
+        self.events = 0
+        self.cached = False
+        self.prefiltered = False
+        self.wall = dict.fromkeys(PHASES, 0.0)
+        self.cpu = dict.fromkeys(PHASES, 0.0)
+    
+    def measure(self, phase: str) -> _PhaseTimer:
+        """
+        Time a block of code as part of a phase.
+        
+        Args:
+            phase: One of PHASES
+        
+        Returns:
+            Context manager adding the block's wall and CPU time to the phase
+        """
+        return _PhaseTimer(self, phase)
+    
+    def add(self, phase: str, wall: float, cpu: float) -> None:
+        """Add wall and CPU seconds to a phase."""
+        self.wall[phase] += wall
+        self.cpu[phase] += cpu
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the JSON shape reported in profiles."""
+        return {
+            "filePath": self.file_path,
+            "bytes": self.bytes,
+            "nodes": self.nodes,
+            "events": self.events,
+            "cached": self.cached,
+            "prefiltered": self.prefiltered,
+            "wall": self.wall,
+            "cpu": self.cpu,
+        }
+
+class RunProfile:
+    """
+    Profiles of every file analyzed in a run.
+    
+    Attributes:
+        files: File profiles in analysis order, as dictionaries (see FileProfile.to_dict)
+    """
+    
+    def __init__(self, files: Optional[Iterable[Dict[str, Any]]] = None):
+        self.files: List[Dict[str, Any]] = list(files or ())
+        self._current: Optional[FileProfile] = None
+    
+    def start_file(self, file_path: str) -> FileProfile:
+        """
+        Start profiling a file; the previous file's profile is recorded.
+        
+        Args:
+            file_path: Path of the file
+        
+        Returns:
+            The new file profile
+        """
+        self.finish()
+        self._current = FileProfile(file_path)
+        return self._current
+    
+    def finish(self) -> None:
+        """Record the profile of the file in progress, if any."""
+        if self._current is not None:
+            self.files.append(self._current.to_dict())
+            self._current = None
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the run.
+        
+        Returns:
+            Dictionary with file, byte, node and event totals, per-phase wall and
+            CPU totals, percentiles of per-file wall and CPU time, and the slowest files
+        """
+        self.finish()
+        
+        totals = {
+            phase: {
+                "wall": sum(entry['wall'][phase] for entry in self.files),
+                "cpu": sum(entry['cpu'][phase] for entry in self.files),
+            }
+            for phase in PHASES
+        }
+        file_wall = sorted((sum(entry['wall'].values()), entry['filePath']) for entry in self.files)
+        file_cpu = sorted(sum(entry['cpu'].values()) for entry in self.files)
+        
+        return {
+            "files": len(self.files),
+            "bytes": sum(entry['bytes'] for entry in self.files),
+            "nodes": sum(entry['nodes'] for entry in self.files),
+            "events": sum(entry['events'] for entry in self.files),
+            "phases": totals,
+            "fileWall": distribution([wall for wall, _ in file_wall]),
+            "fileCpu": distribution(file_cpu),
+            "slowest": [
+                {"filePath": file_path, "wall": wall}
+                for wall, file_path in reversed(file_wall[-SLOWEST_FILES:])
+            ],
+        }
+
+def build_report(files: List[Dict[str, Any]], output: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Build the profile report of a run from its per-file profiles.
+    
+    Args:
+        files: Per-file profiles, as returned under "profile" by the batch entry points
+        output: Optional {"wall", "cpu"} seconds spent writing the run's output
+    
+    Returns:
+        Dictionary with the per-file profiles under "files" and the run "summary"
+    """
+    summary = RunProfile(files).summary()
+    if output is not None:
+        summary['output'] = output
+    return {"files": files, "summary": summary}
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+    
+    Args:
+        sorted_values: Values in ascending order
+        q: Percentile between 0 and 100
+    
+    Returns:
+        The percentile, or 0.0 when there are no values
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+def distribution(sorted_values: List[float]) -> Dict[str, float]:
+    """Summarize sorted values with their percentiles and maximum."""
+    result = {f"p{q}": percentile(sorted_values, q) for q in PERCENTILES}
+    result['max'] = sorted_values[-1] if sorted_values else 0.0
+    return result
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """
+    Render a run summary as a human-readable table.
+    
+    Args:
+        summary: Result of RunProfile.summary
+    
+    Returns:
+        Multi-line text
+    """
+    lines = [
+        f"Profiled {summary['files']} files, {summary['bytes']} bytes, "
+        f"{summary['nodes']} AST nodes, {summary['events']} events",
+        f"{'phase':<10} {'wall ms':>10} {'cpu ms':>10}",
+    ]
+    for phase, total in summary['phases'].items():
+        lines.append(f"{phase:<10} {total['wall'] * 1000:10.1f} {total['cpu'] * 1000:10.1f}")
+    if 'output' in summary:
+        lines.append(f"{'output':<10} {summary['output']['wall'] * 1000:10.1f} {summary['output']['cpu'] * 1000:10.1f}")
+    
+    for label, key in (('per-file wall ms', 'fileWall'), ('per-file cpu ms', 'fileCpu')):
+        values = '  '.join(f"{name} {value * 1000:.2f}" for name, value in summary[key].items())
+        lines.append(f"{label}: {values}")
+    
+    if summary['slowest']:
+        lines.append('slowest files:')
+        for entry in summary['slowest']:
+            lines.append(f"  {entry['wall'] * 1000:10.2f} ms  {entry['filePath']}")
+    return '\n'.join(lines)
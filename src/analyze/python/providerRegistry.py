@@ -0,0 +1,563 @@
+"""
+Provider registry for the Python analytics tracking analyzer.
+
+A provider describes how the tracking calls of one analytics library are
+recognized and how their event name, user id and properties are extracted.
+The registry compiles every provider into hash indexes keyed by the shape of
+the call, so finding the provider of a call costs a few dictionary lookups
+however many providers are registered.
+
+Besides the built-in providers, teams can describe their own in a JSON or YAML
+file (YAML requires PyYAML):
+
+    providers:
+      - name: heap
+        receiver: heap
+        method: track
+        eventArg: 1
+        propertiesArg: 2
+        userIdArg: 0
+      - name: internal
+        function: utils.tracking.track_event
+        eventArg: 0
+        propertiesKeyword: props
+
+Custom tracking functions are described with the same format, usually written
+compactly as a function spec string (see parse_function_spec).
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import re
+
+from eventModel import PropertySchema
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Pattern, Set, Tuple, Union
+    
+    # Extraction routines are called with the visitor and the call node
+    Extractor = Callable[[Any, ast.Call], Any]
+
+# Function spec strings: a dotted path with optional (event, properties) argument locations
+FUNCTION_SPEC_PATTERN = re.compile(
+    r'^\s*(?P<path>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)\s*'
+    r'(?:\(\s*(?P<event>\d+|[A-Za-z_]\w*)\s*(?:,\s*(?P<properties>\d+|[A-Za-z_]\w*)\s*)?\))?\s*$'
+)
+
+# A Python name, and a dotted path of them such as "self.tracking.emit"
+NAME_PATTERN = re.compile(r'[A-Za-z_]\w*')
+DOTTED_PATH_PATTERN = re.compile(r'[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*')
+
+# Keys accepted in a declarative provider description
+SPEC_KEYS = {
+    'name', 'receiver', 'method', 'function',
+    'eventArg', 'eventKeyword', 'propertiesArg', 'propertiesKeyword',
+    'userIdArg', 'userIdProperty',
+}
+
+class Provider:
+    """
+    An analytics provider and its extraction routines.
+    
+    Attributes:
+        name: Source name reported on events
+        event_name: Routine returning the event name of a call, or None
+        properties_node: Routine returning the dictionary node holding the event properties
+        user_id: Routine returning identity properties such as user_id
+        properties: Routine extracting the event properties directly, used instead of properties_node
+    """
+    
+    __slots__ = ('name', 'event_name', 'properties_node', 'user_id', 'properties')
+    
+    def __init__(
+        self,
+        name: str,
+        event_name: Extractor,
+        properties_node: Optional[Extractor] = None,
+        user_id: Optional[Extractor] = None,
+        properties: Optional[Extractor] = None
+    ):
+        self.name = name
+        self.event_name = event_name
+        self.properties_node = properties_node
+        self.user_id = user_id
+        self.properties = properties
+
+class ProviderRegistry:
+    """
+    Hash indexes from call shapes to providers.
+    
+    Calls are looked up in this order:
+        dispatch_calls: (function, first constant argument), e.g. snowplow('trackStructEvent', ...)
+        functions: function name, e.g. trackStructEvent(...)
+        qualified_calls: dotted path of three or more names, e.g. self.tracking.emit(...),
+            only computed when the method name is in qualified_methods
+        method_calls: (receiver, method), e.g. analytics.track(...)
+        event_class_calls: (method, class of the first argument), e.g. client.track(BaseEvent(...))
+        variable_calls: (receiver, method) with a variable first argument, e.g. tracker.track(event)
+    
+    When two providers claim the same key, the one registered first wins, so
+    providers loaded from a config file never shadow the built-in ones.
+    
+    Receivers, functions and classes are looked up under the names the calls
+    are made through, translated by a module's alias map (see aliases), so
+    seg.track(...) is found after "import segment.analytics as seg".
+    
+    Attributes:
+        providers: Registered providers by name
+        trigger_tokens: Identifiers at least one of which every detectable call contains
+        specs: Declarative descriptions added by compile_registry
+        spec_tokens: Trigger tokens of the providers registered from descriptions on
+            this registry itself, not copied from its parent
+        import_aliases: Name the calls are recognized by, by the dotted path of an
+            imported SDK module or class, e.g. "segment.analytics" -> "analytics"
+        client_factories: Receiver name of the objects a class or factory returns,
+            by its dotted path, e.g. "posthog.Posthog" -> "posthog"
+        sdk_modules: Top-level modules of the SDKs in import_aliases and client_factories
+    """
+    
+    def __init__(self, parent: Optional['ProviderRegistry'] = None):
+        """
+        Initialize the registry.
+        
+        Args:
+            parent: Optional registry whose providers are copied into this one
+        """
+        self.dispatch_calls: Dict[Tuple[str, Hashable], Provider] = {}
+        self.functions: Dict[str, Provider] = {}
+        self.qualified_calls: Dict[str, Provider] = {}
+        self.qualified_methods: Set[str] = set()
+        self.method_calls: Dict[Tuple[str, str], Provider] = {}
+        self.event_class_calls: Dict[Tuple[str, str], Provider] = {}
+        self.variable_calls: Dict[Tuple[str, str], Provider] = {}
+        self.providers: Dict[str, Provider] = {}
+        self.trigger_tokens: Set[str] = set()
+        self.specs: List[Dict[str, Any]] = []
+        self.spec_tokens: Set[str] = set()
+        self.import_aliases: Dict[str, str] = {}
+        self.client_factories: Dict[str, str] = {}
+        self.sdk_modules: Set[str] = set()
+        self._trigger_pattern: Optional[Pattern[str]] = None
+        self._trigger_pattern_bytes: Optional[Pattern[bytes]] = None
+        self._sdk_pattern: Optional[Pattern[str]] = None
+        self._sdk_pattern_bytes: Optional[Pattern[bytes]] = None
+        
+        if parent is not None:
+            for index in ('dispatch_calls', 'functions', 'qualified_calls', 'qualified_methods', 'method_calls',
+                          'event_class_calls', 'variable_calls', 'providers', 'trigger_tokens',
+                          'import_aliases', 'client_factories', 'sdk_modules'):
+                getattr(self, index).update(getattr(parent, index))
+            self.specs.extend(parent.specs)
+    
+    def _changed(self) -> None:
+        self._trigger_pattern = None
+        self._trigger_pattern_bytes = None
+        self._sdk_pattern = None
+        self._sdk_pattern_bytes = None
+    
+    def _register(self, index: Dict[Any, Provider], key: Any, provider: Provider, token: str) -> str:
+        index.setdefault(key, provider)
+        self.providers.setdefault(provider.name, provider)
+        self.trigger_tokens.add(token)
+        self._changed()
+        return token
+    
+    def add_dispatch_call(self, function: str, command: Hashable, provider: Provider) -> str:
+        """Recognize function(command, ...) calls, e.g. snowplow('trackStructEvent', {...}); returns the trigger token."""
+        return self._register(self.dispatch_calls, (function, command), provider, function)
+    
+    def add_function(self, function: str, provider: Provider) -> str:
+        """Recognize direct calls of a function, e.g. track_event('Signed Up', {...}); returns the trigger token."""
+        return self._register(self.functions, function, provider, function)
+    
+    def add_qualified_call(self, path: str, provider: Provider) -> str:
+        """
+        Recognize calls of a dotted path, e.g. track(...), utils.track(...) or self.tracking.emit(...).
+        
+        One- and two-part paths are registered as functions and method calls.
+        Returns the trigger token.
+        """
+        parts = path.split('.')
+        if len(parts) == 1:
+            return self.add_function(path, provider)
+        if len(parts) == 2:
+            return self.add_method_call(parts[0], parts[1], provider)
+        self.qualified_methods.add(parts[-1])
+        return self._register(self.qualified_calls, path, provider, parts[-1])
+    
+    def add_method_call(self, receiver: str, method: str, provider: Provider) -> str:
+        """Recognize receiver.method(...) calls, e.g. analytics.track(...); returns the trigger token."""
+        return self._register(self.method_calls, (receiver, method), provider, receiver)
+    
+    def add_event_class_call(self, method: str, event_class: str, provider: Provider) -> str:
+        """Recognize <any>.method(EventClass(...)) calls, e.g. client.track(BaseEvent(...)); returns the trigger token."""
+        return self._register(self.event_class_calls, (method, event_class), provider, event_class)
+    
+    def add_variable_call(self, receiver: str, method: str, provider: Provider) -> str:
+        """Recognize receiver.method(variable) calls, e.g. tracker.track(event); returns the trigger token."""
+        return self._register(self.variable_calls, (receiver, method), provider, receiver)
+    
+    def _add_sdk_path(self, path: str) -> None:
+        # An aliased import names every part of the path, and the last part is the
+        # one most specific to the SDK, so it keeps such modules past the prefilter
+        self.sdk_modules.add(path.split('.', 1)[0])
+        self.trigger_tokens.add(path.rsplit('.', 1)[-1])
+        self._changed()
+    
+    def add_import_alias(self, path: str, name: str) -> None:
+        """Recognize calls through an imported SDK module or class, e.g. seg.track(...) after "import segment.analytics as seg"."""
+        self.import_aliases.setdefault(path, name)
+        self._add_sdk_path(path)
+    
+    def add_client_factory(self, path: str, receiver: str) -> None:
+        """Recognize calls on the objects a class or factory returns, e.g. ph.capture(...) after "ph = Posthog(...)"."""
+        self.client_factories.setdefault(path, receiver)
+        self._add_sdk_path(path)
+    
+    def register_spec(self, spec: Dict[str, Any]) -> Provider:
+        """
+        Register a provider from its declarative description.
+        
+        Args:
+            spec: Provider description (see the module docstring)
+        
+        Returns:
+            The registered provider
+        
+        Raises:
+            ValueError: If the description is invalid
+        """
+        name = spec.get('name') if isinstance(spec, dict) else None
+        if not isinstance(name, str) or not name:
+            raise ValueError(f"Provider description needs a name: {spec!r}")
+        unknown = set(spec) - SPEC_KEYS
+        if unknown:
+            raise ValueError(f"Provider {name!r} has unknown keys: {', '.join(sorted(unknown))}")
+        
+        for key in ('eventArg', 'propertiesArg', 'userIdArg'):
+            if key in spec and (not isinstance(spec[key], int) or isinstance(spec[key], bool) or spec[key] < 0):
+                raise ValueError(f"Provider {name!r}: {key} must be a non-negative integer")
+        for key in ('receiver', 'method', 'eventKeyword', 'propertiesKeyword'):
+            if key in spec and (not isinstance(spec[key], str) or not NAME_PATTERN.fullmatch(spec[key])):
+                raise ValueError(f"Provider {name!r}: {key} must be an identifier")
+        if 'function' in spec and (not isinstance(spec['function'], str) or not DOTTED_PATH_PATTERN.fullmatch(spec['function'])):
+            raise ValueError(f"Provider {name!r}: function must be an identifier or a dotted path of identifiers")
+        if 'userIdProperty' in spec and not isinstance(spec['userIdProperty'], str):
+            raise ValueError(f"Provider {name!r}: userIdProperty must be a string")
+        if 'eventArg' not in spec and 'eventKeyword' not in spec:
+            raise ValueError(f"Provider {name!r} needs an eventArg or eventKeyword")
+        
+        provider = Provider(
+            name,
+            event_name=event_name_at(spec.get('eventArg'), spec.get('eventKeyword')),
+            properties_node=properties_at(spec.get('propertiesArg'), spec.get('propertiesKeyword')),
+            user_id=(
+                identity_at(spec['userIdArg'], spec.get('userIdProperty', 'user_id'))
+                if 'userIdArg' in spec else None
+            ),
+        )
+        
+        if spec.get('function'):
+            token = self.add_qualified_call(spec['function'], provider)
+        elif spec.get('receiver') and spec.get('method'):
+            token = self.add_method_call(spec['receiver'], spec['method'], provider)
+        else:
+            raise ValueError(f"Provider {name!r} needs either a function or a receiver and method")
+        self.spec_tokens.add(token)
+        
+        return provider
+    
+    def detect(self, node: ast.Call, aliases: Optional[Dict[str, str]] = None) -> Optional[Provider]:
+        """
+        Find the provider of a call.
+        
+        Args:
+            node: The function call AST node
+            aliases: Optional alias map of the module (see aliases)
+        
+        Returns:
+            The matching provider, or None if the call is not a tracking call
+        """
+        func = node.func
+        args = node.args
+        
+        if isinstance(func, ast.Attribute):
+            if func.attr in self.qualified_methods:
+                provider = self.qualified_calls.get(dotted_name(func))
+                if provider is not None:
+                    return provider
+            if not isinstance(func.value, ast.Name):
+                return None
+            receiver = func.value.id
+            if aliases:
+                receiver = aliases.get(receiver, receiver)
+            key = (receiver, func.attr)
+            provider = self.method_calls.get(key)
+            if provider is not None or not args:
+                return provider
+            
+            first_arg = args[0]
+            if isinstance(first_arg, ast.Call) and isinstance(first_arg.func, ast.Name):
+                event_class = first_arg.func.id
+                if aliases:
+                    event_class = aliases.get(event_class, event_class)
+                return self.event_class_calls.get((func.attr, event_class))
+            if isinstance(first_arg, ast.Name):
+                return self.variable_calls.get(key)
+            return None
+        
+        if isinstance(func, ast.Name):
+            function = func.id
+            if aliases:
+                function = aliases.get(function, function)
+            if args and isinstance(args[0], ast.Constant):
+                provider = self.dispatch_calls.get((function, args[0].value))
+                if provider is not None:
+                    return provider
+            return self.functions.get(function)
+        
+        return None
+    
+    def aliases(self, imports: Dict[str, str]) -> Dict[str, str]:
+        """
+        Build a module's alias map from the names it imports.
+        
+        A name imported from a known SDK path maps to the name its calls are
+        recognized by ("seg" -> "analytics" for "import segment.analytics as seg").
+        Any other name whose last path part is a trigger token maps to that part,
+        so "from utils import track_event as te" finds te(...) calls of a custom
+        track_event function.
+        
+        Args:
+            imports: Dotted path of each imported name (see importScan.scan_imports)
+        
+        Returns:
+            The recognized name of each imported name that differs from it
+        """
+        aliases: Dict[str, str] = {}
+        for local, path in imports.items():
+            name = self.import_aliases.get(path)
+            if name is None:
+                name = path.rsplit('.', 1)[-1]
+                if name not in self.trigger_tokens:
+                    continue
+            if name != local:
+                aliases[local] = name
+        return aliases
+    
+    def client_receiver(self, imports: Dict[str, str], factory: Optional[str]) -> Optional[str]:
+        """
+        Find the receiver name of the object a call returns, e.g. "posthog" for PH(...) after "from posthog import Posthog as PH".
+        
+        Args:
+            imports: Dotted path of each imported name
+            factory: Dotted name the call is made through, e.g. "PH" or "Snowplow.create_tracker"
+        
+        Returns:
+            The receiver name, or None if the call is not a known SDK client factory
+        """
+        if not factory:
+            return None
+        head, _, rest = factory.partition('.')
+        path = imports.get(head)
+        if path is None:
+            return None
+        return self.client_factories.get(f"{path}.{rest}" if rest else path)
+    
+    @property
+    def trigger_pattern(self) -> Pattern[str]:
+        """Whole-word regex matching any trigger token."""
+        if self._trigger_pattern is None:
+            tokens = sorted(self.trigger_tokens, key=len, reverse=True)
+            self._trigger_pattern = re.compile(r'\b(?:' + '|'.join(re.escape(token) for token in tokens) + r')\b')
+        return self._trigger_pattern
+    
+    @property
+    def trigger_pattern_bytes(self) -> Pattern[bytes]:
+        """trigger_pattern for searching ASCII source bytes without decoding them."""
+        if self._trigger_pattern_bytes is None:
+            self._trigger_pattern_bytes = re.compile(self.trigger_pattern.pattern.encode('utf-8'))
+        return self._trigger_pattern_bytes
+    
+    @property
+    def sdk_pattern(self) -> Pattern[str]:
+        """Regex matching an import statement of a known SDK module, or any trigger token in spec_tokens."""
+        if self._sdk_pattern is None:
+            modules = '|'.join(re.escape(module) for module in sorted(self.sdk_modules, key=len, reverse=True))
+            alternatives = [
+                r'^[ \t]*(?:from|import(?:[ \t]+[\w.]+(?:[ \t]+as[ \t]+\w+)?[ \t]*,)*)[ \t]+(?:' + modules + r')\b'
+            ] if modules else []
+            if self.spec_tokens:
+                tokens = sorted(self.spec_tokens, key=len, reverse=True)
+                alternatives.append(r'\b(?:' + '|'.join(re.escape(token) for token in tokens) + r')\b')
+            # A pattern that never matches when there is nothing to look for
+            self._sdk_pattern = re.compile('|'.join(alternatives) or r'(?!)', re.M)
+        return self._sdk_pattern
+    
+    @property
+    def sdk_pattern_bytes(self) -> Pattern[bytes]:
+        """sdk_pattern for searching ASCII source bytes without decoding them."""
+        if self._sdk_pattern_bytes is None:
+            self._sdk_pattern_bytes = re.compile(self.sdk_pattern.pattern.encode('utf-8'), re.M)
+        return self._sdk_pattern_bytes
+
+def dotted_name(node: ast.AST) -> Optional[str]:
+    """Render a chain of attribute accesses on a name, e.g. self.tracking.emit, or None for other expressions."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+def is_non_null_value(node: ast.AST) -> bool:
+    """Check if a node represents a non-null value."""
+    if isinstance(node, ast.Constant):
+        return node.value is not None
+    elif isinstance(node, ast.Name):
+        return True  # Variable reference, assume non-null
+    return False
+
+# Event name arguments: string constants, and names or attribute chains referring to one
+_EVENT_NAME_NODES = (ast.Constant, ast.Name, ast.Attribute)
+
+def _argument(
+    node: ast.Call,
+    position: Optional[int],
+    keyword: Optional[str],
+    accept: Union[type, Tuple[type, ...]],
+) -> Optional[ast.AST]:
+    """Find an argument by keyword, then by position, if it is an instance of accept."""
+    if keyword is not None:
+        for kw in node.keywords:
+            if kw.arg == keyword and isinstance(kw.value, accept):
+                return kw.value
+    if position is not None and len(node.args) > position and isinstance(node.args[position], accept):
+        return node.args[position]
+    return None
+
+def event_name_at(position: Optional[int], keyword: Optional[str] = None) -> Extractor:
+    """
+    Build a routine reading the event name from a keyword or positional argument.
+    
+    The name is a string constant, or a name or attribute chain such as
+    events.SIGNUP that the visitor resolves to a module constant.
+    """
+    def extract(visitor: Any, node: ast.Call) -> Any:
+        argument = _argument(node, position, keyword, _EVENT_NAME_NODES)
+        if argument is None:
+            return None
+        if isinstance(argument, ast.Constant):
+            return argument.value
+        return visitor.resolve_constant(argument)
+    return extract
+
+def properties_at(position: Optional[int], keyword: Optional[str] = None) -> Extractor:
+    """Build a routine returning the properties dictionary from a keyword or positional argument."""
+    def extract(visitor: Any, node: ast.Call) -> Optional[ast.Dict]:
+        return _argument(node, position, keyword, ast.Dict)
+    return extract
+
+def identity_at(position: int, property_name: str = 'user_id') -> Extractor:
+    """Build a routine reporting a string identity property when a non-null positional argument is passed."""
+    def extract(visitor: Any, node: ast.Call) -> Dict[str, PropertySchema]:
+        if len(node.args) > position and is_non_null_value(node.args[position]):
+            return {property_name: visitor.intern.schema('string')}
+        return {}
+    return extract
+
+def parse_function_spec(spec: str, name: str = 'custom') -> Dict[str, Any]:
+    """
+    Parse a custom tracking function spec string into a provider description.
+    
+    A spec is a function name or dotted path, optionally followed by the location
+    of the event name and of the properties, each either a position or a keyword:
+        
+        track_event                      track_event('Signed Up', {...})
+        utils.track(1, 2)                utils.track(user_id, 'Signed Up', {...})
+        self.tracking.emit(name, props)  self.tracking.emit(name='Signed Up', props={...})
+        log_event(0)                     log_event('Signed Up'), without properties
+    
+    Args:
+        spec: Function spec string
+        name: Source name reported on matching events
+    
+    Returns:
+        Provider description accepted by ProviderRegistry.register_spec
+    
+    Raises:
+        ValueError: If the spec cannot be parsed
+    """
+    match = FUNCTION_SPEC_PATTERN.match(spec)
+    if not match:
+        raise ValueError(f"Invalid custom function spec {spec!r}; expected e.g. 'module.track_event(0, 1)'")
+    
+    description: Dict[str, Any] = {'name': name, 'function': match.group('path')}
+    if match.group('event') is None:
+        # Standard format: customFunction('event_name', {...})
+        description.update(eventArg=0, propertiesArg=1)
+        return description
+    
+    for role, location in (('event', match.group('event')), ('properties', match.group('properties'))):
+        if location is None:
+            continue
+        if location.isdigit():
+            description[f'{role}Arg'] = int(location)
+        else:
+            description[f'{role}Keyword'] = location
+    return description
+
+def load_provider_config(path: str) -> List[Dict[str, Any]]:
+    """
+    Read provider descriptions from a JSON or YAML file.
+    
+    The file holds either a list of descriptions or a mapping with a
+    "providers" list.
+    
+    Args:
+        path: Path of the config file; .yaml and .yml files are read as YAML
+    
+    Returns:
+        List of provider descriptions
+    
+    Raises:
+        ValueError: If the file cannot be parsed or has the wrong shape
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(f"PyYAML is required to read {path}; use a JSON provider config instead") from None
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+    
+    if isinstance(config, dict):
+        config = config.get('providers')
+    if not isinstance(config, list):
+        raise ValueError(f"{path} must contain a list of providers")
+    return config
+
+def compile_registry(base: ProviderRegistry, specs: Iterable[Dict[str, Any]]) -> ProviderRegistry:
+    """
+    Extend a registry with providers from declarative descriptions.
+    
+    Args:
+        base: Registry holding the built-in providers; left unchanged
+        specs: Provider descriptions
+    
+    Returns:
+        A new registry with the extra providers registered after the built-in ones
+    """
+    registry = ProviderRegistry(base)
+    for spec in specs:
+        registry.register_spec(spec)
+        registry.specs.append(spec)
+    return registry
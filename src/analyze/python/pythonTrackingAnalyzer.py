@@ -18,23 +18,86 @@ The analyzer uses Python's AST (Abstract Syntax Tree) module to parse code and i
 tracking patterns specific to each library.
 """
 
+from __future__ import annotations
+
 import ast
+import functools
 import json
-from typing import Dict, List, Optional, Any, Union
-
-# Type aliases for clarity
-PropertyType = Union[str, Dict[str, Any]]
-EventProperties = Dict[str, Dict[str, PropertyType]]
-AnalyticsEvent = Dict[str, Any]
-
-# Supported analytics sources
-ANALYTICS_SOURCES = {
-    'segment': {'object': 'analytics', 'method': 'track'},
-    'mixpanel': {'object': 'mp', 'method': 'track'},
-    'rudderstack': {'object': 'rudder_analytics', 'method': 'track'},
-    'posthog': {'object': 'posthog', 'method': 'capture'},
-    'amplitude': {'event_class': 'BaseEvent'},
-    'snowplow': {'event_class': 'StructuredEvent', 'tracker_object': 'tracker'}
+import os
+import sys
+import time
+
+from eventModel import InternTable, PropertySchema, StringTable, TrackingEvent, json_default
+from importScan import scan_imports
+from providerRegistry import (
+    Provider,
+    ProviderRegistry,
+    compile_registry,
+    dotted_name,
+    event_name_at,
+    identity_at,
+    is_non_null_value,
+    load_provider_config,
+    parse_function_spec,
+    properties_at,
+)
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Pattern, Sequence, TextIO, Tuple, Union
+    
+    from constantIndex import ProjectConstants
+    from eventModel import Schema
+    from phaseProfiler import FileProfile
+    from resultCache import ResultCache
+    from scanManifest import Outcome, ScanManifest
+    from skipPolicy import SkipPolicy
+    
+    # Type aliases for clarity
+    PropertyType = Union[str, PropertySchema]
+    EventProperties = Dict[str, Schema]
+    CustomFunctions = Union[str, Sequence[str], None]
+    # Source code as text, or as bytes decoded by the parser according to PEP 263
+    Source = Union[str, bytes]
+
+AnalyticsEvent = TrackingEvent
+
+# Supported analytics sources called as receiver.method(user_id, 'event_name', {...}),
+# described in the same format as providers loaded from a config file
+ANALYTICS_SOURCES = [
+    {'name': 'segment', 'receiver': 'analytics', 'method': 'track',
+     'eventArg': 1, 'propertiesArg': 2, 'userIdArg': 0},
+    {'name': 'mixpanel', 'receiver': 'mp', 'method': 'track',
+     'eventArg': 1, 'propertiesArg': 2, 'userIdArg': 0, 'userIdProperty': 'distinct_id'},
+    {'name': 'rudderstack', 'receiver': 'rudder_analytics', 'method': 'track',
+     'eventArg': 1, 'propertiesArg': 2, 'userIdArg': 0},
+]
+
+# Direct function calls that identify Snowplow tracking
+SNOWPLOW_FUNCTIONS = {'trackStructEvent', 'buildStructEvent'}
+
+# Snowplow's snowplow('trackStructEvent', {...}) dispatch function
+SNOWPLOW_DISPATCH_FUNCTION = 'snowplow'
+
+# SDK modules and classes by import path, with the name their calls are recognized
+# by, so "import segment.analytics as seg" makes seg.track(...) a Segment call
+SDK_IMPORT_ALIASES = {
+    'segment.analytics': 'analytics',
+    'analytics': 'analytics',
+    'rudderstack.analytics': 'rudder_analytics',
+    'posthog': 'posthog',
+    'amplitude.BaseEvent': 'BaseEvent',
+    'snowplow_tracker.StructuredEvent': 'StructuredEvent',
+}
+
+# SDK client classes and factories by import path, with the receiver name their
+# objects' calls are recognized by, e.g. ph = Posthog(...); ph.capture(...)
+SDK_CLIENT_FACTORIES = {
+    'posthog.Posthog': 'posthog',
+    'mixpanel.Mixpanel': 'mp',
+    'snowplow_tracker.Tracker': 'tracker',
+    'snowplow_tracker.Snowplow.create_tracker': 'tracker',
 }
 
 # Type mappings from Python to JSON Schema types
@@ -53,7 +116,99 @@ ARRAY_TYPES = {'List', 'Tuple', 'Set', 'list', 'tuple', 'set'}
 # Container types that map to objects
 OBJECT_TYPES = {'Dict', 'dict'}
 
-class TrackingVisitor(ast.NodeVisitor):
+# Node types that open a new function context and variable type scope
+SCOPE_NODE_TYPES = (ast.FunctionDef, ast.ClassDef)
+
+# Fields that only ever hold operators or expression contexts, which contain nothing to visit
+LEAF_FIELDS = {'ctx', 'op', 'ops'}
+
+# Marker pushed on the traversal stack to close a scope once all its children are visited
+_SCOPE_EXIT = object()
+
+@functools.lru_cache(maxsize=None)
+def _traversal_fields(node_type: type) -> Tuple[str, ...]:
+    """Fields of a node type that may hold child nodes, in reverse order for pushing onto a stack."""
+    return tuple(reversed([field for field in node_type._fields if field not in LEAF_FIELDS]))
+
+class BudgetExceeded(Exception):
+    """Raised when a file runs past its per-file time budget or is nested too deeply to analyze."""
+
+class FileBudget:
+    """
+    Per-file limits bounding the analysis of pathological sources.
+    
+    The time budget is checked once the file is parsed and after every node the
+    visitor handles, so a file that runs over stops with the events found so
+    far. ast.parse itself cannot be interrupted: a parse that overruns is only
+    noticed once it returns, so bound parse time with the skip policy's
+    maxBytes. The depth cap bounds how deeply nested property dictionaries are
+    followed; deeper values are reported as plain objects.
+    
+    Attributes:
+        seconds: Wall-clock budget per file, or None for no limit
+        max_depth: Deepest nested property dictionary followed, or None for no limit
+        deadline: time.perf_counter() value the current file must be done by, or None
+        exceeded: Diagnostic of the depth cap hit by the current file, or None
+    """
+    
+    __slots__ = ('seconds', 'max_depth', 'deadline', 'exceeded')
+    
+    def __init__(self, seconds: Optional[float] = None, max_depth: Optional[int] = None):
+        self.seconds = seconds
+        self.max_depth = max_depth
+        self.deadline: Optional[float] = None
+        self.exceeded: Optional[str] = None
+    
+    @classmethod
+    def from_options(cls, time_budget: Optional[float], max_depth: Optional[int]) -> Optional['FileBudget']:
+        """
+        Build a budget from the time_budget and max_depth options.
+        
+        Args:
+            time_budget: Wall-clock seconds allowed per file, or None
+            max_depth: Nesting-depth cap of property dictionaries, or None
+            
+        Returns:
+            The budget, or None when neither limit is set
+            
+        Raises:
+            ValueError: If a limit is invalid
+        """
+        if time_budget is None and max_depth is None:
+            return None
+        if time_budget is not None and (isinstance(time_budget, bool) or not isinstance(time_budget, (int, float)) or not time_budget > 0):
+            raise ValueError("Time budget must be a positive number of seconds")
+        if max_depth is not None and (isinstance(max_depth, bool) or not isinstance(max_depth, int) or max_depth < 0):
+            raise ValueError("Maximum depth must be a non-negative integer")
+        return cls(time_budget, max_depth)
+    
+    def start(self) -> None:
+        """Start the budget of the next file."""
+        self.deadline = time.perf_counter() + self.seconds if self.seconds is not None else None
+        self.exceeded = None
+    
+    def check(self, phase: str) -> None:
+        """
+        Stop the current file if it has run past its time budget.
+        
+        Args:
+            phase: Analysis phase named in the diagnostic
+            
+        Raises:
+            BudgetExceeded: If the deadline has passed
+        """
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise BudgetExceeded(f"time budget of {self.seconds:g}s exceeded during {phase}")
+    
+    def depth_exceeded(self, lineno: int) -> None:
+        """Record that the current file nests property dictionaries deeper than the cap, keeping the first occurrence."""
+        if self.exceeded is None:
+            self.exceeded = (
+                f"{BudgetExceeded.__name__}: nesting-depth cap of {self.max_depth} exceeded at line {lineno}, "
+                "deeper properties are reported as plain objects"
+            )
+
+class TrackingVisitor:
     """
     AST visitor that identifies and extracts analytics tracking calls from Python code.
     
@@ -61,39 +216,129 @@ class TrackingVisitor(ast.NodeVisitor):
     analytics library patterns. It extracts event names, properties, and metadata
     for each tracking call found.
     
+    The traversal is iterative and only dispatches on the node types the analyzer
+    handles (see visit), so the visit_* methods never recurse into children.
+    
     Attributes:
-        events: List of analytics events found in the code
+        events: List of analytics events found in the code, unless an on_event callback was given
         filepath: Path to the file being analyzed
         current_function: Name of the current function being visited
         function_stack: Stack of function contexts for nested functions
         var_types: Dictionary of variable types in the current scope
         var_types_stack: Stack of variable type scopes
-        custom_function: Optional name of a custom tracking function
+        custom_function: Optional custom tracking function spec, or a list of them
+        registry: Provider registry used to recognize tracking calls
+        emit: Callback receiving each event as soon as it is found
+        intern: Table sharing identical strings and property schemas
+        budget: Optional per-file time budget and nesting-depth cap
+        constants: Optional function resolving names used as event names to string constants
+        imports: Dotted path of each name the module imports (see importScan)
+        aliases: Name each aliased receiver, function or class is recognized by (see ProviderRegistry.aliases)
     """
     
-    def __init__(self, filepath: str, custom_function: Optional[str] = None):
+    def __init__(
+        self,
+        filepath: str,
+        custom_function: CustomFunctions = None,
+        on_event: Optional[Callable[[AnalyticsEvent], None]] = None,
+        registry: Optional[ProviderRegistry] = None,
+        intern: Optional[InternTable] = None,
+        budget: Optional[FileBudget] = None,
+        constants: Optional[Callable[[str], Optional[str]]] = None,
+        imports: Optional[Dict[str, str]] = None
+    ):
         """
         Initialize the tracking visitor.
         
         Args:
             filepath: Path to the Python file being analyzed
-            custom_function: Optional name of a custom tracking function to detect
+            custom_function: Optional custom tracking function spec to detect, or a
+                list of them (see parse_function_spec)
+            on_event: Optional callback receiving each event as soon as it is found,
+                instead of collecting events in the events list
+            registry: Optional provider registry; defaults to the built-in providers
+                plus the custom functions
+            intern: Optional intern table shared across a scan; defaults to one
+                for this visitor only
+            budget: Optional started FileBudget; the walk stops with BudgetExceeded
+                past its deadline and nested properties are followed up to its depth cap
+            constants: Optional function resolving a name or attribute chain, such as
+                "events.SIGNUP", to the string constant it refers to (see constantIndex)
+            imports: Optional dotted path of each name the module imports, as found by
+                importScan.scan_imports, so calls through aliased SDK imports are recognized
         """
         self.events: List[AnalyticsEvent] = []
-        self.filepath = filepath
+        self.emit = on_event if on_event is not None else self.events.append
+        self.intern = intern if intern is not None else InternTable()
+        self.filepath = self.intern.string(filepath)
         self.current_function = 'global'
         self.function_stack: List[str] = []
         self.var_types: Dict[str, PropertyType] = {}
         self.var_types_stack: List[Dict[str, PropertyType]] = []
         self.custom_function = custom_function
+        self.registry = registry if registry is not None else provider_registry(custom_function)
+        self.budget = budget
+        self.max_depth = budget.max_depth if budget is not None else None
+        self._depth = 0
+        self.constants = constants
+        self.imports = imports or {}
+        self.aliases = self.registry.aliases(self.imports) if imports else {}
+    
+    def visit(self, tree: ast.AST) -> None:
+        """
+        Walk an AST and dispatch its nodes to the visit_* handlers.
+        
+        The walk uses an explicit stack instead of recursion, so deeply nested
+        code never raises RecursionError. Nodes are visited in the same pre-order
+        as ast.NodeVisitor, but handlers are looked up by exact node type and only
+        exist for the nodes the analyzer cares about; operators and expression
+        contexts are never pushed at all.
+        
+        Args:
+            tree: Root node to walk, usually an ast.Module
+            
+        Raises:
+            BudgetExceeded: If the walk runs past the budget's deadline
+        """
+        handlers = self._handlers
+        check = self.budget.check if self.budget is not None and self.budget.deadline is not None else None
+        stack: List[Any] = [tree]
+        pop = stack.pop
+        push = stack.append
         
+        while stack:
+            node = pop()
+            if node is _SCOPE_EXIT:
+                self._exit_scope()
+                continue
+            
+            node_type = type(node)
+            handler = handlers.get(node_type)
+            if handler is not None:
+                handler(self, node)
+                if node_type in SCOPE_NODE_TYPES:
+                    push(_SCOPE_EXIT)
+                if check is not None:
+                    check('walk')
+            
+            # Push children in reverse so they are popped in source order
+            for field in _traversal_fields(node_type):
+                value = getattr(node, field, None)
+                if isinstance(value, list):
+                    for child in reversed(value):
+                        if isinstance(child, ast.AST):
+                            push(child)
+                elif isinstance(value, ast.AST):
+                    push(value)
+    
     def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
         """
         Visit a function definition node and track context and variable types.
         
         This method maintains the function context stack and creates a new scope
         for variable types when entering a function. It also extracts type
-        annotations from function parameters.
+        annotations from function parameters. The scope is closed by visit once
+        all children of the function have been visited.
         
         Args:
             node: The function definition AST node
@@ -104,20 +349,13 @@ class TrackingVisitor(ast.NodeVisitor):
         
         # Create new scope for variable types
         self.var_types = {}
-        self.current_function = node.name
+        self.current_function = self.intern.string(node.name)
         
         # Extract parameter type annotations
         for arg in node.args.args:
             if arg.annotation:
                 # Store the type annotation for this parameter
                 self.var_types[arg.arg] = self.extract_type_annotation(arg.annotation)
-        
-        # Visit children
-        self.generic_visit(node)
-        
-        # Restore function context and variable types
-        self.current_function = self.function_stack.pop()
-        self.var_types = self.var_types_stack.pop()
     
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
         """
@@ -136,11 +374,10 @@ class TrackingVisitor(ast.NodeVisitor):
         
         # Create new scope for the class
         self.var_types = {}
-        self.current_function = class_name
-        
-        self.generic_visit(node)
-        
-        # Restore context
+        self.current_function = self.intern.string(class_name)
+    
+    def _exit_scope(self) -> None:
+        """Restore the function context and variable types saved when a scope was entered."""
         self.current_function = self.function_stack.pop()
         self.var_types = self.var_types_stack.pop()
     
@@ -155,7 +392,7 @@ class TrackingVisitor(ast.NodeVisitor):
             annotation: The type annotation AST node
             
         Returns:
-            A string representing the JSON Schema type or a dictionary for complex types
+            A string representing the JSON Schema type or a PropertySchema for complex types
         """
         if isinstance(annotation, ast.Name):
             # Simple types like int, str, bool
@@ -171,10 +408,7 @@ class TrackingVisitor(ast.NodeVisitor):
                     # Try to get the type parameter for arrays
                     if isinstance(annotation.slice, ast.Name):
                         element_type = self.extract_type_annotation(annotation.slice)
-                        return {
-                            'type': 'array',
-                            'items': {'type': element_type}
-                        }
+                        return self.intern.schema('array', items=self.intern.schema(element_type))
                     return 'array'
                     
                 elif container_type in OBJECT_TYPES:
@@ -196,7 +430,6 @@ class TrackingVisitor(ast.NodeVisitor):
         if isinstance(node.target, ast.Name) and node.annotation:
             # Store the type annotation for this variable
             self.var_types[node.target.id] = self.extract_type_annotation(node.annotation)
-        self.generic_visit(node)
     
     def visit_Assign(self, node: ast.Assign) -> None:
         """
@@ -213,7 +446,16 @@ class TrackingVisitor(ast.NodeVisitor):
             # Try to infer type from literal values
             if isinstance(node.value, ast.Constant):
                 self.var_types[var_name] = self.get_value_type(node.value.value)
-        self.generic_visit(node)
+            
+            # Names bound to SDK clients, e.g. ph = Posthog(...), are recognized as the SDK's receiver
+            if self.imports:
+                receiver = None
+                if isinstance(node.value, ast.Call):
+                    receiver = self.registry.client_receiver(self.imports, dotted_name(node.value.func))
+                if receiver is not None and receiver != var_name:
+                    self.aliases[var_name] = receiver
+                else:
+                    self.aliases.pop(var_name, None)
     
     def visit_Call(self, node: ast.Call) -> None:
         """
@@ -226,33 +468,29 @@ class TrackingVisitor(ast.NodeVisitor):
             node: The function call AST node
         """
         # Check if this is an analytics tracking call
-        source = self.detect_source(node)
-        if source:
-            event_name = self.extract_event_name(node, source)
+        provider = self.registry.detect(node, self.aliases)
+        if provider:
+            event_name = self.extract_event_name(node, provider)
             if event_name:
-                properties = self.extract_properties(node, source)
+                properties = self.extract_properties(node, provider)
                 
                 # Create the event record
-                event = {
-                    "eventName": event_name,
-                    "source": source,
-                    "properties": properties,
-                    "filePath": self.filepath,
-                    "line": node.lineno,
-                    "functionName": self.current_function
-                }
-                self.events.append(event)
-        
-        # Continue visiting child nodes
-        self.generic_visit(node)
+                event = TrackingEvent(
+                    self.intern.string(event_name),
+                    provider.name,
+                    properties,
+                    self.filepath,
+                    node.lineno,
+                    self.current_function
+                )
+                self.emit(event)
     
     def detect_source(self, node: ast.Call) -> Optional[str]:
         """
         Detect which analytics library is being used in a function call.
         
-        Checks the function call against known patterns for supported analytics
-        libraries including Segment, Mixpanel, Amplitude, PostHog, Rudderstack,
-        Snowplow, and custom functions.
+        The call is looked up in the provider registry's hash indexes, so the
+        cost does not depend on how many providers are registered.
         
         Args:
             node: The function call AST node
@@ -260,126 +498,47 @@ class TrackingVisitor(ast.NodeVisitor):
         Returns:
             The name of the detected analytics source, or None if not recognized
         """
-        # Check for method calls (e.g., analytics.track())
-        if isinstance(node.func, ast.Attribute):
-            return self._detect_method_call_source(node)
-        
-        # Check for direct function calls
-        elif isinstance(node.func, ast.Name):
-            return self._detect_function_call_source(node)
-        
-        return None
-    
-    def _detect_method_call_source(self, node: ast.Call) -> Optional[str]:
-        """Helper method to detect analytics source from method calls."""
-        if not hasattr(node.func.value, 'id'):
-            return None
-            
-        obj_id = node.func.value.id
-        method_name = node.func.attr
-        
-        # Check standard analytics libraries
-        for source, config in ANALYTICS_SOURCES.items():
-            if 'object' in config and 'method' in config:
-                if obj_id == config['object'] and method_name == config['method']:
-                    return source
-        
-        # Special case: Amplitude with BaseEvent
-        if method_name == 'track' and self._is_amplitude_call(node):
-            return 'amplitude'
-        
-        # Special case: Snowplow with StructuredEvent
-        if method_name == 'track' and self._is_snowplow_tracker_call(node):
-            return 'snowplow'
-        
-        return None
-    
-    def _detect_function_call_source(self, node: ast.Call) -> Optional[str]:
-        """Helper method to detect analytics source from direct function calls."""
-        func_name = node.func.id
-        
-        # Check for Snowplow direct functions
-        if func_name in ['trackStructEvent', 'buildStructEvent']:
-            return 'snowplow'
-        
-        # Check for Snowplow's snowplow('trackStructEvent', {...}) pattern
-        if func_name == 'snowplow' and self._is_snowplow_function_call(node):
-            return 'snowplow'
-        
-        # Check for custom tracking function
-        if self.custom_function and func_name == self.custom_function:
-            return 'custom'
-        
-        return None
-    
-    def _is_amplitude_call(self, node: ast.Call) -> bool:
-        """Check if the call matches Amplitude's BaseEvent pattern."""
-        if len(node.args) < 1:
-            return False
-            
-        first_arg = node.args[0]
-        if isinstance(first_arg, ast.Call) and isinstance(first_arg.func, ast.Name):
-            return first_arg.func.id == 'BaseEvent'
-        return False
-    
-    def _is_snowplow_tracker_call(self, node: ast.Call) -> bool:
-        """Check if the call matches Snowplow's tracker.track() pattern."""
-        if len(node.args) < 1:
-            return False
-            
-        first_arg = node.args[0]
-        # Check if first argument is StructuredEvent
-        if isinstance(first_arg, ast.Call) and isinstance(first_arg.func, ast.Name):
-            return first_arg.func.id == 'StructuredEvent'
-        
-        # Also check if it might be a variable (simple heuristic)
-        if isinstance(first_arg, ast.Name) and hasattr(node.func, 'value'):
-            return node.func.value.id == 'tracker'
-            
-        return False
-    
-    def _is_snowplow_function_call(self, node: ast.Call) -> bool:
-        """Check if this is a snowplow('trackStructEvent', {...}) call."""
-        if len(node.args) >= 1 and isinstance(node.args[0], ast.Constant):
-            return node.args[0].value == 'trackStructEvent'
-        return False
+        provider = self.registry.detect(node, self.aliases)
+        return provider.name if provider else None
     
-    def extract_event_name(self, node: ast.Call, source: str) -> Optional[str]:
+    def extract_event_name(self, node: ast.Call, provider: Provider) -> Optional[str]:
         """
         Extract the event name from an analytics tracking call.
         
-        Different analytics libraries have different patterns for specifying
-        event names. This method handles the extraction for each supported source.
-        
         Args:
             node: The function call AST node
-            source: The detected analytics source
+            provider: The detected analytics provider
             
         Returns:
             The extracted event name, or None if not found
         """
         try:
-            if source in ['segment', 'rudderstack', 'mixpanel']:
-                return self._extract_standard_event_name(node)
-            elif source == 'amplitude':
-                return self._extract_amplitude_event_name(node)
-            elif source == 'posthog':
-                return self._extract_posthog_event_name(node)
-            elif source == 'snowplow':
-                return self._extract_snowplow_event_name(node)
-            elif source == 'custom':
-                return self._extract_custom_event_name(node)
+            return provider.event_name(self, node)
         except Exception:
             # Silently fail and return None for any extraction errors
-            pass
+            return None
+    
+    def resolve_constant(self, node: ast.AST) -> Optional[str]:
+        """
+        Resolve an event name given as a name or attribute chain, such as events.SIGNUP.
         
-        return None
+        Args:
+            node: The event name argument
+            
+        Returns:
+            The string constant the name refers to, or None if it is not a known constant
+        """
+        if self.constants is None:
+            return None
+        dotted = dotted_name(node)
+        return self.constants(dotted) if dotted is not None else None
     
-    def _extract_standard_event_name(self, node: ast.Call) -> Optional[str]:
-        """Extract event name for Segment/Rudderstack/Mixpanel format."""
-        # Format: library.track(user_id/distinct_id, 'event_name', {...})
-        if len(node.args) >= 2 and isinstance(node.args[1], ast.Constant):
-            return node.args[1].value
+    def _event_name_value(self, node: ast.AST) -> Optional[str]:
+        """Return the event name given by a string constant or by a name resolving to one."""
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, (ast.Name, ast.Attribute)):
+            return self.resolve_constant(node)
         return None
     
     def _extract_amplitude_event_name(self, node: ast.Call) -> Optional[str]:
@@ -391,25 +550,8 @@ class TrackingVisitor(ast.NodeVisitor):
         base_event_call = node.args[0]
         # Look for event_type in keyword arguments
         for keyword in base_event_call.keywords:
-            if keyword.arg == 'event_type' and isinstance(keyword.value, ast.Constant):
-                return keyword.value.value
-        return None
-    
-    def _extract_posthog_event_name(self, node: ast.Call) -> Optional[str]:
-        """Extract event name for PostHog format."""
-        # PostHog has multiple formats:
-        # 1. posthog.capture('distinct_id', 'event_name', {...})
-        # 2. posthog.capture('distinct_id', event='event_name', properties={...})
-        
-        # Check for named parameters first (event='event_name')
-        for keyword in node.keywords:
-            if keyword.arg == 'event' and isinstance(keyword.value, ast.Constant):
-                return keyword.value.value
-        
-        # If no named event parameter, check positional args (second arg is event name)
-        if len(node.args) >= 2 and isinstance(node.args[1], ast.Constant):
-            return node.args[1].value
-        
+            if keyword.arg == 'event_type':
+                return self._event_name_value(keyword.value)
         return None
     
     def _extract_snowplow_event_name(self, node: ast.Call) -> Optional[str]:
@@ -418,33 +560,26 @@ class TrackingVisitor(ast.NodeVisitor):
         if len(node.args) >= 1:
             first_arg = node.args[0]
             if isinstance(first_arg, ast.Call) and isinstance(first_arg.func, ast.Name):
-                if first_arg.func.id == 'StructuredEvent':
+                if self.aliases.get(first_arg.func.id, first_arg.func.id) == 'StructuredEvent':
                     # Look for action in keyword arguments
                     for keyword in first_arg.keywords:
-                        if keyword.arg == 'action' and isinstance(keyword.value, ast.Constant):
-                            return keyword.value.value
+                        if keyword.arg == 'action':
+                            return self._event_name_value(keyword.value)
         
         # Pattern 2 & 3: Other Snowplow patterns would need additional handling
         # For now, return None for these cases
         return None
     
-    def _extract_custom_event_name(self, node: ast.Call) -> Optional[str]:
-        """Extract event name for custom tracking function."""
-        # Standard format: customFunction('event_name', {...})
-        if len(node.args) >= 1 and isinstance(node.args[0], ast.Constant):
-            return node.args[0].value
-        return None
-    
-    def extract_properties(self, node: ast.Call, source: str) -> EventProperties:
+    def extract_properties(self, node: ast.Call, provider: Provider) -> EventProperties:
         """
         Extract properties from an analytics tracking call.
         
         This method extracts the properties/attributes passed to the tracking call,
-        handling the different formats used by various analytics libraries.
+        using the extraction routines attached to the provider.
         
         Args:
             node: The function call AST node
-            source: The detected analytics source
+            provider: The detected analytics provider
             
         Returns:
             Dictionary of properties with their types
@@ -453,21 +588,17 @@ class TrackingVisitor(ast.NodeVisitor):
         
         try:
             # Extract user/distinct ID if present
-            user_id_prop = self._extract_user_id(node, source)
-            if user_id_prop:
-                properties.update(user_id_prop)
+            if provider.user_id:
+                properties.update(provider.user_id(self, node))
             
-            # Special handling for Snowplow StructuredEvent
-            if source == 'snowplow':
-                snowplow_props = self._extract_snowplow_properties(node)
-                properties.update(snowplow_props)
-            else:
-                # Get the properties dictionary node for other sources
-                props_node = self._get_properties_node(node, source)
-                
+            if provider.properties:
+                # Providers such as Snowplow spread properties over several arguments
+                properties.update(provider.properties(self, node))
+            elif provider.properties_node:
                 # Extract properties from the dictionary
+                props_node = provider.properties_node(self, node)
                 if props_node and isinstance(props_node, ast.Dict):
-                    extracted_props = self._extract_dict_properties(props_node, source)
+                    extracted_props = self._extract_dict_properties(props_node, provider.name)
                     properties.update(extracted_props)
                 
         except Exception:
@@ -476,42 +607,6 @@ class TrackingVisitor(ast.NodeVisitor):
             
         return properties
     
-    def _extract_user_id(self, node: ast.Call, source: str) -> EventProperties:
-        """Extract user/distinct ID from tracking call if present."""
-        user_id_props = {}
-        
-        if source in ['segment', 'rudderstack']:
-            # Format: analytics.track(user_id, ...)
-            if len(node.args) > 0:
-                user_id_node = node.args[0]
-                if self._is_non_null_value(user_id_node):
-                    user_id_props["user_id"] = {"type": "string"}
-                    
-        elif source == 'mixpanel':
-            # Format: mp.track(distinct_id, ...)
-            if len(node.args) > 0:
-                distinct_id_node = node.args[0]
-                if self._is_non_null_value(distinct_id_node):
-                    user_id_props["distinct_id"] = {"type": "string"}
-                    
-        elif source == 'amplitude':
-            # Check BaseEvent for user_id parameter
-            user_id_props.update(self._extract_amplitude_user_id(node))
-            
-        elif source == 'posthog':
-            # Check if event is not anonymous and extract distinct_id
-            user_id_props.update(self._extract_posthog_user_id(node))
-            
-        return user_id_props
-    
-    def _is_non_null_value(self, node: ast.AST) -> bool:
-        """Check if a node represents a non-null value."""
-        if isinstance(node, ast.Constant):
-            return node.value is not None
-        elif isinstance(node, ast.Name):
-            return True  # Variable reference, assume non-null
-        return False
-    
     def _extract_amplitude_user_id(self, node: ast.Call) -> EventProperties:
         """Extract user_id from Amplitude BaseEvent call."""
         if len(node.args) < 1 or not isinstance(node.args[0], ast.Call):
@@ -519,14 +614,14 @@ class TrackingVisitor(ast.NodeVisitor):
             
         base_event_call = node.args[0]
         for keyword in base_event_call.keywords:
-            if keyword.arg == 'user_id' and self._is_non_null_value(keyword.value):
-                return {"user_id": {"type": "string"}}
+            if keyword.arg == 'user_id' and is_non_null_value(keyword.value):
+                return {"user_id": self.intern.schema('string')}
         return {}
     
     def _extract_posthog_user_id(self, node: ast.Call) -> EventProperties:
         """Extract distinct_id from PostHog call if not anonymous."""
         # Check if event is anonymous by looking for $process_person_profile: False
-        props_node = self._get_properties_node(node, 'posthog')
+        props_node = _posthog_properties_node(self, node)
         
         if props_node and isinstance(props_node, ast.Dict):
             for i, key_node in enumerate(props_node.keys):
@@ -540,46 +635,16 @@ class TrackingVisitor(ast.NodeVisitor):
         if len(node.args) > 0 and isinstance(node.args[0], ast.Constant):
             distinct_id = node.args[0].value
             if distinct_id:
-                return {"distinct_id": {"type": "string"}}
+                return {"distinct_id": self.intern.schema('string')}
         return {}
     
-    def _get_properties_node(self, node: ast.Call, source: str) -> Optional[ast.Dict]:
-        """Get the properties dictionary node based on the analytics source."""
-        if source in ['segment', 'rudderstack', 'mixpanel']:
-            # Properties are in the third argument
-            if len(node.args) > 2:
-                return node.args[2]
-                
-        elif source == 'amplitude':
-            # Look for event_properties in BaseEvent
-            if len(node.args) >= 1 and isinstance(node.args[0], ast.Call):
-                base_event_call = node.args[0]
-                for keyword in base_event_call.keywords:
-                    if keyword.arg == 'event_properties' and isinstance(keyword.value, ast.Dict):
-                        return keyword.value
-                        
-        elif source == 'custom':
-            # Properties are in the second argument
-            if len(node.args) > 1:
-                return node.args[1]
-                
-        elif source == 'posthog':
-            # Check named parameters first, then positional
-            for keyword in node.keywords:
-                if keyword.arg == 'properties' and isinstance(keyword.value, ast.Dict):
+    def _get_amplitude_properties_node(self, node: ast.Call) -> Optional[ast.Dict]:
+        """Get the event_properties dictionary passed to Amplitude's BaseEvent."""
+        if len(node.args) >= 1 and isinstance(node.args[0], ast.Call):
+            base_event_call = node.args[0]
+            for keyword in base_event_call.keywords:
+                if keyword.arg == 'event_properties' and isinstance(keyword.value, ast.Dict):
                     return keyword.value
-            if len(node.args) > 2:
-                return node.args[2]
-                
-        elif source == 'snowplow':
-            # Handle StructuredEvent pattern
-            if len(node.args) >= 1:
-                first_arg = node.args[0]
-                if isinstance(first_arg, ast.Call) and isinstance(first_arg.func, ast.Name):
-                    if first_arg.func.id == 'StructuredEvent':
-                        # Return None as properties are handled differently for Snowplow
-                        return None
-                        
         return None
     
     def _extract_dict_properties(self, dict_node: ast.Dict, source: str) -> EventProperties:
@@ -596,7 +661,7 @@ class TrackingVisitor(ast.NodeVisitor):
                     if isinstance(value_node, ast.Dict):
                         nested_props = self.extract_nested_dict(value_node)
                         for nested_key, nested_value in nested_props.items():
-                            properties[f"{key}.{nested_key}"] = nested_value
+                            properties[self.intern.string(f"{key}.{nested_key}")] = nested_value
                     continue
                 
                 # Skip PostHog internal properties
@@ -606,7 +671,7 @@ class TrackingVisitor(ast.NodeVisitor):
                 # Extract property type
                 prop_type = self._extract_property_type(value_node)
                 if prop_type:
-                    properties[key] = prop_type
+                    properties[self.intern.string(key)] = prop_type
                     
         return properties
     
@@ -618,7 +683,7 @@ class TrackingVisitor(ast.NodeVisitor):
         if len(node.args) >= 1:
             first_arg = node.args[0]
             if isinstance(first_arg, ast.Call) and isinstance(first_arg.func, ast.Name):
-                if first_arg.func.id == 'StructuredEvent':
+                if self.aliases.get(first_arg.func.id, first_arg.func.id) == 'StructuredEvent':
                     # Extract all keyword arguments except 'action'
                     for keyword in first_arg.keywords:
                         if keyword.arg and keyword.arg != 'action':
@@ -630,43 +695,52 @@ class TrackingVisitor(ast.NodeVisitor):
                                 
         return properties
     
-    def _extract_property_type(self, value_node: ast.AST) -> Optional[Dict[str, Any]]:
+    def _extract_property_type(self, value_node: ast.AST) -> Optional[PropertySchema]:
         """Extract the type information for a property value."""
         if isinstance(value_node, ast.Constant):
             value_type = self.get_value_type(value_node.value)
-            return {"type": value_type}
+            return self.intern.schema(value_type)
             
         elif isinstance(value_node, ast.Name):
             # Check if we know the type of this variable
             var_name = value_node.id
             if var_name in self.var_types:
                 var_type = self.var_types[var_name]
-                if isinstance(var_type, dict):
+                if isinstance(var_type, PropertySchema):
                     return var_type
                 else:
-                    return {"type": var_type}
+                    return self.intern.schema(var_type)
             else:
-                return {"type": "any"}
+                return self.intern.schema("any")
                 
         elif isinstance(value_node, ast.Dict):
             # Nested dictionary
+            if self.max_depth is not None:
+                return self._extract_capped_dict(value_node)
             nested_props = self.extract_nested_dict(value_node)
-            return {
-                "type": "object",
-                "properties": nested_props
-            }
+            return self.intern.schema("object", properties=nested_props)
             
         elif isinstance(value_node, (ast.List, ast.Tuple)):
             # Array/list/tuple
             item_type = self.infer_sequence_item_type(value_node)
-            return {
-                "type": "array",
-                "items": item_type
-            }
+            return self.intern.schema("array", items=item_type)
             
         return None
     
-    def infer_sequence_item_type(self, seq_node: Union[ast.List, ast.Tuple]) -> Dict[str, str]:
+    def _extract_capped_dict(self, dict_node: ast.Dict) -> PropertySchema:
+        """Extract a nested dictionary, reporting it as a plain object beyond the budget's depth cap."""
+        if self._depth >= self.max_depth:
+            self.budget.depth_exceeded(dict_node.lineno)
+            return self.intern.schema("object")
+        
+        self._depth += 1
+        try:
+            nested_props = self.extract_nested_dict(dict_node)
+        finally:
+            self._depth -= 1
+        return self.intern.schema("object", properties=nested_props)
+    
+    def infer_sequence_item_type(self, seq_node: Union[ast.List, ast.Tuple]) -> PropertySchema:
         """
         Analyze a sequence (list or tuple) to determine the type of its items.
         
@@ -674,10 +748,10 @@ class TrackingVisitor(ast.NodeVisitor):
             seq_node: The list or tuple AST node
             
         Returns:
-            Dictionary representing the item type
+            Schema of the items
         """
         if not hasattr(seq_node, 'elts') or not seq_node.elts:
-            return {"type": "any"}
+            return self.intern.schema("any")
         
         # Get types of all elements
         element_types = []
@@ -701,16 +775,16 @@ class TrackingVisitor(ast.NodeVisitor):
         unique_types = set(element_types)
         
         if len(unique_types) == 1:
-            return {"type": element_types[0]}
+            return self.intern.schema(element_types[0])
         elif unique_types <= {"number", "string"}:
             # Common mixed case - numbers and strings
-            return {"type": "string"}
+            return self.intern.schema("string")
         elif unique_types <= {"number", "boolean"}:
             # Numbers and booleans
-            return {"type": "number"}
+            return self.intern.schema("number")
         else:
             # Mixed types
-            return {"type": "any"}
+            return self.intern.schema("any")
     
     def extract_nested_dict(self, dict_node: ast.Dict) -> EventProperties:
         """
@@ -731,7 +805,7 @@ class TrackingVisitor(ast.NodeVisitor):
                 
                 prop_type = self._extract_property_type(value_node)
                 if prop_type:
-                    nested_props[key] = prop_type
+                    nested_props[self.intern.string(key)] = prop_type
                     
         return nested_props
     
@@ -754,61 +828,1829 @@ class TrackingVisitor(ast.NodeVisitor):
         elif value is None:
             return "null"
         return "any"
+    
+    # Node types dispatched by visit, keyed by exact type
+    _handlers: Dict[type, Callable[['TrackingVisitor', Any], None]] = {
+        ast.FunctionDef: visit_FunctionDef,
+        ast.ClassDef: visit_ClassDef,
+        ast.AnnAssign: visit_AnnAssign,
+        ast.Assign: visit_Assign,
+        ast.Call: visit_Call,
+    }
 
-def analyze_python_code(code: str, filepath: str, custom_function: Optional[str] = None) -> str:
+# PostHog accepts properties either as a keyword or as the third positional argument
+_posthog_properties_node = properties_at(2, 'properties')
+
+@functools.lru_cache(maxsize=1)
+def builtin_registry() -> ProviderRegistry:
     """
-    Analyze Python code for analytics tracking calls.
+    Compile the built-in providers into a registry.
     
-    This function parses Python code and identifies analytics tracking calls,
-    extracting event names, properties, and metadata.
+    Returns:
+        Registry of the supported analytics libraries
+    """
+    registry = ProviderRegistry()
+    for spec in ANALYTICS_SOURCES:
+        registry.register_spec(spec)
+    
+    registry.add_method_call('posthog', 'capture', Provider(
+        'posthog',
+        event_name=event_name_at(1, 'event'),
+        properties_node=_posthog_properties_node,
+        user_id=TrackingVisitor._extract_posthog_user_id,
+    ))
+    
+    registry.add_event_class_call('track', 'BaseEvent', Provider(
+        'amplitude',
+        event_name=TrackingVisitor._extract_amplitude_event_name,
+        properties_node=TrackingVisitor._get_amplitude_properties_node,
+        user_id=TrackingVisitor._extract_amplitude_user_id,
+    ))
+    
+    snowplow = Provider(
+        'snowplow',
+        event_name=TrackingVisitor._extract_snowplow_event_name,
+        properties=TrackingVisitor._extract_snowplow_properties,
+    )
+    registry.add_event_class_call('track', 'StructuredEvent', snowplow)
+    registry.add_variable_call('tracker', 'track', snowplow)
+    registry.add_dispatch_call(SNOWPLOW_DISPATCH_FUNCTION, 'trackStructEvent', snowplow)
+    for function in sorted(SNOWPLOW_FUNCTIONS):
+        registry.add_function(function, snowplow)
+    
+    for path, name in SDK_IMPORT_ALIASES.items():
+        registry.add_import_alias(path, name)
+    for path, receiver in SDK_CLIENT_FACTORIES.items():
+        registry.add_client_factory(path, receiver)
+    
+    return registry
+
+@functools.lru_cache(maxsize=32)
+def _compile_provider_registry(custom_functions: Tuple[str, ...], providers_json: str) -> ProviderRegistry:
+    specs = [parse_function_spec(spec) for spec in custom_functions] + json.loads(providers_json)
+    return compile_registry(builtin_registry(), specs)
+
+def provider_registry(
+    custom_function: CustomFunctions = None,
+    providers: Optional[Sequence[Dict[str, Any]]] = None
+) -> ProviderRegistry:
+    """
+    Get the compiled registry for the custom functions and extra providers.
+    
+    Registries are compiled once per configuration and reused for every file.
+    All custom functions share the registry's hash indexes, so any number of
+    them is matched in the same single pass over the tree.
     
     Args:
-        code: The Python source code to analyze
-        filepath: Path to the file being analyzed
-        custom_function: Optional name of a custom tracking function
+        custom_function: Optional custom tracking function spec, or a list of them
+            (see parse_function_spec)
+        providers: Optional extra provider descriptions, e.g. from load_provider_config
+        
+    Returns:
+        Registry of the built-in providers, the custom functions and the extra providers
+        
+    Raises:
+        ValueError: If a function spec or provider description is invalid
+    """
+    if isinstance(custom_function, str):
+        custom_functions = (custom_function,)
+    else:
+        custom_functions = tuple(spec for spec in custom_function or () if spec)
+    return _compile_provider_registry(custom_functions, json.dumps(list(providers or ()), sort_keys=True))
+
+def may_contain_tracking(
+    code: Source,
+    custom_function: CustomFunctions = None,
+    registry: Optional[ProviderRegistry] = None,
+    require_sdk_import: bool = False
+) -> bool:
+    """
+    Cheaply check whether source code could contain a tracking call.
+    
+    This searches the raw text for trigger tokens instead of parsing it, so a
+    False result lets callers skip ast.parse and the visitor walk entirely. It
+    never rejects a file the visitor would find events in. Tokens inside
+    strings or comments only cause false positives, which are harmless. ASCII
+    bytes are searched as they are; other bytes are decoded first.
+    
+    With require_sdk_import, the code must also import a known analytics SDK
+    or mention a custom function or config-file provider. This rejects far
+    more files, but misses SDK clients used in modules that do not import the
+    SDK themselves, such as an analytics object passed in as an argument.
+    
+    Args:
+        code: The Python source code, as text or bytes
+        custom_function: Optional custom tracking function spec, or a list of them
+        registry: Optional provider registry, used instead of custom_function
+        require_sdk_import: Also reject code importing no known SDK (see ProviderRegistry.sdk_pattern)
+        
+    Returns:
+        False if the code cannot contain a tracking call
+    """
+    if registry is None:
+        registry = provider_registry(custom_function)
+    if isinstance(code, bytes):
+        if code.isascii():
+            return registry.trigger_pattern_bytes.search(code) is not None and (
+                not require_sdk_import or registry.sdk_pattern_bytes.search(code) is not None
+            )
+        code = decode_source(code)
+    if not code.isascii():
+        # The parser NFKC-normalizes identifiers, so match against the normalized text
+        import unicodedata
+        code = unicodedata.normalize('NFKC', code)
+    return registry.trigger_pattern.search(code) is not None and (
+        not require_sdk_import or registry.sdk_pattern.search(code) is not None
+    )
+
+def parse_source(code: Source) -> ast.Module:
+    """
+    Parse Python source code given as text or bytes.
+    
+    Bytes are decoded by the parser itself, honouring a UTF-8 BOM or a PEP 263
+    coding declaration such as "# -*- coding: latin-1 -*-". Bytes that are not
+    valid in their declared encoding are parsed like read_source decodes them,
+    with invalid sequences replaced, so they analyze as they always have.
+    
+    Args:
+        code: The Python source code
         
     Returns:
-        JSON string containing array of tracking events
+        The module AST
+        
+    Raises:
+        SyntaxError: If the code is not valid Python
+        ValueError: If the code contains null bytes
     """
     try:
-        # Parse the Python code
-        tree = ast.parse(code)
+        return ast.parse(code)
+    except SyntaxError:
+        if not isinstance(code, bytes) or code.isascii():
+            raise
+    return ast.parse(decode_source(code))
+
+def _parse_within(code: Source, budget: Optional[FileBudget]) -> ast.Module:
+    """Parse code, reporting nesting too deep for the parser, and a parse that ran past the budget, as BudgetExceeded."""
+    try:
+        tree = parse_source(code)
+    except RecursionError:
+        raise BudgetExceeded("nesting too deep to parse") from None
+    if budget is not None:
+        budget.check('parse')
+    return tree
+
+class _ProfilingVisitor(TrackingVisitor):
+    """TrackingVisitor that attributes the time spent extracting properties to the extract phase."""
+    
+    def __init__(self, filepath: str, profile: 'FileProfile', **kwargs: Any):
+        super().__init__(filepath, **kwargs)
+        self.profile = profile
+    
+    def extract_properties(self, node: ast.Call, provider: Provider) -> EventProperties:
+        with self.profile.measure('extract'):
+            return super().extract_properties(node, provider)
+
+def _analyze_source(
+    code: Source,
+    filepath: str,
+    registry: ProviderRegistry,
+    on_event: Optional[Callable[[AnalyticsEvent], None]] = None,
+    profile: Optional['FileProfile'] = None,
+    intern: Optional[InternTable] = None,
+    budget: Optional[FileBudget] = None,
+    constants: Optional[Callable[[str], Optional[str]]] = None
+) -> List[AnalyticsEvent]:
+    """
+    Parse a single source file and collect its tracking events.
+    
+    Unlike the public entry points, this helper lets parse errors and
+    BudgetExceeded propagate so callers can decide how to report them.
+    The module's imports are scanned first, so calls made through aliased
+    SDK imports are recognized.
+    
+    Args:
+        code: The Python source code to analyze, as text or bytes (see parse_source)
+        filepath: Path to the file being analyzed
+        registry: Provider registry used to recognize tracking calls
+        on_event: Optional callback receiving each event as soon as it is found
+        profile: Optional file profile recording the parse, walk and extract phases
+        intern: Optional intern table shared by the files of a scan
+        budget: Optional started FileBudget limiting the file
+        constants: Optional function resolving names used as event names (see TrackingVisitor)
         
-        # Create visitor and analyze
-        visitor = TrackingVisitor(filepath, custom_function)
+    Returns:
+        List of tracking events found in the file, empty when on_event is given
+    """
+    if profile is None:
+        imports = scan_imports(code)
+        tree = _parse_within(code, budget)
+        visitor = TrackingVisitor(
+            filepath, on_event=on_event, registry=registry, intern=intern, budget=budget, constants=constants, imports=imports
+        )
         visitor.visit(tree)
+        return visitor.events
+    
+    with profile.measure('parse'):
+        imports = scan_imports(code)
+        tree = _parse_within(code, budget)
+    profile.nodes = sum(1 for _ in ast.walk(tree))
+    
+    visitor = _ProfilingVisitor(
+        filepath, profile, on_event=on_event, registry=registry, intern=intern, budget=budget, constants=constants,
+        imports=imports
+    )
+    try:
+        with profile.measure('walk'):
+            visitor.visit(tree)
+    finally:
+        # Property extraction runs inside the walk, which may stop early; report it as its own phase
+        profile.add('walk', -profile.wall['extract'], -profile.cpu['extract'])
+    return visitor.events
+
+@functools.lru_cache(maxsize=1)
+def analyzer_fingerprint() -> str:
+    """
+    Digest of the analyzer's source code, including the provider registry, import scan and event model.
+    
+    Cached results are keyed on it, so any change to the analyzer invalidates them.
+    
+    Returns:
+        Hex digest of the analyzer source
+    """
+    import hashlib
+    
+    import eventModel
+    import importScan
+    import providerRegistry
+    
+    digest = hashlib.sha256()
+    for module in (sys.modules[__name__], eventModel, importScan, providerRegistry):
+        digest.update(_module_source(module))
+    return digest.hexdigest()
+
+def _module_source(module: Any) -> bytes:
+    """Read the source of a module through its loader, which also works when it was imported from a bytecode bundle."""
+    source_path = os.path.splitext(module.__file__)[0] + '.py'
+    return module.__loader__.get_data(source_path)
+
+@functools.lru_cache(maxsize=8)
+def open_result_cache(cache_dir: str, registry: ProviderRegistry) -> 'ResultCache':
+    """
+    Open the result cache for the current analyzer and configuration.
+    
+    Args:
+        cache_dir: Directory holding the cache entries
+        registry: Provider registry the results are produced with
         
-        # Return events as JSON
-        return json.dumps(visitor.events)
-    except Exception as e:
-        # Return empty array on parse errors
-        return json.dumps([])
+    Returns:
+        A ResultCache whose namespace covers the analyzer source and configuration
+    """
+    from resultCache import ResultCache, namespace_digest
+    
+    # Built-in providers are covered by the fingerprint; the custom functions and
+    # config-file providers are recorded in the registry's specs
+    namespace = namespace_digest(analyzer_fingerprint(), registry.specs)
+    return ResultCache(cache_dir, namespace)
 
-# Command-line interface
-if __name__ == "__main__":
-    import sys
-    import argparse
+def open_scan_manifest(
+    manifest: str,
+    cache: Optional['ResultCache'],
+    prefilter: bool = True,
+    require_sdk_import: bool = False,
+    skip_policy: Optional[Dict[str, Any]] = None
+) -> 'ScanManifest':
+    """
+    Open the scan manifest for the current analyzer and configuration.
     
-    parser = argparse.ArgumentParser(
-        description='Analyze Python code for analytics tracking calls',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="Example: %(prog)s myapp.py [--custom-function track_event]"
-    )
-    parser.add_argument('file', help='Python file to analyze')
-    parser.add_argument(
-        '-c', '--custom-function',
-        help='Name of custom tracking function to detect'
-    )
-    args = parser.parse_args()
+    Files are recorded with the result cache key of their contents, so a
+    manifest needs the result cache. Its namespace extends the cache's with the
+    options deciding which files are prefiltered or skipped.
+    
+    Args:
+        manifest: Path of the manifest file
+        cache: Result cache the files' results are kept in
+        prefilter: Whether files without a trigger token are prefiltered
+        require_sdk_import: Whether files importing no known SDK are prefiltered
+        skip_policy: Optional skip policy description
+        
+    Returns:
+        The ScanManifest, loaded once per process
+        
+    Raises:
+        ValueError: If no result cache is used
+    """
+    if cache is None:
+        raise ValueError("A scan manifest requires a result cache directory")
+    from resultCache import namespace_digest
+    
+    namespace = namespace_digest(cache.namespace, prefilter, require_sdk_import, skip_policy or None)
+    return _load_scan_manifest(os.path.abspath(manifest), namespace)
+
+@functools.lru_cache(maxsize=8)
+def _load_scan_manifest(path: str, namespace: str) -> 'ScanManifest':
+    """Load a scan manifest, keeping it for every later scan of the process, such as the requests of a worker."""
+    from scanManifest import ScanManifest
+    return ScanManifest(path, namespace)
+
+def _analyze_entry(
+    code: Source,
+    registry: ProviderRegistry,
+    on_event: Optional[Callable[[AnalyticsEvent], None]] = None,
+    profile: Optional['FileProfile'] = None,
+    intern: Optional[InternTable] = None,
+    budget: Optional[FileBudget] = None,
+    constants: Optional[Callable[[str], Optional[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Analyze code into a path-independent cache entry, capturing parse errors and forwarding events.
+    
+    A file that exceeds its budget yields a "partial" entry keeping the events found so far.
+    Names looked up as event names are recorded with what they resolved to under "constants",
+    since the result then depends on other files (see _constants_unchanged).
+    """
+    events: List[Dict[str, Any]] = []
+    resolved: Dict[str, Optional[str]] = {}
+    
+    def collect(event: AnalyticsEvent) -> None:
+        events.append(event.to_json())
+        if on_event is not None:
+            on_event(event)
+    
+    def resolve(dotted: str) -> Optional[str]:
+        value = resolved[dotted] = constants(dotted) if constants is not None else None
+        return value
     
     try:
-        with open(args.file, 'r') as f:
-            code = f.read()
-        result = analyze_python_code(code, args.file, args.custom_function)
-        print(result)
-    except FileNotFoundError:
-        print(f"Error: File '{args.file}' not found", file=sys.stderr)
-        sys.exit(1)
+        _analyze_source(code, None, registry, collect, profile, intern, budget, resolve)
+    except BudgetExceeded as e:
+        return {"events": events, "error": f"{type(e).__name__}: {e}", "partial": True}
     except Exception as e:
-        print(f"Error analyzing file: {str(e)}", file=sys.stderr)
-        sys.exit(1)
+        return {"error": f"{type(e).__name__}: {e}"}
+    if budget is not None and budget.exceeded:
+        return {"events": events, "error": budget.exceeded, "partial": True}
+    if resolved:
+        return {"events": events, "constants": resolved}
+    return {"events": events}
+
+def _constants_unchanged(entry: Dict[str, Any], constants: Optional[Callable[[str], Optional[str]]]) -> bool:
+    """Check that every name a cached result looked up still resolves to the same constant."""
+    recorded = entry.get('constants')
+    if not recorded:
+        return True
+    return all((constants(dotted) if constants is not None else None) == value for dotted, value in recorded.items())
+
+def analyze_python_code(
+    code: Source,
+    filepath: str,
+    custom_function: CustomFunctions = None,
+    prefilter: bool = True,
+    cache_dir: Optional[str] = None,
+    providers: Optional[Sequence[Dict[str, Any]]] = None,
+    profile: bool = False,
+    time_budget: Optional[float] = None,
+    max_depth: Optional[int] = None,
+    require_sdk_import: bool = False
+) -> str:
+    """
+    Analyze Python code for analytics tracking calls.
+    
+    This function parses Python code and identifies analytics tracking calls,
+    extracting event names, properties, and metadata.
+    
+    Args:
+        code: The Python source code to analyze, as text, or as bytes whose
+            encoding the parser detects (UTF-8, a BOM or a PEP 263 declaration)
+        filepath: Path to the file being analyzed
+        custom_function: Optional custom tracking function spec, or a list of them
+        prefilter: Skip parsing when the code contains no trigger token
+        cache_dir: Optional result cache directory consulted before parsing
+        providers: Optional extra provider descriptions (see providerRegistry)
+        profile: Record per-phase timings (see phaseProfiler)
+        time_budget: Optional wall-clock seconds allowed for the file (see FileBudget);
+            past it, the events found so far are returned and a RuntimeWarning
+            carrying the BudgetExceeded error is issued
+        max_depth: Optional cap on the nesting depth of property dictionaries followed
+        require_sdk_import: Skip parsing when the code imports no known analytics SDK
+            and mentions no custom function (see may_contain_tracking)
+        
+    Returns:
+        JSON string containing array of tracking events, or with profile enabled
+        {"events": [...], "profile": {"files": [...], "summary": {...}}}
+    """
+    # Parse errors are reported by _analyze_files; this entry point returns an empty array for them
+    result = _analyze_files(
+        [(filepath, code)], custom_function, prefilter, cache_dir, providers, profile,
+        time_budget=time_budget, max_depth=max_depth, require_sdk_import=require_sdk_import
+    )
+    for error in result['errors']:
+        # The returned array has no room for it, but partial results must not pass for complete ones
+        if error['error'].startswith(BudgetExceeded.__name__):
+            import warnings
+            warnings.warn(f"partial results for {filepath}: {error['error']}", RuntimeWarning, stacklevel=2)
+    if profile:
+        from phaseProfiler import build_report
+        return json.dumps({"events": result['events'], "profile": build_report(result['profile'])}, default=json_default)
+    return json.dumps(result['events'], default=json_default)
+
+def _source_bytes(code: Source) -> bytes:
+    """Return source code as bytes; text is encoded as UTF-8."""
+    return code if isinstance(code, bytes) else code.encode('utf-8', 'surrogatepass')
+
+def _new_stats() -> Dict[str, int]:
+    """Create the scan statistics counters reported by the batch entry points."""
+    return {"files": 0, "prefiltered": 0, "cached": 0, "skipped": 0}
+
+def _analyze_file(
+    filepath: str,
+    code: Source,
+    on_event: Callable[[AnalyticsEvent], None],
+    stats: Dict[str, int],
+    registry: ProviderRegistry,
+    prefilter: bool = True,
+    cache: Optional['ResultCache'] = None,
+    profile: Optional['FileProfile'] = None,
+    intern: Optional[InternTable] = None,
+    budget: Optional[FileBudget] = None,
+    constants: Optional['ProjectConstants'] = None,
+    require_sdk_import: bool = False,
+    key: Optional[str] = None
+) -> Optional[str]:
+    """
+    Analyze one file, passing each event to on_event as soon as it is available.
+    
+    This is the per-file core shared by the batch, streaming and worker entry
+    points: it applies the token prefilter, consults the result cache and
+    updates the scan statistics. A profile, if given, records the parse, walk
+    and extract phases (see _profile_file for the others). Strings and schemas
+    of the events are shared through the scan's intern table, if given.
+    
+    A budget, if given, is started for the file. A file exceeding it keeps the
+    events found so far, is reported with a "BudgetExceeded: ..." message and
+    is never cached, since where a time budget runs out varies between runs.
+    
+    Event names given as names, such as events.SIGNUP, are resolved through the
+    project's constant index, if given. Cached results that looked names up are
+    only reused while those names still resolve to the same constants.
+    
+    With require_sdk_import, the prefilter also rejects files importing no
+    known SDK (see may_contain_tracking). The result cache key of the code may
+    be given when the caller already computed it.
+    
+    Returns:
+        An error message if the file could not be analyzed completely, otherwise None
+    """
+    stats['files'] += 1
+    if budget is not None:
+        budget.start()
+    if prefilter and not may_contain_tracking(code, registry=registry, require_sdk_import=require_sdk_import):
+        stats['prefiltered'] += 1
+        return None
+    resolve = constants.resolver(filepath) if constants is not None else None
+    
+    if cache is None:
+        try:
+            _analyze_source(code, filepath, registry, on_event, profile, intern, budget, resolve)
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+        return budget.exceeded if budget is not None else None
+    
+    if intern is not None:
+        filepath = intern.string(filepath)
+    
+    def forward(event: AnalyticsEvent) -> None:
+        event.file_path = filepath
+        on_event(event)
+    
+    if key is None:
+        key = cache.key(_source_bytes(code))
+    entry = cache.get(key)
+    if entry is not None and not _constants_unchanged(entry, resolve):
+        entry = None
+    if entry is None:
+        entry = _analyze_entry(code, registry, forward, profile, intern, budget, resolve)
+        if not entry.get('partial'):
+            cache.put(key, entry)
+    else:
+        stats['cached'] += 1
+        for event in entry.get('events', ()):
+            on_event(TrackingEvent.from_json(event, filepath, intern))
+    
+    return entry.get('error')
+
+def _profile_file(
+    filepath: str,
+    code: Source,
+    on_event: Callable[[AnalyticsEvent], None],
+    stats: Dict[str, int],
+    registry: ProviderRegistry,
+    prefilter: bool,
+    cache: Optional['ResultCache'],
+    profile: 'FileProfile',
+    intern: Optional[InternTable] = None,
+    budget: Optional[FileBudget] = None,
+    constants: Optional['ProjectConstants'] = None,
+    require_sdk_import: bool = False
+) -> Optional[str]:
+    """Profiled variant of _analyze_file, also timing the prefilter and the JSON serialization of the events."""
+    profile.bytes = len(_source_bytes(code))
+    
+    if prefilter:
+        with profile.measure('prefilter'):
+            may_contain = may_contain_tracking(code, registry=registry, require_sdk_import=require_sdk_import)
+        if not may_contain:
+            stats['files'] += 1
+            stats['prefiltered'] += 1
+            profile.prefiltered = True
+            return None
+    
+    events: List[AnalyticsEvent] = []
+    
+    def collect(event: AnalyticsEvent) -> None:
+        events.append(event)
+        on_event(event)
+    
+    cached = stats['cached']
+    error = _analyze_file(filepath, code, collect, stats, registry, False, cache, profile, intern, budget, constants)
+    profile.cached = stats['cached'] > cached
+    profile.events = len(events)
+    
+    with profile.measure('json'):
+        json.dumps(events, default=json_default)
+    return error
+
+def _load_source(filepath: str, code: Optional[Source], profile: Optional['FileProfile'] = None) -> Source:
+    """Return the given code, or read its bytes from filepath when it is None, timing the read phase if profiling."""
+    if code is not None:
+        return code
+    if profile is None:
+        return read_source_bytes(filepath)
+    with profile.measure('read'):
+        return read_source_bytes(filepath)
+
+def _load_checked_source(
+    filepath: str,
+    code: Optional[Source],
+    policy: Optional['SkipPolicy'],
+    profile: Optional['FileProfile'] = None
+) -> Tuple[Optional[Source], Optional[str]]:
+    """
+    Load a file's source unless the skip policy rejects it.
+    
+    The path and size rules are checked before the file is read, the line and
+    marker rules before it is parsed.
+    
+    Returns:
+        Tuple of (code, None), or (None, reason) when the file is skipped
+        
+    Raises:
+        OSError: If the file cannot be read
+    """
+    if policy is not None:
+        reason = policy.path_reason(filepath, code)
+        if reason:
+            return None, reason
+    
+    code = _load_source(filepath, code, profile)
+    
+    if policy is not None:
+        reason = policy.source_reason(filepath, code)
+        if reason:
+            return None, reason
+    return code, None
+
+def _scan_file(
+    filepath: str,
+    code: Optional[Source],
+    on_event: Callable[[AnalyticsEvent], None],
+    stats: Dict[str, int],
+    registry: ProviderRegistry,
+    prefilter: bool,
+    cache: Optional['ResultCache'],
+    policy: Optional['SkipPolicy'],
+    profile: Optional['FileProfile'] = None,
+    intern: Optional[InternTable] = None,
+    budget: Optional[FileBudget] = None,
+    constants: Optional['ProjectConstants'] = None,
+    require_sdk_import: bool = False,
+    manifest: Optional['ScanManifest'] = None
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Load, check and analyze one file of a batch, the step shared by _analyze_files and stream_python_files.
+    
+    Files read from disk go through the scan manifest, if given, unless they
+    are profiled (see _analyze_listed_file).
+    
+    Returns:
+        Tuple of (error, None), where the error is also set when the file cannot
+        be read, or (None, reason) when the skip policy rejects the file
+    """
+    try:
+        if manifest is not None and code is None and profile is None:
+            return _analyze_listed_file(
+                filepath, manifest, on_event, stats, registry, prefilter, cache, policy, intern, budget, constants,
+                require_sdk_import
+            )
+        code, reason = _load_checked_source(filepath, code, policy, profile)
+    except OSError as e:
+        return f"{type(e).__name__}: {e}", None
+    if reason:
+        return None, reason
+    
+    if profile is None:
+        error = _analyze_file(
+            filepath, code, on_event, stats, registry, prefilter, cache,
+            intern=intern, budget=budget, constants=constants, require_sdk_import=require_sdk_import
+        )
+    else:
+        error = _profile_file(
+            filepath, code, on_event, stats, registry, prefilter, cache, profile, intern, budget, constants,
+            require_sdk_import
+        )
+    return error, None
+
+def _analyze_listed_file(
+    filepath: str,
+    manifest: 'ScanManifest',
+    on_event: Callable[[AnalyticsEvent], None],
+    stats: Dict[str, int],
+    registry: ProviderRegistry,
+    prefilter: bool,
+    cache: 'ResultCache',
+    policy: Optional['SkipPolicy'],
+    intern: Optional[InternTable] = None,
+    budget: Optional[FileBudget] = None,
+    constants: Optional['ProjectConstants'] = None,
+    require_sdk_import: bool = False
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Analyze a file on disk, reusing the outcome the scan manifest recorded for it.
+    
+    A file whose size, modification time and inode are unchanged is not opened:
+    its events are replayed from the result cache, or it is prefiltered or
+    skipped again. A file whose stat changed is read and keyed, and only
+    analyzed when its contents changed too. stats["unchanged"] counts the files
+    whose outcome was reused. Outcomes of files exceeding their budget are not
+    recorded, since their results are not cached.
+    
+    Returns:
+        Tuple of (error, None), or (None, reason) when the file is skipped
+        
+    Raises:
+        OSError: If the file cannot be read
+    """
+    stat = os.stat(filepath)
+    recorded = manifest.lookup(filepath, stat)
+    if recorded is not None:
+        result = _replay_outcome(filepath, *recorded, manifest, on_event, stats, cache, intern, constants)
+        if result is not None:
+            return result
+    
+    code, reason = _load_checked_source(filepath, None, policy)
+    if reason:
+        manifest.record(filepath, stat, None, {"skipped": reason})
+        return None, reason
+    key = cache.key(_source_bytes(code))
+    outcome = manifest.lookup_content(filepath, key)
+    if outcome is not None:
+        result = _replay_outcome(filepath, key, outcome, manifest, on_event, stats, cache, intern, constants)
+        if result is not None:
+            manifest.record(filepath, stat, key, outcome)
+            return result
+    
+    prefiltered = stats['prefiltered']
+    error = _analyze_file(
+        filepath, code, on_event, stats, registry, prefilter, cache,
+        intern=intern, budget=budget, constants=constants, require_sdk_import=require_sdk_import, key=key
+    )
+    if stats['prefiltered'] > prefiltered:
+        manifest.record(filepath, stat, key, manifest.PREFILTERED)
+    elif not (error and error.startswith(BudgetExceeded.__name__)):
+        manifest.record(filepath, stat, key, manifest.CACHED)
+    return error, None
+
+def _replay_outcome(
+    filepath: str,
+    key: Optional[str],
+    outcome: 'Outcome',
+    manifest: 'ScanManifest',
+    on_event: Callable[[AnalyticsEvent], None],
+    stats: Dict[str, int],
+    cache: 'ResultCache',
+    intern: Optional[InternTable] = None,
+    constants: Optional['ProjectConstants'] = None
+) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """
+    Reuse the outcome a scan manifest recorded for a file.
+    
+    Returns:
+        Tuple of (error, skip reason), or None when the result cache no longer
+        holds the file's results, or they looked up constants that changed since
+    """
+    if isinstance(outcome, dict) and isinstance(outcome.get('skipped'), str):
+        result = None, outcome['skipped']
+    elif outcome == manifest.PREFILTERED:
+        stats['files'] += 1
+        stats['prefiltered'] += 1
+        result = None, None
+    elif outcome == manifest.CACHED and key is not None:
+        entry = cache.get(key)
+        if entry is None or not _constants_unchanged(entry, constants.resolver(filepath) if constants is not None else None):
+            return None
+        stats['files'] += 1
+        stats['cached'] += 1
+        if intern is not None:
+            filepath = intern.string(filepath)
+        for event in entry.get('events', ()):
+            on_event(TrackingEvent.from_json(event, filepath, intern))
+        result = entry.get('error'), None
+    else:
+        return None
+    stats['unchanged'] += 1
+    return result
+
+def _start_profile(profile: bool) -> Optional['RunProfile']:
+    """Create a RunProfile when profiling is enabled; the profiler is only imported then."""
+    if not profile:
+        return None
+    from phaseProfiler import RunProfile
+    return RunProfile()
+
+def _load_skip_policy(skip_policy: Optional[Dict[str, Any]]) -> Optional['SkipPolicy']:
+    """Build the SkipPolicy described by a dictionary, if any; the policy module is only imported then."""
+    if not skip_policy:
+        return None
+    from skipPolicy import SkipPolicy
+    return SkipPolicy.from_options(skip_policy)
+
+def _project_constants(files: Sequence[Sequence[Optional[Source]]], cache_dir: Optional[str] = None) -> 'ProjectConstants':
+    """Constant index over the (filepath, code) pairs of a scan, built the first time an event name needs resolving."""
+    from constantIndex import ProjectConstants
+    return ProjectConstants(
+        [filepath for filepath, _ in files],
+        {filepath: code for filepath, code in files if code is not None},
+        cache_dir
+    )
+
+@functools.lru_cache(maxsize=4)
+def _root_project(project_root: str, cache_dir: Optional[str]) -> 'ProjectConstants':
+    """Constant index over the Python files under a project root, kept between the requests of a worker."""
+    from constantIndex import ProjectConstants
+    return ProjectConstants([], cache_dir=cache_dir)
+
+def _root_constants(project_root: str, cache_dir: Optional[str], scan_id: Optional[str] = None) -> 'ProjectConstants':
+    """
+    Constant index over the Python files under a project root, refreshed for every scan.
+    
+    The files under the root are listed again, and those added or changed since
+    the previous scan re-indexed, the first time a request resolves a name.
+    Requests without a scan id are each a scan of their own.
+    """
+    constants = _root_project(project_root, cache_dir)
+    constants.refresh(lambda: find_python_files([project_root]), scan_id)
+    return constants
+
+def _select_constants(
+    files: Iterable[Sequence[Optional[Source]]],
+    cache_dir: Optional[str],
+    resolve_constants: bool,
+    project_root: Optional[str],
+    constant_index: Optional['ProjectConstants'],
+    scan_id: Optional[str] = None
+) -> Tuple[Iterable[Sequence[Optional[Source]]], Optional['ProjectConstants']]:
+    """
+    Choose the constant index event names are resolved against.
+    
+    Returns:
+        The files, materialized if the index covers them, and the index, or None when names are not resolved
+    """
+    if constant_index is not None or not resolve_constants:
+        return files, constant_index
+    if project_root:
+        return files, _root_constants(project_root, cache_dir, scan_id)
+    files = list(files)
+    return files, _project_constants(files, cache_dir)
+
+def _scan_manifest(
+    manifest: Optional[str],
+    cache: Optional['ResultCache'],
+    prefilter: bool,
+    require_sdk_import: bool,
+    skip_policy: Optional[Dict[str, Any]],
+    profile: bool,
+    stats: Dict[str, int]
+) -> Optional['ScanManifest']:
+    """
+    Open the scan manifest of a batch, if any, and add the "unchanged" counter to its statistics.
+    
+    Profiled scans time every phase of every file, so they do not use a manifest.
+    """
+    if not manifest or profile:
+        return None
+    scan_manifest = open_scan_manifest(manifest, cache, prefilter, require_sdk_import, skip_policy)
+    stats['unchanged'] = 0
+    return scan_manifest
+
+def _analyze_files(
+    files: Iterable[Sequence[Optional[str]]],
+    custom_function: CustomFunctions = None,
+    prefilter: bool = True,
+    cache_dir: Optional[str] = None,
+    providers: Optional[Sequence[Dict[str, Any]]] = None,
+    profile: bool = False,
+    skip_policy: Optional[Dict[str, Any]] = None,
+    time_budget: Optional[float] = None,
+    max_depth: Optional[int] = None,
+    resolve_constants: bool = True,
+    project_root: Optional[str] = None,
+    constant_index: Optional['ProjectConstants'] = None,
+    require_sdk_import: bool = False,
+    manifest: Optional[str] = None,
+    scan_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Analyze (filepath, code) pairs and collect events, per-file errors, skipped files and scan statistics.
+    
+    With profile enabled, the result also holds the per-file profiles under "profile".
+    """
+    events: List[AnalyticsEvent] = []
+    errors: List[Dict[str, str]] = []
+    skipped: List[Dict[str, str]] = []
+    stats = _new_stats()
+    policy = _load_skip_policy(skip_policy)
+    budget = FileBudget.from_options(time_budget, max_depth)
+    files, constants = _select_constants(files, cache_dir, resolve_constants, project_root, constant_index, scan_id)
+    registry = provider_registry(custom_function, providers)
+    cache = open_result_cache(cache_dir, registry) if cache_dir else None
+    scan_manifest = _scan_manifest(manifest, cache, prefilter, require_sdk_import, skip_policy, profile, stats)
+    run_profile = _start_profile(profile)
+    intern = InternTable()
+    
+    for filepath, code in files:
+        file_profile = run_profile.start_file(filepath) if run_profile is not None else None
+        error, reason = _scan_file(
+            filepath, code, events.append, stats, registry, prefilter, cache, policy, file_profile, intern, budget,
+            constants, require_sdk_import, scan_manifest
+        )
+        if reason:
+            stats['skipped'] += 1
+            skipped.append({"filePath": filepath, "reason": reason})
+        elif error:
+            errors.append({"filePath": filepath, "error": error})
+    
+    if scan_manifest is not None:
+        scan_manifest.save()
+    result = {"events": events, "errors": errors, "skipped": skipped, "stats": stats}
+    if run_profile is not None:
+        run_profile.finish()
+        result['profile'] = run_profile.files
+    return result
+
+def stream_python_files(
+    files: Iterable[Sequence[Optional[str]]],
+    write_record: Callable[[Dict[str, Any]], None],
+    custom_function: CustomFunctions = None,
+    prefilter: bool = True,
+    cache_dir: Optional[str] = None,
+    providers: Optional[Sequence[Dict[str, Any]]] = None,
+    profile: bool = False,
+    skip_policy: Optional[Dict[str, Any]] = None,
+    time_budget: Optional[float] = None,
+    max_depth: Optional[int] = None,
+    resolve_constants: bool = True,
+    project_root: Optional[str] = None,
+    constant_index: Optional['ProjectConstants'] = None,
+    require_sdk_import: bool = False,
+    manifest: Optional[str] = None,
+    scan_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Analyze files and stream the results as individual records.
+    
+    For every file this writes a {"type": "file_start", "filePath": ...} record,
+    one {"type": "event", ...} record per tracking call as soon as the visitor
+    finds it, and a {"type": "file_end", "filePath": ..., "events": n} record,
+    which carries an "error" when the file could not be read, parsed or fully
+    analyzed within its budget (its events found so far are kept), or a
+    "skipped" reason when the skip policy rejected it. Nothing is accumulated,
+    so memory stays flat however many events a file contains.
+    
+    Args:
+        files: Iterable of (filepath, code) pairs; code is text, bytes (see parse_source),
+            or None to read the file from disk
+        write_record: Callback receiving each record as a dictionary
+        custom_function: Optional custom tracking function spec, or a list of them, shared by all files
+        prefilter: Skip parsing files that contain no trigger token
+        cache_dir: Optional result cache directory consulted before parsing
+        providers: Optional extra provider descriptions (see providerRegistry)
+        profile: Record per-phase timings, returned under "profile"
+        skip_policy: Optional skip policy description (see skipPolicy.SkipPolicy.from_options)
+        time_budget: Optional wall-clock seconds allowed per file (see FileBudget)
+        max_depth: Optional cap on the nesting depth of property dictionaries followed
+        resolve_constants: Resolve event names given as module constants, such as
+            events.SIGNUP, through a constant index of the files (see constantIndex)
+        project_root: Optional directory whose Python files the constant index covers,
+            instead of the files analyzed
+        constant_index: Optional prebuilt ProjectConstants to resolve names against
+        require_sdk_import: Also skip parsing files importing no known analytics SDK
+            and mentioning no custom function (see may_contain_tracking)
+        manifest: Optional scan manifest path; files read from disk whose stat or
+            contents are unchanged since it recorded them reuse their outcome
+            (see scanManifest). Requires cache_dir
+        scan_id: Optional id shared by the calls analyzing one scan in batches; the
+            project_root index is only refreshed by the first call of each scan
+        
+    Returns:
+        Dictionary with per-file "errors", "skipped" files and scan "stats",
+        where stats["events"] counts the event records written, and
+        stats["unchanged"] the files reused through the manifest
+    """
+    errors: List[Dict[str, str]] = []
+    skipped: List[Dict[str, str]] = []
+    stats = dict(_new_stats(), events=0)
+    policy = _load_skip_policy(skip_policy)
+    budget = FileBudget.from_options(time_budget, max_depth)
+    files, constants = _select_constants(files, cache_dir, resolve_constants, project_root, constant_index, scan_id)
+    registry = provider_registry(custom_function, providers)
+    cache = open_result_cache(cache_dir, registry) if cache_dir else None
+    scan_manifest = _scan_manifest(manifest, cache, prefilter, require_sdk_import, skip_policy, profile, stats)
+    run_profile = _start_profile(profile)
+    intern = InternTable()
+    
+    for filepath, code in files:
+        write_record({"type": "file_start", "filePath": filepath})
+        file_profile = run_profile.start_file(filepath) if run_profile is not None else None
+        event_count = 0
+        
+        def on_event(event: AnalyticsEvent) -> None:
+            nonlocal event_count
+            event_count += 1
+            write_record({"type": "event", **event.to_json()})
+        
+        error, reason = _scan_file(
+            filepath, code, on_event, stats, registry, prefilter, cache, policy, file_profile, intern, budget,
+            constants, require_sdk_import, scan_manifest
+        )
+        
+        stats['events'] += event_count
+        end_record = {"type": "file_end", "filePath": filepath, "events": event_count}
+        if error:
+            end_record['error'] = error
+            errors.append({"filePath": filepath, "error": error})
+        if reason:
+            end_record['skipped'] = reason
+            stats['skipped'] += 1
+            skipped.append({"filePath": filepath, "reason": reason})
+        write_record(end_record)
+    
+    if scan_manifest is not None:
+        scan_manifest.save()
+    summary = {"errors": errors, "skipped": skipped, "stats": stats}
+    if run_profile is not None:
+        run_profile.finish()
+        summary['profile'] = run_profile.files
+    return summary
+
+def analyze_python_files(
+    files: Iterable[Sequence[str]],
+    custom_function: CustomFunctions = None,
+    prefilter: bool = True,
+    cache_dir: Optional[str] = None,
+    providers: Optional[Sequence[Dict[str, Any]]] = None,
+    profile: bool = False,
+    skip_policy: Optional[Dict[str, Any]] = None,
+    time_budget: Optional[float] = None,
+    max_depth: Optional[int] = None,
+    resolve_constants: bool = True,
+    project_root: Optional[str] = None,
+    require_sdk_import: bool = False,
+    manifest: Optional[str] = None,
+    scan_id: Optional[str] = None
+) -> str:
+    """
+    Analyze a batch of Python files for analytics tracking calls in one call.
+    
+    Each file gets its own TrackingVisitor pass, so scope and variable type
+    tracking never leak between files. A file that fails to parse does not
+    affect the rest of the batch; its error is reported separately. Files
+    rejected by the token prefilter are never parsed, so they report no
+    syntax errors either.
+    
+    Args:
+        files: Iterable of (filepath, code) pairs; code is text or bytes (see parse_source)
+        custom_function: Optional custom tracking function spec, or a list of them, shared by all files
+        prefilter: Skip parsing files that contain no trigger token
+        cache_dir: Optional result cache directory consulted before parsing
+        providers: Optional extra provider descriptions (see providerRegistry)
+        profile: Record per-phase timings (see phaseProfiler)
+        skip_policy: Optional skip policy description (see skipPolicy.SkipPolicy.from_options);
+            files it rejects are not parsed and are listed under "skipped"
+        time_budget: Optional wall-clock seconds allowed per file (see FileBudget); a file
+            running past it keeps the events found so far and gets a "BudgetExceeded: ..." error
+        max_depth: Optional cap on the nesting depth of property dictionaries followed;
+            deeper dictionaries are reported as plain objects with a "BudgetExceeded: ..." error
+        resolve_constants: Resolve event names given as module constants, such as events.SIGNUP,
+            through a constant index of the batch's files (see constantIndex)
+        project_root: Optional directory whose Python files the constant index covers instead,
+            so names defined outside the batch resolve too
+        require_sdk_import: Also skip parsing files importing no known analytics SDK
+            and mentioning no custom function (see may_contain_tracking)
+        manifest: Optional scan manifest path (see scanManifest); files given without
+            code whose stat is unchanged since it recorded them are not even opened,
+            and stats["unchanged"] counts the files reused. Requires cache_dir
+        scan_id: Optional id shared by the calls analyzing one scan in batches; the
+            project_root index is only refreshed by the first call of each scan
+        
+    Returns:
+        JSON string of the form {"events": [...], "errors": [{"filePath": ..., "error": ...}],
+        "skipped": [{"filePath": ..., "reason": ...}],
+        "stats": {"files": ..., "prefiltered": ..., "cached": ..., "skipped": ...}}, plus
+        "profile": {"files": [...], "summary": {...}} with profile enabled
+        
+    Raises:
+        ValueError: If the skip policy or a budget limit is invalid, or a manifest is given without cache_dir
+    """
+    result = _analyze_files(
+        files, custom_function, prefilter, cache_dir, providers, profile, skip_policy, time_budget, max_depth,
+        resolve_constants, project_root, require_sdk_import=require_sdk_import, manifest=manifest, scan_id=scan_id
+    )
+    if profile:
+        from phaseProfiler import build_report
+        result['profile'] = build_report(result['profile'])
+    return json.dumps(result, default=json_default)
+
+def read_source(filepath: str) -> str:
+    """
+    Read a Python source file the way Node's fs.readFileSync(path, 'utf8') does.
+    
+    Invalid UTF-8 sequences are replaced rather than rejected, so results do not
+    depend on whether the CLI, the native worker or Pyodide read the file.
+    
+    Args:
+        filepath: Path to the Python file
+        
+    Returns:
+        The decoded source code
+    """
+    with open(filepath, 'rb') as f:
+        return f.read().decode('utf-8', errors='replace')
+
+def read_source_bytes(filepath: str) -> bytes:
+    """
+    Read a Python source file without decoding it.
+    
+    The analyzer parses the bytes directly (see parse_source), which saves a
+    decoding pass and honours PEP 263 coding declarations.
+    
+    Args:
+        filepath: Path to the Python file
+        
+    Returns:
+        The raw source code
+    """
+    with open(filepath, 'rb') as f:
+        return f.read()
+
+def decode_source(data: bytes) -> str:
+    """
+    Decode Python source bytes the way the parser does, but leniently.
+    
+    The encoding comes from a UTF-8 BOM or a PEP 263 coding declaration and
+    defaults to UTF-8; unknown encodings fall back to UTF-8, and invalid
+    sequences are replaced rather than rejected.
+    
+    Args:
+        data: The raw source code
+        
+    Returns:
+        The decoded source code
+    """
+    import io
+    import tokenize
+    
+    try:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+    except SyntaxError:
+        encoding = 'utf-8'
+    return data.decode(encoding, errors='replace')
+
+def serve(input_stream: TextIO, output_stream: TextIO) -> None:
+    """
+    Run a long-lived analysis worker speaking NDJSON.
+    
+    Each input line is a request of the form
+    {"id": 1, "files": [{"path": "app.py", "code": "..."}], "customFunction": "track"}
+    where "customFunction" may also be a list of function specs, "code" is optional and read from "path" when omitted, an optional
+    "cacheDir" enables the result cache, an optional "providers" list adds
+    provider descriptions, an optional "skipPolicy" (see skipPolicy.py) skips
+    oversized and generated files before parsing, optional "timeBudget" seconds
+    and "maxDepth" bound the analysis of each file (see FileBudget), an optional
+    "projectRoot" directory is indexed to resolve event names given as module
+    constants ("resolveConstants": false disables that), "requireSdkImport": true
+    skips files importing no known analytics SDK (see may_contain_tracking), an
+    optional "manifest" path, used with "cacheDir", lets files read from disk whose
+    stat is unchanged reuse their results unopened (see scanManifest), requests
+    sharing a "scanId" refresh the "projectRoot" index only once and
+    "profile": true adds per-file phase timings under "profile". Each request is answered with one
+    output line {"id": 1, "events": [...], "errors": [...], "skipped": [...], "stats": {...}}.
+    
+    Requests with "stream": true are instead answered with the records of
+    stream_python_files, each tagged with the request id, followed by a final
+    {"id": 1, "type": "end", "errors": [...], "skipped": [...], "stats": {...}} record.
+    
+    Malformed requests are answered with {"id": ..., "error": "..."}. The worker
+    exits when the input stream is closed.
+    
+    Args:
+        input_stream: Stream to read NDJSON requests from
+        output_stream: Stream to write NDJSON responses to
+    """
+    for line in input_stream:
+        if not line.strip():
+            continue
+        
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            files = [(entry['path'], entry.get('code')) for entry in request['files']]
+            options = {
+                'custom_function': request.get('customFunction'),
+                'cache_dir': request.get('cacheDir'),
+                'providers': request.get('providers'),
+                'profile': bool(request.get('profile')),
+                'skip_policy': request.get('skipPolicy'),
+                'time_budget': request.get('timeBudget'),
+                'max_depth': request.get('maxDepth'),
+                'resolve_constants': request.get('resolveConstants', True),
+                'project_root': request.get('projectRoot'),
+                'require_sdk_import': bool(request.get('requireSdkImport')),
+                'manifest': request.get('manifest'),
+                'scan_id': request.get('scanId'),
+            }
+            
+            if request.get('stream'):
+                def write_record(record: Dict[str, Any]) -> None:
+                    output_stream.write(json.dumps({"id": request_id, **record}) + '\n')
+                
+                summary = stream_python_files(files, write_record, **options)
+                response = {"id": request_id, "type": "end", **summary}
+            else:
+                response = {"id": request_id, **_analyze_files(files, **options)}
+        except Exception as e:
+            response = {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+        
+        output_stream.write(json.dumps(response, default=json_default) + '\n')
+        output_stream.flush()
+
+# Directories skipped when scanning, matching the Node file walker
+SKIPPED_DIRECTORIES = {'node_modules', 'coverage', 'temp', 'tmp', 'log'}
+
+# Largest number of files handed to a pool worker at once
+MAX_CHUNK_SIZE = 64
+
+def find_python_files(paths: Iterable[str]) -> List[str]:
+    """
+    Expand files and directories into the list of Python files to analyze.
+    
+    Explicit files are kept as given, whatever their extension. Directories are
+    walked recursively for .py files, skipping hidden entries and the same
+    dependency/output directories as the Node file walker.
+    
+    Args:
+        paths: File and directory paths
+        
+    Returns:
+        Python file paths, in a stable order
+    """
+    files: List[str] = []
+    
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        
+        for root, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(
+                d for d in dirnames
+                if not d.startswith('.') and d not in SKIPPED_DIRECTORIES
+            )
+            files.extend(
+                os.path.join(root, f) for f in sorted(filenames)
+                if f.endswith('.py') and not f.startswith('.')
+            )
+    
+    return files
+
+def read_file_list(stream: BinaryIO) -> List[str]:
+    """
+    Read Python file paths from a file list such as the output of `git ls-files -z`.
+    
+    Entries are NUL-delimited; newline-delimited lists are accepted when the input
+    contains no NUL byte. Only .py entries are kept.
+    
+    Args:
+        stream: Binary stream containing the file list
+        
+    Returns:
+        Python file paths in list order
+    """
+    data = stream.read()
+    separator = b'\0' if b'\0' in data else b'\n'
+    paths = (os.fsdecode(entry.strip(b'\r') if separator == b'\n' else entry) for entry in data.split(separator))
+    return [path for path in paths if path.endswith('.py')]
+
+# Analysis options shared by all files analyzed in a pool worker process
+_worker_options: Dict[str, Any] = {}
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    """Pool initializer; runs once per worker process after the analyzer is imported."""
+    global _worker_options
+    _worker_options = options
+
+def _analyze_path_chunk(filepaths: List[str]) -> Dict[str, Any]:
+    """Read and analyze a chunk of files inside a pool worker."""
+    return _analyze_files(((filepath, None) for filepath in filepaths), **_worker_options)
+
+def _stream_path_chunk(filepaths: List[str]) -> Tuple[List[str], Dict[str, Any]]:
+    """Read and analyze a chunk of files inside a pool worker, serializing its records as NDJSON lines."""
+    lines: List[str] = []
+    summary = stream_python_files(
+        ((filepath, None) for filepath in filepaths),
+        lambda record: lines.append(json.dumps(record)),
+        **_worker_options
+    )
+    return lines, summary
+
+def _chunk(filepaths: List[str], jobs: int) -> List[List[str]]:
+    """Split files into chunks small enough to balance work across the pool."""
+    chunk_size = max(1, min(MAX_CHUNK_SIZE, len(filepaths) // (jobs * 4)))
+    return [filepaths[i:i + chunk_size] for i in range(0, len(filepaths), chunk_size)]
+
+def _merge_results(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Concatenate chunk results in order and sum their statistics."""
+    merged: Dict[str, Any] = {"events": [], "errors": [], "skipped": [], "stats": {}}
+    for result in results:
+        merged['events'].extend(result['events'])
+        merged['errors'].extend(result['errors'])
+        merged['skipped'].extend(result.get('skipped', []))
+        for key, value in result['stats'].items():
+            merged['stats'][key] = merged['stats'].get(key, 0) + value
+        if 'profile' in result:
+            merged.setdefault('profile', []).extend(result['profile'])
+    return merged
+
+def record_writer(output_stream: TextIO, string_table: Optional[StringTable] = None) -> Callable[[Dict[str, Any]], None]:
+    """
+    Build a function writing NDJSON records to a stream.
+    
+    Args:
+        output_stream: Stream receiving one JSON record per line
+        string_table: Optional string table; event records then refer to file
+            paths and function names by index (see StringTable.encode_record)
+        
+    Returns:
+        Function writing one record
+    """
+    if string_table is None:
+        return lambda record: output_stream.write(json.dumps(record) + '\n')
+    
+    def write_record(record: Dict[str, Any]) -> None:
+        for encoded in string_table.encode_record(record):
+            output_stream.write(json.dumps(encoded) + '\n')
+    return write_record
+
+def write_result_records(
+    filepaths: List[str],
+    result: Dict[str, Any],
+    output_stream: TextIO,
+    string_table: Optional[StringTable] = None
+) -> None:
+    """
+    Write an already collected result as the NDJSON records produced by stream_paths.
+    
+    Used where results are only known once the whole scan is complete, such as
+    incremental scans patching a previous output.
+    """
+    write_record = record_writer(output_stream, string_table)
+    events_by_file: Dict[str, List[Dict[str, Any]]] = {filepath: [] for filepath in filepaths}
+    for event in result['events']:
+        events_by_file.setdefault(event['filePath'], []).append(event)
+    errors_by_file = {error['filePath']: error['error'] for error in result['errors']}
+    skipped_by_file = {skipped['filePath']: skipped['reason'] for skipped in result.get('skipped', [])}
+    
+    for filepath, events in events_by_file.items():
+        write_record({"type": "file_start", "filePath": filepath})
+        for event in events:
+            write_record({"type": "event", **event})
+        end_record = {"type": "file_end", "filePath": filepath, "events": len(events)}
+        if filepath in errors_by_file:
+            end_record['error'] = errors_by_file[filepath]
+        if filepath in skipped_by_file:
+            end_record['skipped'] = skipped_by_file[filepath]
+        write_record(end_record)
+
+def _with_project_constants(filepaths: List[str], options: Dict[str, Any], build: bool) -> Dict[str, Any]:
+    """
+    Add the constant index of the scanned files to the analysis options.
+    
+    With build set, the index is built right away, so a worker pool receives it
+    ready instead of every worker building its own.
+    """
+    if not options.get('resolve_constants', True):
+        return options
+    constants = options.get('constant_index')
+    if constants is None:
+        constants = _project_constants([(filepath, None) for filepath in filepaths], options.get('cache_dir'))
+        options = dict(options, constant_index=constants)
+    if build:
+        constants.build()
+    return options
+
+def _prepare_scan_manifest(options: Dict[str, Any]) -> None:
+    """
+    Load the scan manifest of a worker pool's scan in the parent process.
+    
+    A manifest of another configuration, or with many superseded entries, is
+    rewritten then, so the workers only ever append their entries to it.
+    """
+    if not options.get('manifest') or options.get('profile'):
+        return
+    registry = provider_registry(options.get('custom_function'), options.get('providers'))
+    cache = open_result_cache(options['cache_dir'], registry) if options.get('cache_dir') else None
+    open_scan_manifest(
+        options['manifest'], cache, options.get('prefilter', True), options.get('require_sdk_import', False),
+        options.get('skip_policy')
+    ).save()
+
+def analyze_paths(filepaths: List[str], jobs: int = 1, **options: Any) -> Dict[str, Any]:
+    """
+    Analyze many files on disk, optionally across a pool of worker processes.
+    
+    Files are split into chunks and analyzed by a ProcessPoolExecutor. Each worker
+    imports the analyzer once and keeps it for every chunk it handles. Results are
+    returned in input order regardless of which worker produced them.
+    
+    Args:
+        filepaths: Paths of the Python files to analyze
+        jobs: Number of worker processes; 1 analyzes in the current process
+        **options: Analysis options shared by every file (custom_function, prefilter, cache_dir, providers, profile,
+            skip_policy, time_budget, max_depth, resolve_constants, constant_index, require_sdk_import,
+            manifest)
+        
+    Returns:
+        Dictionary with "events", per-file "errors", "skipped" files and scan "stats"
+    """
+    options = _with_project_constants(filepaths, options, jobs > 1 and len(filepaths) > 1)
+    if jobs <= 1 or len(filepaths) <= 1:
+        return _analyze_files(((filepath, None) for filepath in filepaths), **options)
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    _prepare_scan_manifest(options)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(options,)) as executor:
+        return _merge_results(executor.map(_analyze_path_chunk, _chunk(filepaths, jobs)))
+
+def stream_paths(
+    filepaths: List[str],
+    output_stream: TextIO,
+    jobs: int = 1,
+    string_table: Optional[StringTable] = None,
+    sink: Optional[Callable[[Dict[str, Any]], None]] = None,
+    **options: Any
+) -> Dict[str, Any]:
+    """
+    Analyze many files on disk and write NDJSON records as results become available.
+    
+    In a single process every event is written as soon as the visitor finds it.
+    With a worker pool, each chunk's records are written, in input order, as soon
+    as the chunk completes.
+    
+    Args:
+        filepaths: Paths of the Python files to analyze
+        output_stream: Stream receiving one JSON record per line
+        jobs: Number of worker processes; 1 analyzes in the current process
+        string_table: Optional string table the event records refer to (see record_writer)
+        sink: Optional callback also receiving every record, before any string table
+            encoding, e.g. ResultStore.write_record
+        **options: Analysis options shared by every file (custom_function, prefilter, cache_dir, providers, profile,
+            skip_policy, time_budget, max_depth, resolve_constants, constant_index, require_sdk_import,
+            manifest)
+        
+    Returns:
+        Dictionary with per-file "errors", "skipped" files and scan "stats", plus "profile" when profiling
+    """
+    write_record = record_writer(output_stream, string_table)
+    if sink is not None:
+        write_output = write_record
+        
+        def write_record(record: Dict[str, Any]) -> None:
+            write_output(record)
+            sink(record)
+    options = _with_project_constants(filepaths, options, jobs > 1 and len(filepaths) > 1)
+    if jobs <= 1 or len(filepaths) <= 1:
+        return stream_python_files(((filepath, None) for filepath in filepaths), write_record, **options)
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    _prepare_scan_manifest(options)
+    summaries = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(options,)) as executor:
+        for lines, summary in executor.map(_stream_path_chunk, _chunk(filepaths, jobs)):
+            if string_table is None and sink is None:
+                for line in lines:
+                    output_stream.write(line + '\n')
+            else:
+                # The table is shared by every chunk, so records are encoded (and stored) as they are written
+                for line in lines:
+                    write_record(json.loads(line))
+            summaries.append(summary)
+    
+    merged = _merge_results({"events": [], **summary} for summary in summaries)
+    del merged['events']
+    return merged
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line interface.
+    
+    Args:
+        argv: Command-line arguments, defaults to sys.argv[1:]
+        
+    Returns:
+        Process exit status
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    # The serve worker takes no other arguments, so it starts without building the parser (argparse, shutil, locale)
+    if argv == ['--serve']:
+        serve(sys.stdin, sys.stdout)
+        return 0
+    
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Analyze Python code for analytics tracking calls',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            "Examples:\n"
+            "  %(prog)s myapp.py [--custom-function track_event]\n"
+            "  %(prog)s src/ -c track_event -c 'utils.tracking.emit(name, 2)'\n"
+            "  %(prog)s src/ scripts/ -j 8\n"
+            "  git ls-files -z | %(prog)s --files-from - -j 32"
+        )
+    )
+    parser.add_argument('paths', nargs='*', metavar='path', help='Python files or directories to analyze')
+    parser.add_argument(
+        '-c', '--custom-function',
+        action='append',
+        metavar='SPEC',
+        help=(
+            "Custom tracking function to detect; repeat for several. SPEC is a name or dotted path, "
+            "optionally with the event and properties argument positions or keywords, "
+            "e.g. track_event, 'utils.track(1, 2)' or 'self.tracking.emit(name, props)'"
+        )
+    )
+    parser.add_argument(
+        '--files-from',
+        metavar='FILE',
+        help="Read NUL-delimited file paths from FILE ('-' for stdin), e.g. the output of `git ls-files -z`"
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Number of worker processes (0 uses every CPU, default: 1)'
+    )
+    parser.add_argument(
+        '--providers',
+        metavar='FILE',
+        help='Register extra analytics providers described in a JSON or YAML file'
+    )
+    parser.add_argument(
+        '--no-prefilter',
+        dest='prefilter',
+        action='store_false',
+        help='Parse every file, even those containing no tracking trigger token'
+    )
+    parser.add_argument(
+        '--require-sdk-import',
+        action='store_true',
+        help=(
+            'Also skip files that import no known analytics SDK and mention no custom function; faster, '
+            'but misses SDK clients used in modules that do not import the SDK themselves'
+        )
+    )
+    parser.add_argument(
+        '--no-constants',
+        dest='resolve_constants',
+        action='store_false',
+        help='Only report event names given as string literals, without resolving module constants such as events.SIGNUP'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        metavar='DIR',
+        help='Reuse results for unchanged files from a content-addressed cache in DIR'
+    )
+    parser.add_argument(
+        '--manifest',
+        metavar='FILE',
+        help=(
+            'Record the size, modification time and inode of every file in FILE, so rescans reuse the '
+            'cached results of files whose stat is unchanged without opening them (requires --cache-dir)'
+        )
+    )
+    parser.add_argument(
+        '--base',
+        metavar='REV',
+        help='Only re-analyze files changed since git revision REV (requires --previous)'
+    )
+    parser.add_argument(
+        '--previous',
+        metavar='FILE',
+        help=(
+            'Output of a previous scan of the same paths at the --base revision, in any --format; '
+            'errors and skipped files are only carried over from NDJSON output'
+        )
+    )
+    parser.add_argument(
+        '--max-bytes',
+        type=int,
+        metavar='N',
+        help='Skip files larger than N bytes without parsing them'
+    )
+    parser.add_argument(
+        '--max-lines',
+        type=int,
+        metavar='N',
+        help='Skip files with more than N lines without parsing them'
+    )
+    parser.add_argument(
+        '--skip-generated',
+        action='store_true',
+        help="Skip generated files: protobuf/gRPC modules such as *_pb2.py and files marked '@generated' or 'DO NOT EDIT'"
+    )
+    parser.add_argument(
+        '--deny',
+        action='append',
+        metavar='GLOB',
+        help="Skip files matching GLOB, e.g. 'vendor/*' or '*/migrations/*.py'; repeat for several"
+    )
+    parser.add_argument(
+        '--allow',
+        action='append',
+        metavar='GLOB',
+        help='Never skip files matching GLOB, whatever the other skip rules say; repeat for several'
+    )
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        metavar='SECONDS',
+        help='Stop analyzing a file after SECONDS and report the events found so far with a budget-exceeded warning'
+    )
+    parser.add_argument(
+        '--max-depth',
+        type=int,
+        metavar='N',
+        help='Follow nested property dictionaries at most N levels deep; deeper ones are reported as plain objects'
+    )
+    parser.add_argument(
+        '--skip-report',
+        metavar='FILE',
+        help='Write the skipped files and the reason each was skipped to FILE as JSON'
+    )
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Print scan statistics to stderr'
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='-',
+        metavar='FILE',
+        help=(
+            'Time each phase (read, prefilter, parse, walk, extract, json) of every file and print '
+            'a run summary to stderr; with FILE, also write the per-file profiles and summary as JSON'
+        )
+    )
+    parser.add_argument(
+        '--format',
+        choices=('json', 'ndjson', 'binary'),
+        default='json',
+        help=(
+            "Output a single JSON array (default); NDJSON records written as they are found: "
+            "file_start, event and file_end records per file, then a final summary record; "
+            "or the compact columnar binary format of binaryResults.py"
+        )
+    )
+    parser.add_argument(
+        '--string-table',
+        action='store_true',
+        help=(
+            'Refer to file paths and function names by index into a table of strings: '
+            'JSON output becomes {"strings": [...], "events": [...]}, and NDJSON output '
+            'writes a {"type": "string", "id": n, "value": ...} record before the first use of each string'
+        )
+    )
+    parser.add_argument(
+        '--store',
+        metavar='DB',
+        help=(
+            'Also write the results into the SQLite database DB, replacing earlier results of the same files; '
+            'query it with resultStore.py'
+        )
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help=(
+            'Run as a long-lived worker reading NDJSON requests on stdin and writing NDJSON results on stdout; '
+            'takes no other arguments'
+        )
+    )
+    args = parser.parse_args(argv)
+    
+    if args.serve:
+        parser.error('--serve takes no other arguments')
+    if not args.paths and not args.files_from:
+        parser.error('provide at least one path or --files-from')
+    if bool(args.base) != bool(args.previous):
+        parser.error('--base and --previous must be used together')
+    if args.manifest and not args.cache_dir:
+        parser.error('--manifest requires --cache-dir')
+    
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing:
+        for path in missing:
+            print(f"Error: File '{path}' not found", file=sys.stderr)
+        return 1
+    
+    filepaths = find_python_files(args.paths)
+    if args.files_from == '-':
+        filepaths.extend(read_file_list(sys.stdin.buffer))
+    elif args.files_from:
+        with open(args.files_from, 'rb') as f:
+            filepaths.extend(read_file_list(f))
+    
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    
+    options = {
+        'custom_function': args.custom_function,
+        'prefilter': args.prefilter,
+        'cache_dir': args.cache_dir,
+    }
+    if args.require_sdk_import:
+        options['require_sdk_import'] = True
+    if args.manifest:
+        options['manifest'] = args.manifest
+    if args.resolve_constants:
+        # Every scanned file is indexed, including those an incremental scan does not re-analyze
+        options['constant_index'] = _project_constants([(filepath, None) for filepath in filepaths], args.cache_dir)
+    else:
+        options['resolve_constants'] = False
+    if args.profile:
+        options['profile'] = True
+    skip_policy = {
+        key: value for key, value in (
+            ('maxBytes', args.max_bytes),
+            ('maxLines', args.max_lines),
+            ('skipGenerated', args.skip_generated or None),
+            ('allow', args.allow),
+            ('deny', args.deny),
+        ) if value is not None
+    }
+    if skip_policy:
+        try:
+            _load_skip_policy(skip_policy)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        options['skip_policy'] = skip_policy
+    if args.time_budget is not None or args.max_depth is not None:
+        try:
+            FileBudget.from_options(args.time_budget, args.max_depth)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        options['time_budget'] = args.time_budget
+        options['max_depth'] = args.max_depth
+    if args.providers:
+        try:
+            options['providers'] = load_provider_config(args.providers)
+        except (OSError, ValueError) as e:
+            print(f"Error loading providers from {args.providers}: {e}", file=sys.stderr)
+            return 1
+    try:
+        provider_registry(args.custom_function, options.get('providers'))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    string_table = StringTable() if args.string_table else None
+    
+    store = None
+    if args.store:
+        from resultStore import ResultStore
+        
+        try:
+            store = ResultStore(args.store)
+        except Exception as e:
+            print(f"Error opening results store {args.store}: {e}", file=sys.stderr)
+            return 1
+    
+    try:
+        if args.base:
+            from incrementalScan import incremental_scan, load_previous_scan
+            
+            with open(args.previous, 'rb') as f:
+                data = f.read()
+            try:
+                previous = load_previous_scan(data)
+            except ValueError as e:
+                print(f"Error: {args.previous} is not the output of a previous scan: {e}", file=sys.stderr)
+                return 1
+            
+            def analyze_changed(changed: List[str]) -> Dict[str, Any]:
+                # Fresh events are merged with the previous scan's, which are in JSON shape
+                changed_result = analyze_paths(changed, jobs, **options)
+                changed_result['events'] = [event.to_json() for event in changed_result['events']]
+                return changed_result
+            
+            constants = options.get('constant_index')
+            dependents = (lambda paths: constants.build().dependents(paths)) if constants is not None else None
+            result = incremental_scan(filepaths, previous, args.base, analyze_changed, dependents)
+            if args.format == 'ndjson':
+                write_result_records(filepaths, result, sys.stdout, string_table)
+        elif args.format == 'ndjson':
+            result = stream_paths(filepaths, sys.stdout, jobs, string_table, store.write_record if store else None, **options)
+        else:
+            result = analyze_paths(filepaths, jobs, **options)
+        if store is not None:
+            # Streamed records were stored as they were written
+            if 'events' in result:
+                store.write_result(filepaths, result)
+            store.close()
+    except Exception as e:
+        print(f"Error analyzing files: {str(e)}", file=sys.stderr)
+        return 1
+    
+    # A single explicit file keeps the historical behaviour of silently yielding [] on parse errors
+    for error in result['errors']:
+        if error['error'].startswith(BudgetExceeded.__name__):
+            print(f"Warning: partial results for {error['filePath']}: {error['error']}", file=sys.stderr)
+        elif len(filepaths) > 1:
+            print(f"Warning: skipping {error['filePath']}: {error['error']}", file=sys.stderr)
+    
+    skipped = result.get('skipped', [])
+    if args.skip_report:
+        with open(args.skip_report, 'w', encoding='utf-8') as f:
+            json.dump(skipped, f, indent=2)
+    elif skipped:
+        print(f"Skipped {len(skipped)} files by skip policy (use --skip-report FILE to list them)", file=sys.stderr)
+    
+    stats = result['stats']
+    event_count = stats['events'] if args.format == 'ndjson' and 'events' in stats else len(result['events'])
+    
+    if args.stats:
+        summary = f"{stats.get('prefiltered', 0)} skipped by prefilter, {stats.get('cached', 0)} cached"
+        if skip_policy:
+            summary += f", {stats.get('skipped', 0)} skipped by policy"
+        if 'reused' in stats:
+            summary += f", {stats['reused']} unchanged since {args.base}"
+        if 'unchanged' in stats:
+            summary += f", {stats['unchanged']} unchanged since the last scan"
+        print(
+            f"Analyzed {stats.get('files', 0)} files ({summary}), found {event_count} events",
+            file=sys.stderr
+        )
+    
+    if args.profile:
+        from phaseProfiler import Stopwatch, build_report, format_summary
+        stopwatch = Stopwatch()
+    
+    if args.format == 'ndjson':
+        print(json.dumps({"type": "summary", "errors": result['errors'], "skipped": skipped, "stats": dict(stats, events=event_count)}))
+    elif args.format == 'binary':
+        from binaryResults import write_results
+        
+        sys.stdout.flush()
+        write_results(result['events'], sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+    else:
+        if string_table is not None:
+            events = [string_table.encode_event(event) for event in result['events']]
+            print(json.dumps({"strings": string_table.strings, "events": events}))
+        else:
+            print(json.dumps(result['events'], default=json_default))
+    
+    if args.profile:
+        report = build_report(result.get('profile', []), output=stopwatch.elapsed())
+        print(format_summary(report['summary']), file=sys.stderr)
+        if args.profile != '-':
+            with open(args.profile, 'w', encoding='utf-8') as f:
+                json.dump(report, f)
+    return 0
+
+# Command-line interface
+if __name__ == "__main__":
+    sys.exit(main())
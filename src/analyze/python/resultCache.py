@@ -0,0 +1,131 @@
+"""
+Content-addressed result cache for the Python analytics tracking analyzer.
+
+Analysis results are stored on disk under a key derived from the file contents
+and from everything else that can change the result: the analyzer's own source,
+the provider configuration and the custom function. Unchanged files therefore
+never need to be parsed again, whatever path they are found at.
+
+Entries are JSON files laid out as <cache_dir>/<key[:2]>/<key>.json and are
+written atomically, so concurrent scans sharing a cache directory never observe
+partially written entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Optional
+
+# Bumped whenever the layout of cache entries changes
+CACHE_FORMAT_VERSION = 1
+
+class ResultCache:
+    """
+    On-disk cache of per-file analysis results.
+    
+    Attributes:
+        cache_dir: Directory holding the cache entries
+        namespace: Digest of the analyzer and configuration the entries belong to
+        hits: Number of successful lookups
+        misses: Number of failed lookups
+    """
+    
+    def __init__(self, cache_dir: str, namespace: str):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir: Directory holding the cache entries; created if missing
+            namespace: Digest of the analyzer source and configuration; entries
+                written under a different namespace are never returned
+        """
+        self.cache_dir = cache_dir
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    def key(self, content: bytes) -> str:
+        """
+        Compute the cache key for a file's contents.
+        
+        Args:
+            content: Raw file contents
+        
+        Returns:
+            Hex digest identifying the contents within this cache's namespace
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_FORMAT_VERSION}:{self.namespace}:".encode('ascii'))
+        digest.update(content)
+        return digest.hexdigest()
+    
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+        
+        Unreadable or corrupted entries are treated as misses.
+        
+        Args:
+            key: Cache key from key()
+        
+        Returns:
+            The cached entry, or None on a miss
+        """
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return entry
+    
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Store a result atomically.
+        
+        The entry is written to a temporary file in the target directory and
+        renamed into place. Failures are ignored; the cache is only an accelerator.
+        
+        Args:
+            key: Cache key from key()
+            entry: JSON-serializable result for the file
+        """
+        path = self._entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-', suffix='.json')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, separators=(',', ':'))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
+
+def namespace_digest(*parts: Any) -> str:
+    """
+    Combine the analyzer fingerprint and configuration into a namespace digest.
+    
+    Args:
+        *parts: JSON-serializable values that influence analysis results
+    
+    Returns:
+        Hex digest of the parts
+    """
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,364 @@
+"""
+SQLite results store for the Python analytics tracking analyzer.
+
+Scans of many repositories are easier to query from a database than from one
+JSON document per scan. A ResultStore writes scan results into a local SQLite
+database:
+
+    files            one row per analyzed file: path, event count, error and skip reason
+    events           one row per distinct event name
+    implementations  one row per tracking call: event, file, source, line and function
+    properties       one row per top-level property of a call: name, type and JSON schema
+
+Indexes cover the common questions: where an event is implemented, which
+events use a property, and which calls of a source live under a path.
+
+Results are written per file, and writing a file replaces all of its earlier
+rows, so an incremental re-scan only writes the files it analyzed again.
+Writes are grouped into transactions of BATCH_FILES files, and the database
+uses write-ahead logging, so it can be queried while a scan writes to it.
+
+Usage: python3 resultStore.py DB {event,property,calls} ...  (prints the matching rows as JSON)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from eventModel import TrackingEvent
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+# Stored as the database's user_version; databases of other versions are rejected
+STORE_FORMAT_VERSION = 1
+
+# Files written per transaction
+BATCH_FILES = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    events INTEGER NOT NULL,
+    error TEXT,
+    skipped TEXT,
+    scanned_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS implementations (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    event_id INTEGER NOT NULL REFERENCES events (id),
+    source TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    function TEXT
+);
+CREATE TABLE IF NOT EXISTS properties (
+    implementation_id INTEGER NOT NULL REFERENCES implementations (id),
+    name TEXT NOT NULL,
+    type TEXT,
+    schema TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS implementations_by_event ON implementations (event_id);
+CREATE INDEX IF NOT EXISTS implementations_by_file ON implementations (file_id);
+CREATE INDEX IF NOT EXISTS implementations_by_source ON implementations (source, file_id);
+CREATE INDEX IF NOT EXISTS properties_by_name ON properties (name);
+CREATE INDEX IF NOT EXISTS properties_by_implementation ON properties (implementation_id);
+"""
+
+# Sorts after any path extending a prefix
+_PATH_END = '\U0010ffff'
+
+def _event_name(name: Any) -> str:
+    """Store event names that are not strings as their JSON text, like binaryResults."""
+    return name if isinstance(name, str) else json.dumps(name)
+
+class ResultStore:
+    """
+    SQLite database of analysis results, written per file.
+    
+    Attributes:
+        path: Path of the database file
+        batch_files: Number of files written per transaction
+    """
+    
+    def __init__(self, path: str, batch_files: int = BATCH_FILES):
+        """
+        Open a store, creating the database if needed.
+        
+        Args:
+            path: Path of the database file
+            batch_files: Number of files written per transaction
+        
+        Raises:
+            ValueError: If the database was written by an incompatible version
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.path = path
+        self.batch_files = batch_files
+        # Transactions are begun and committed explicitly, in batches
+        self._db = sqlite3.connect(path, isolation_level=None)
+        self._pending = 0
+        self._written = False
+        self._event_ids: Dict[str, int] = {}
+        self._file_events: List[Dict[str, Any]] = []
+        
+        version = self._db.execute('PRAGMA user_version').fetchone()[0]
+        if version not in (0, STORE_FORMAT_VERSION):
+            self._db.close()
+            raise ValueError(f"{path} is a results store of format {version}, expected {STORE_FORMAT_VERSION}")
+        self._db.execute('PRAGMA journal_mode = WAL')
+        self._db.execute('PRAGMA synchronous = NORMAL')
+        if version == 0:
+            self._db.executescript(SCHEMA)
+            self._db.execute(f'PRAGMA user_version = {STORE_FORMAT_VERSION}')
+    
+    def __enter__(self) -> 'ResultStore':
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
+    def _event_id(self, name: str) -> int:
+        event_id = self._event_ids.get(name)
+        if event_id is None:
+            self._db.execute('INSERT OR IGNORE INTO events (name) VALUES (?)', (name,))
+            event_id = self._db.execute('SELECT id FROM events WHERE name = ?', (name,)).fetchone()[0]
+            self._event_ids[name] = event_id
+        return event_id
+    
+    def write_file(
+        self,
+        filepath: str,
+        events: Iterable[Union[TrackingEvent, Dict[str, Any]]],
+        error: Optional[str] = None,
+        skipped: Optional[str] = None,
+    ) -> None:
+        """
+        Replace the stored results of a file.
+        
+        Args:
+            filepath: Path of the file, as reported on its events
+            events: Events found in the file, as TrackingEvent objects or in JSON shape
+            error: Error message, if the file could not be analyzed completely
+            skipped: Reason the file was skipped, if it was
+        """
+        db = self._db
+        if not self._pending:
+            db.execute('BEGIN')
+        
+        events = [event.to_json() if isinstance(event, TrackingEvent) else event for event in events]
+        row = db.execute('SELECT id FROM files WHERE path = ?', (filepath,)).fetchone()
+        if row is None:
+            file_id = db.execute(
+                'INSERT INTO files (path, events, error, skipped, scanned_at) VALUES (?, ?, ?, ?, ?)',
+                (filepath, len(events), error, skipped, time.time())
+            ).lastrowid
+        else:
+            file_id = row[0]
+            db.execute(
+                'DELETE FROM properties WHERE implementation_id IN (SELECT id FROM implementations WHERE file_id = ?)',
+                (file_id,)
+            )
+            db.execute('DELETE FROM implementations WHERE file_id = ?', (file_id,))
+            db.execute(
+                'UPDATE files SET events = ?, error = ?, skipped = ?, scanned_at = ? WHERE id = ?',
+                (len(events), error, skipped, time.time(), file_id)
+            )
+        
+        properties = []
+        for event in events:
+            implementation_id = db.execute(
+                'INSERT INTO implementations (file_id, event_id, source, line, function) VALUES (?, ?, ?, ?, ?)',
+                (file_id, self._event_id(_event_name(event['eventName'])), event['source'], event['line'],
+                 event['functionName'])
+            ).lastrowid
+            for name, schema in event['properties'].items():
+                properties.append((implementation_id, name, schema.get('type'), json.dumps(schema, sort_keys=True)))
+        db.executemany('INSERT INTO properties (implementation_id, name, type, schema) VALUES (?, ?, ?, ?)', properties)
+        
+        self._pending += 1
+        self._written = True
+        if self._pending >= self.batch_files:
+            self.commit()
+    
+    def write_record(self, record: Dict[str, Any]) -> None:
+        """
+        Write the NDJSON records of stream_python_files as they arrive.
+        
+        A file's events are held until its file_end record, then written with write_file.
+        """
+        kind = record.get('type')
+        if kind == 'file_start':
+            self._file_events = []
+        elif kind == 'event':
+            self._file_events.append(record)
+        elif kind == 'file_end':
+            self.write_file(record['filePath'], self._file_events, record.get('error'), record.get('skipped'))
+            self._file_events = []
+    
+    def write_result(self, filepaths: Sequence[str], result: Dict[str, Any]) -> None:
+        """
+        Write a collected result, such as the one of analyze_paths.
+        
+        Every file in filepaths is written, including those without events, so
+        events removed from a file since an earlier scan disappear from the store.
+        
+        Args:
+            filepaths: Paths of the files the result covers
+            result: Dictionary with "events", "errors" and optionally "skipped"
+        """
+        events_by_file: Dict[str, List[Any]] = {filepath: [] for filepath in filepaths}
+        for event in result['events']:
+            filepath = event.file_path if isinstance(event, TrackingEvent) else event['filePath']
+            events_by_file.setdefault(filepath, []).append(event)
+        errors = {error['filePath']: error['error'] for error in result['errors']}
+        skipped = {entry['filePath']: entry['reason'] for entry in result.get('skipped', [])}
+        
+        for filepath, events in events_by_file.items():
+            self.write_file(filepath, events, errors.get(filepath), skipped.get(filepath))
+    
+    def remove_files(self, filepaths: Iterable[str]) -> None:
+        """Remove the stored results of files, e.g. files deleted since an earlier scan."""
+        db = self._db
+        if not self._pending:
+            db.execute('BEGIN')
+        for filepath in filepaths:
+            row = db.execute('SELECT id FROM files WHERE path = ?', (filepath,)).fetchone()
+            if row is not None:
+                db.execute(
+                    'DELETE FROM properties WHERE implementation_id IN (SELECT id FROM implementations WHERE file_id = ?)',
+                    (row[0],)
+                )
+                db.execute('DELETE FROM implementations WHERE file_id = ?', (row[0],))
+                db.execute('DELETE FROM files WHERE id = ?', (row[0],))
+                self._pending += 1
+                self._written = True
+        if not self._pending:
+            db.execute('COMMIT')
+    
+    def commit(self) -> None:
+        """Commit the files written since the last commit."""
+        if self._pending:
+            self._db.execute('COMMIT')
+            self._pending = 0
+    
+    def close(self) -> None:
+        """Commit, drop event names no call uses any more after writes, and close the database."""
+        self.commit()
+        if self._written:
+            self._db.execute(
+                'DELETE FROM events WHERE NOT EXISTS (SELECT 1 FROM implementations WHERE event_id = events.id)'
+            )
+        self._event_ids.clear()
+        self._db.close()
+    
+    def implementations(
+        self,
+        event: Optional[str] = None,
+        source: Optional[str] = None,
+        under: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find tracking calls, ordered by file and line.
+        
+        Args:
+            event: Only calls of this event name
+            source: Only calls of this source, e.g. "posthog"
+            under: Only calls in this file or in files under this directory, as stored
+        
+        Returns:
+            The calls, as {"eventName", "source", "filePath", "line", "functionName"} dictionaries
+        """
+        conditions = []
+        parameters: List[Any] = []
+        if event is not None:
+            conditions.append('e.name = ?')
+            parameters.append(event)
+        if source is not None:
+            conditions.append('i.source = ?')
+            parameters.append(source)
+        if under is not None:
+            prefix = under.rstrip('/\\') + '/'
+            conditions.append('(f.path = ? OR (f.path >= ? AND f.path < ?))')
+            parameters.extend((under, prefix, prefix + _PATH_END))
+        
+        rows = self._db.execute(
+            'SELECT e.name, i.source, f.path, i.line, i.function '
+            'FROM implementations i JOIN events e ON e.id = i.event_id JOIN files f ON f.id = i.file_id'
+            + (' WHERE ' + ' AND '.join(conditions) if conditions else '')
+            + ' ORDER BY f.path, i.line',
+            parameters
+        )
+        return [
+            {"eventName": name, "source": source, "filePath": path, "line": line, "functionName": function}
+            for name, source, path, line, function in rows
+        ]
+    
+    def events_with_property(self, name: str) -> List[Dict[str, Any]]:
+        """
+        Find the events whose calls pass a top-level property.
+        
+        Args:
+            name: Name of the property
+        
+        Returns:
+            One {"eventName", "type", "implementations"} dictionary per event and
+            property type, counting the calls passing the property with that type
+        """
+        rows = self._db.execute(
+            'SELECT e.name, p.type, COUNT(*) '
+            'FROM properties p JOIN implementations i ON i.id = p.implementation_id JOIN events e ON e.id = i.event_id '
+            'WHERE p.name = ? GROUP BY e.name, p.type ORDER BY e.name, p.type',
+            (name,)
+        )
+        return [{"eventName": event, "type": type_, "implementations": count} for event, type_, count in rows]
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog='resultStore.py',
+        description='Query a results store written by pythonTrackingAnalyzer.py --store'
+    )
+    parser.add_argument('database', help='Path of the results store')
+    commands = parser.add_subparsers(dest='command', required=True)
+    event = commands.add_parser('event', help='Where is an event implemented?')
+    event.add_argument('name', help='Event name')
+    prop = commands.add_parser('property', help='Which events use a property?')
+    prop.add_argument('name', help='Property name')
+    calls = commands.add_parser('calls', help='List tracking calls, e.g. all PostHog calls under a path')
+    calls.add_argument('--source', help='Only calls of this source, e.g. posthog')
+    calls.add_argument('--under', metavar='PATH', help='Only calls in this file or directory, as stored')
+    calls.add_argument('--event', help='Only calls of this event name')
+    args = parser.parse_args(argv)
+    
+    if not os.path.exists(args.database):
+        print(f"Error: results store '{args.database}' not found", file=sys.stderr)
+        return 1
+    try:
+        store = ResultStore(args.database)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    with store:
+        if args.command == 'event':
+            rows = store.implementations(event=args.name)
+        elif args.command == 'property':
+            rows = store.events_with_property(args.name)
+        else:
+            rows = store.implementations(event=args.event, source=args.source, under=args.under)
+    print(json.dumps(rows))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
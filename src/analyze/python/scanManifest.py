@@ -0,0 +1,222 @@
+"""
+Stat-based scan manifest for the Python analytics tracking analyzer.
+
+The result cache spares unchanged files from being parsed, but every file still
+has to be read and hashed to find its cache key. A ScanManifest remembers, for
+each file of earlier scans, its size, modification time and inode, the result
+cache key of its contents and the outcome of its analysis:
+
+    CACHED                the file's events (and error, if any) are cached under its key
+    PREFILTERED           the prefilter rejected the file, so it has no events
+    {"skipped": reason}   the skip policy skipped the file
+
+A file whose stat is unchanged reuses its outcome without being opened. A file
+whose stat changed is read and hashed, and is only analyzed again when its
+contents changed too.
+
+A file modified within RACY_WINDOW_NS of being recorded may be modified again
+without its modification time changing, so its stat is never trusted: like
+git's racily clean index entries, it is hashed on the next scan.
+
+Manifests are JSON lines: a header naming the format and the configuration the
+outcomes belong to, then one [path, size, mtime_ns, inode, digest, outcome]
+line per recorded file, later lines superseding earlier ones. The digest of a
+file the skip policy rejected by path or size, unread, is null. A scan appends
+the files it recorded in one write, so scans of a worker pool can share a
+manifest. Lines that cannot be parsed are ignored, and the manifest is
+rewritten compactly when superseded lines outnumber current ones.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Optional, Tuple, Union
+    
+    # Outcome: ScanManifest.CACHED, ScanManifest.PREFILTERED or {"skipped": reason}
+    Outcome = Union[str, Dict[str, str]]
+
+# Bumped whenever the layout of manifests changes
+MANIFEST_FORMAT_VERSION = 1
+
+# Files modified this recently may change again within the file system's timestamp
+# granularity, so their stat is not trusted
+RACY_WINDOW_NS = 2_000_000_000
+
+# Superseded lines tolerated before a manifest is rewritten compactly
+_COMPACT_SLACK = 1000
+
+class ScanManifest:
+    """
+    Per-file stat, content digest and analysis outcome of earlier scans.
+    
+    Attributes:
+        path: Path of the manifest file
+        namespace: Digest of the analyzer and configuration the outcomes belong to;
+            entries recorded under another namespace are discarded
+        entries: [size, mtime_ns, inode, digest, outcome] of each file, by path;
+            mtime_ns is None when the stat was racy
+    """
+    
+    # Outcome of a file whose results are in the result cache
+    CACHED = 'cached'
+    
+    # Outcome of a file the prefilter rejected
+    PREFILTERED = 'prefiltered'
+    
+    def __init__(self, path: str, namespace: str):
+        """
+        Load a manifest; a missing, unreadable or foreign one starts out empty.
+        
+        Args:
+            path: Path of the manifest file
+            namespace: Digest of the analyzer and configuration (see resultCache.namespace_digest)
+        """
+        self.path = path
+        self.namespace = namespace
+        self.entries: Dict[str, List[Any]] = {}
+        self._recorded: Dict[str, List[Any]] = {}
+        self._rewrite = not self._load()
+    
+    def _header(self) -> str:
+        return json.dumps({"version": MANIFEST_FORMAT_VERSION, "namespace": self.namespace})
+    
+    def _load(self) -> bool:
+        """Read the manifest's entries; returns whether the file can be appended to as it is."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = f.readline()
+                lines = f.read().splitlines()
+        except (OSError, UnicodeDecodeError):
+            return False
+        if header.rstrip('\n') != self._header():
+            return False
+        
+        try:
+            # One parse for the whole file, unless some line is malformed
+            records = json.loads('[' + ','.join(lines) + ']')
+        except ValueError:
+            records = []
+            for line in lines:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    pass
+        for record in records:
+            if isinstance(record, list) and len(record) == 6 and isinstance(record[0], str):
+                self.entries[record[0]] = record[1:]
+        return len(lines) <= 2 * len(self.entries) + _COMPACT_SLACK
+    
+    def lookup(self, filepath: str, stat: os.stat_result) -> Optional[Tuple[Optional[str], Outcome]]:
+        """
+        Find the outcome of a file whose stat is unchanged since it was recorded.
+        
+        Args:
+            filepath: Path of the file
+            stat: Current stat of the file
+        
+        Returns:
+            Tuple of the recorded digest and outcome, or None if the file is not
+            recorded or its stat changed
+        """
+        entry = self.entries.get(filepath)
+        if (
+            entry is None
+            or entry[1] is None
+            or entry[1] != stat.st_mtime_ns
+            or entry[0] != stat.st_size
+            or entry[2] != stat.st_ino
+        ):
+            return None
+        return entry[3], entry[4]
+    
+    def lookup_content(self, filepath: str, digest: str) -> Optional[Outcome]:
+        """
+        Find the outcome of a file whose stat changed but whose contents did not.
+        
+        Args:
+            filepath: Path of the file
+            digest: Result cache key of the file's current contents
+        
+        Returns:
+            The recorded outcome, or None if the file is not recorded or its contents changed
+        """
+        entry = self.entries.get(filepath)
+        if entry is None or entry[3] != digest:
+            return None
+        return entry[4]
+    
+    def record(self, filepath: str, stat: os.stat_result, digest: Optional[str], outcome: Outcome) -> None:
+        """
+        Record the outcome of a file.
+        
+        Args:
+            filepath: Path of the file
+            stat: Stat of the file taken before it was read
+            digest: Result cache key of the contents the outcome was found for,
+                or None if the file was not read
+            outcome: CACHED, PREFILTERED or {"skipped": reason}
+        """
+        mtime_ns: Optional[int] = stat.st_mtime_ns
+        if time.time_ns() - mtime_ns < RACY_WINDOW_NS:
+            mtime_ns = None
+        entry = [stat.st_size, mtime_ns, stat.st_ino, digest, outcome]
+        if self.entries.get(filepath) != entry:
+            self.entries[filepath] = entry
+            self._recorded[filepath] = entry
+    
+    def save(self) -> None:
+        """
+        Write the recorded entries: appended in one write, or as a new compact manifest.
+        
+        Entries are only appended while the manifest still belongs to this
+        namespace; a scan with another configuration may have replaced it since
+        it was loaded. Failures are ignored; the manifest is only an accelerator.
+        """
+        try:
+            if not self._rewrite and self._recorded:
+                self._rewrite = not self._append(
+                    ''.join(json.dumps([path, *entry]) + '\n' for path, entry in self._recorded.items())
+                )
+            if self._rewrite:
+                self._write_all()
+        except OSError:
+            return
+        self._rewrite = False
+        self._recorded.clear()
+    
+    def _append(self, data: str) -> bool:
+        """Append lines to the manifest file; returns False, writing nothing, if it is gone or another namespace's."""
+        header = (self._header() + '\n').encode('utf-8')
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_APPEND)
+        except FileNotFoundError:
+            return False
+        try:
+            if os.read(fd, len(header)) != header:
+                return False
+            os.write(fd, data.encode('utf-8'))
+        finally:
+            os.close(fd)
+        return True
+    
+    def _write_all(self) -> None:
+        """Replace the manifest file atomically with a header and every entry."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.jsonl')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self._header() + '\n')
+                for path, entry in self.entries.items():
+                    f.write(json.dumps([path, *entry]) + '\n')
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,199 @@
+"""
+Skip policy for the Python analytics tracking analyzer.
+
+Large generated modules (protobuf and gRPC stubs, migrations, vendored SDKs,
+frozen data tables) are expensive to parse and never contain tracking calls
+worth reporting. A SkipPolicy decides, before a file is parsed, whether it
+should be skipped and why:
+
+- deny globs, and built-in generated-file name patterns such as *_pb2.py
+- byte and line-count limits
+- generated-code markers such as "@generated" or "DO NOT EDIT" near the top of the file
+
+Files matching an allow glob are never skipped. Every skipped file is reported
+with its reason, so nothing is dropped silently.
+
+Policies are described by a JSON-friendly dictionary (see SkipPolicy.from_options):
+
+    {"maxBytes": 1000000, "maxLines": 20000, "skipGenerated": true,
+     "allow": ["proto/events_pb2.py"], "deny": ["vendor/*", "*/migrations/*"]}
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+
+# Annotations are not evaluated at runtime, so typing is only imported by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+# File name patterns of generated protobuf and gRPC modules
+GENERATED_FILE_PATTERNS = ('*_pb2.py', '*_pb2_grpc.py', '*_pb2.pyi', '*_grpc.py')
+
+# Markers identifying generated code
+GENERATED_MARKERS = ('@generated', 'DO NOT EDIT', 'Generated by the protocol buffer compiler')
+_GENERATED_MARKER_BYTES = tuple(marker.encode('ascii') for marker in GENERATED_MARKERS)
+
+# Generated-code markers are only looked for in this many leading characters (bytes for byte input)
+MARKER_SCAN_CHARS = 2048
+
+def _glob_candidates(filepath: str) -> Tuple[str, ...]:
+    """Return the path and each of its suffixes starting after a separator."""
+    path = filepath.replace(os.sep, '/')
+    return (path,) + tuple(path[i + 1:] for i, char in enumerate(path) if char == '/')
+
+def matches_glob(filepath: str, patterns: Sequence[str]) -> Optional[str]:
+    """
+    Find the first glob pattern matching a path.
+    
+    A pattern matches the whole path or any trailing part of it starting at a
+    directory boundary, so "migrations/*.py" matches "app/migrations/0001.py".
+    "*" also matches directory separators.
+    
+    Args:
+        filepath: Path of the file
+        patterns: Glob patterns
+    
+    Returns:
+        The first matching pattern, or None
+    """
+    if not patterns:
+        return None
+    candidates = _glob_candidates(filepath)
+    for pattern in patterns:
+        if any(fnmatch.fnmatchcase(candidate, pattern) for candidate in candidates):
+            return pattern
+    return None
+
+class SkipPolicy:
+    """
+    Rules deciding which files are skipped before parsing.
+    
+    Attributes:
+        max_bytes: Largest source size in UTF-8 bytes, or None for no limit
+        max_lines: Largest number of lines, or None for no limit
+        skip_generated: Whether generated file names and markers are skipped
+        allow: Glob patterns of files never skipped
+        deny: Glob patterns of files always skipped
+    """
+    
+    __slots__ = ('max_bytes', 'max_lines', 'skip_generated', 'allow', 'deny')
+    
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_lines: Optional[int] = None,
+        skip_generated: bool = False,
+        allow: Sequence[str] = (),
+        deny: Sequence[str] = (),
+    ):
+        self.max_bytes = max_bytes
+        self.max_lines = max_lines
+        self.skip_generated = skip_generated
+        self.allow = tuple(allow)
+        self.deny = tuple(deny)
+    
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> 'SkipPolicy':
+        """
+        Build a policy from its dictionary description.
+        
+        Args:
+            options: Dictionary with optional "maxBytes", "maxLines",
+                "skipGenerated", "allow" and "deny" entries
+        
+        Returns:
+            The policy
+        
+        Raises:
+            ValueError: If the description is invalid
+        """
+        unknown = set(options) - {'maxBytes', 'maxLines', 'skipGenerated', 'allow', 'deny'}
+        if unknown:
+            raise ValueError(f"Unknown skip policy options: {', '.join(sorted(unknown))}")
+        for key in ('maxBytes', 'maxLines'):
+            value = options.get(key)
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+                raise ValueError(f"Skip policy {key} must be a non-negative integer")
+        for key in ('allow', 'deny'):
+            value = options.get(key, ())
+            if isinstance(value, str) or not all(isinstance(pattern, str) for pattern in value):
+                raise ValueError(f"Skip policy {key} must be a list of glob patterns")
+        
+        return cls(
+            max_bytes=options.get('maxBytes'),
+            max_lines=options.get('maxLines'),
+            skip_generated=bool(options.get('skipGenerated')),
+            allow=options.get('allow', ()),
+            deny=options.get('deny', ()),
+        )
+    
+    def path_reason(self, filepath: str, code: Optional[Union[str, bytes]] = None) -> Optional[str]:
+        """
+        Decide from the path and size alone whether a file is skipped, before it is read.
+        
+        Args:
+            filepath: Path of the file
+            code: Source code, if already available; otherwise the size is read from disk
+        
+        Returns:
+            The reason the file is skipped, or None
+        """
+        if matches_glob(filepath, self.allow):
+            return None
+        
+        pattern = matches_glob(filepath, self.deny)
+        if pattern:
+            return f"denied by {pattern}"
+        
+        if self.skip_generated:
+            pattern = matches_glob(os.path.basename(filepath), GENERATED_FILE_PATTERNS)
+            if pattern:
+                return f"generated file ({pattern})"
+        
+        if self.max_bytes is not None:
+            if isinstance(code, bytes):
+                size = len(code)
+            elif code is not None:
+                size = len(code.encode('utf-8', 'surrogatepass'))
+            else:
+                try:
+                    size = os.path.getsize(filepath)
+                except OSError:
+                    # Let the read report the error
+                    return None
+            if size > self.max_bytes:
+                return f"{size} bytes exceeds the {self.max_bytes} byte limit"
+        return None
+    
+    def source_reason(self, filepath: str, code: Union[str, bytes]) -> Optional[str]:
+        """
+        Decide from the source whether a file is skipped, before it is parsed.
+        
+        Args:
+            filepath: Path of the file
+            code: Source code, as text or bytes
+        
+        Returns:
+            The reason the file is skipped, or None
+        """
+        if self.max_lines is None and not self.skip_generated:
+            return None
+        if matches_glob(filepath, self.allow):
+            return None
+        
+        newline, markers = (b'\n', _GENERATED_MARKER_BYTES) if isinstance(code, bytes) else ('\n', GENERATED_MARKERS)
+        
+        if self.max_lines is not None:
+            lines = code.count(newline) + (1 if code and not code.endswith(newline) else 0)
+            if lines > self.max_lines:
+                return f"{lines} lines exceeds the {self.max_lines} line limit"
+        
+        if self.skip_generated:
+            head = code[:MARKER_SCAN_CHARS]
+            for marker, name in zip(markers, GENERATED_MARKERS):
+                if marker in head:
+                    return f"generated code marker '{name}'"
+        return None
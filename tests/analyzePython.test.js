@@ -2,7 +2,17 @@ const test = require('node:test');
 const assert = require('node:assert');
 const path = require('path');
 const fs = require('fs');
-const { analyzePythonFile } = require('../src/analyze/python');
+const os = require('os');
+const { execFileSync, spawnSync } = require('child_process');
+const {
+  analyzePythonFile,
+  analyzePythonFiles,
+  _initPyodide,
+  _analyzeBatchWithPyodide,
+  _analyzeBatchWithNativeWorker,
+  _analyzerModules
+} = require('../src/analyze/python');
+const { findPythonInterpreter } = require('../src/analyze/python/nativeWorker');
 
 test.describe('analyzePythonFile', () => {
   const fixturesDir = path.join(__dirname, 'fixtures');
@@ -312,3 +322,769 @@ def customTrackFunction(event_name: str, params: Dict[str, Any]) -> None:
     fs.unlinkSync(typeTestFile);
   });
 });
+
+test.describe('analyzePythonFiles', () => {
+  const fixturesDir = path.join(__dirname, 'fixtures', 'python');
+  const testFilePath = path.join(fixturesDir, 'main.py');
+  const emptyTestFile = path.join(fixturesDir, 'empty.py');
+
+  test('should return the same events as per-file analysis', async () => {
+    const customFunction = 'customTrackFunction';
+    const batchEvents = await analyzePythonFiles([testFilePath, emptyTestFile], customFunction);
+    const singleEvents = await analyzePythonFile(testFilePath, customFunction);
+
+    assert.strictEqual(batchEvents.length, 8);
+    assert.deepStrictEqual(batchEvents, singleEvents);
+  });
+
+  test('should keep per-file errors separate from the rest of the batch', async () => {
+    const brokenTestFile = path.join(fixturesDir, 'broken_test.py');
+    fs.writeFileSync(brokenTestFile, 'def broken(:\n    pass\n');
+
+    const events = await analyzePythonFiles([brokenTestFile, testFilePath], 'customTrackFunction');
+    assert.strictEqual(events.length, 8);
+    assert.ok(events.every(e => e.filePath === testFilePath));
+
+    fs.unlinkSync(brokenTestFile);
+  });
+
+  test('should reuse cached results for unchanged files', async () => {
+    const cacheDir = path.join(__dirname, 'temp-python-cache');
+    fs.rmSync(cacheDir, { recursive: true, force: true });
+
+    const uncached = await analyzePythonFiles([testFilePath], 'customTrackFunction');
+    const cold = await analyzePythonFiles([testFilePath], 'customTrackFunction', { cacheDir });
+    const warm = await analyzePythonFiles([testFilePath], 'customTrackFunction', { cacheDir });
+
+    assert.ok(fs.readdirSync(cacheDir).length > 0);
+    assert.deepStrictEqual(cold, uncached);
+    assert.deepStrictEqual(warm, uncached);
+
+    fs.rmSync(cacheDir, { recursive: true, force: true });
+  });
+
+  test('should return an empty array for an empty batch', async () => {
+    assert.deepStrictEqual(await analyzePythonFiles([]), []);
+  });
+});
+
+test.describe('Python analysis engines', () => {
+  const fixturesDir = path.join(__dirname, 'fixtures', 'python');
+  const testFiles = [
+    path.join(fixturesDir, 'main.py'),
+    path.join(fixturesDir, 'empty.py'),
+    path.join(fixturesDir, 'missing.py')
+  ];
+
+  test('native worker should report events and per-file errors', { skip: !findPythonInterpreter() && 'no system Python interpreter' }, async () => {
+    const result = await _analyzeBatchWithNativeWorker(testFiles, 'customTrackFunction');
+    assert.strictEqual(result.events.length, 8);
+    assert.strictEqual(result.errors.length, 1);
+    assert.strictEqual(result.errors[0].filePath, testFiles[2]);
+  });
+
+  test('native worker should detect providers registered from a config', { skip: !findPythonInterpreter() && 'no system Python interpreter' }, async () => {
+    const providers = [
+      { name: 'heap', receiver: 'analytics', method: 'track', eventArg: 0 },
+      { name: 'internal', function: 'customTrackFunction', eventArg: 0, propertiesArg: 1 }
+    ];
+    const result = await _analyzeBatchWithNativeWorker([testFiles[0]], null, { providers });
+    const builtIn = await _analyzeBatchWithNativeWorker([testFiles[0]], 'customTrackFunction');
+
+    // Built-in providers keep precedence over config providers claiming the same call
+    assert.deepStrictEqual(
+      result.events.map(e => e.source),
+      builtIn.events.map(e => (e.source === 'custom' ? 'internal' : e.source))
+    );
+  });
+
+  test('native worker should resolve constants changed under a project root since its previous request', { skip: !findPythonInterpreter() && 'no system Python interpreter' }, async () => {
+    const projectRoot = path.join(__dirname, 'temp-python-root');
+    fs.mkdirSync(projectRoot, { recursive: true });
+    const views = path.join(projectRoot, 'views.py');
+    fs.writeFileSync(path.join(projectRoot, 'events.py'), 'SIGNUP = "Signup"\n');
+    fs.writeFileSync(views, 'import events\nanalytics.track(uid, events.SIGNUP)\nanalytics.track(uid, events.LOGIN)\n');
+    try {
+      const eventNames = async () => (await _analyzeBatchWithNativeWorker([views], null, { projectRoot })).events.map(e => e.eventName);
+      assert.deepStrictEqual(await eventNames(), ['Signup']);
+
+      fs.writeFileSync(path.join(projectRoot, 'events.py'), 'SIGNUP = "Signed Up v2"\nfrom names import LOGIN\n');
+      fs.writeFileSync(path.join(projectRoot, 'names.py'), 'LOGIN = "Login"\n');
+      assert.deepStrictEqual(await eventNames(), ['Signed Up v2', 'Login']);
+    } finally {
+      fs.rmSync(projectRoot, { recursive: true, force: true });
+    }
+  });
+
+  test('native worker should index a project root once per scan id', { skip: !findPythonInterpreter() && 'no system Python interpreter' }, async () => {
+    const projectRoot = path.join(__dirname, 'temp-python-scan-root');
+    fs.mkdirSync(projectRoot, { recursive: true });
+    const views = path.join(projectRoot, 'views.py');
+    fs.writeFileSync(path.join(projectRoot, 'events.py'), 'SIGNUP = "Signup"\n');
+    fs.writeFileSync(views, 'import events\nanalytics.track(uid, events.SIGNUP)\n');
+    try {
+      const eventNames = async (scanId) => (await _analyzeBatchWithNativeWorker([views], null, { projectRoot, scanId })).events.map(e => e.eventName);
+      assert.deepStrictEqual(await eventNames('scan-1'), ['Signup']);
+
+      // Later batches of the same scan neither list nor stat the root again
+      fs.writeFileSync(path.join(projectRoot, 'events.py'), 'SIGNUP = "Signed Up"\n');
+      assert.deepStrictEqual(await eventNames('scan-1'), ['Signup']);
+      assert.deepStrictEqual(await eventNames('scan-2'), ['Signed Up']);
+    } finally {
+      fs.rmSync(projectRoot, { recursive: true, force: true });
+    }
+  });
+
+  test('Pyodide should receive every module of the bytecode bundle', { skip: !findPythonInterpreter() && 'no system Python interpreter' }, () => {
+    const moduleDir = fs.mkdtempSync(path.join(os.tmpdir(), 'analyze-python-modules-'));
+    try {
+      // The same files loadAnalyzerModule writes into the Pyodide file system
+      for (const moduleName of _analyzerModules) {
+        fs.copyFileSync(path.join(__dirname, '..', 'src', 'analyze', 'python', `${moduleName}.py`), path.join(moduleDir, `${moduleName}.py`));
+      }
+      const script = 'import sys; sys.path.insert(0, sys.argv[1]); import bytecodeBundle; print(bytecodeBundle.load_bundle(sys.argv[1], sys.argv[2]))';
+      const bundle = execFileSync(findPythonInterpreter(), ['-c', script, moduleDir, path.join(moduleDir, 'bundles')], { encoding: 'utf8' }).trim();
+
+      assert.notStrictEqual(bundle, 'None');
+      assert.ok(fs.existsSync(bundle));
+    } finally {
+      fs.rmSync(moduleDir, { recursive: true, force: true });
+    }
+  });
+
+  test('native worker and Pyodide should return identical results',{ skip: !findPythonInterpreter() && 'no system Python interpreter' }, async (t) => {
+    try {
+      await _initPyodide();
+    } catch (error) {
+      t.skip('Pyodide is not available');
+      return;
+    }
+
+    const nativeResult = await _analyzeBatchWithNativeWorker(testFiles, 'customTrackFunction');
+    const pyodideResult = await _analyzeBatchWithPyodide(testFiles, 'customTrackFunction');
+    assert.deepStrictEqual(nativeResult.events, pyodideResult.events);
+    assert.deepStrictEqual(
+      nativeResult.errors.map(e => e.filePath),
+      pyodideResult.errors.map(e => e.filePath)
+    );
+  });
+
+  test('Pyodide should unmount the directories each batch mounted', async (t) => {
+    let py;
+    try {
+      py = await _initPyodide();
+    } catch (error) {
+      t.skip('Pyodide is not available');
+      return;
+    }
+
+    const otherDir = fs.mkdtempSync(path.join(os.tmpdir(), 'analyze-python-'));
+    const otherFile = path.join(otherDir, 'main.py');
+    fs.copyFileSync(testFiles[0], otherFile);
+    try {
+      const mountPoints = () => py.FS.readdir('/mnt').filter(name => name !== '.' && name !== '..').sort();
+      const first = await _analyzeBatchWithPyodide([testFiles[0]], 'customTrackFunction');
+      const before = mountPoints();
+      const second = await _analyzeBatchWithPyodide([otherFile], 'customTrackFunction');
+
+      assert.deepStrictEqual(mountPoints(), before);
+      assert.deepStrictEqual(second.events.map(e => e.eventName), first.events.map(e => e.eventName));
+      assert.ok(second.events.every(e => e.filePath === otherFile));
+    } finally {
+      fs.rmSync(otherDir, { recursive: true, force: true });
+    }
+  });
+});
+
+test.describe('pythonTrackingAnalyzer.py CLI', { skip: !findPythonInterpreter() && 'no system Python interpreter' }, () => {
+  const analyzerPath = path.join(__dirname, '..', 'src', 'analyze', 'python', 'pythonTrackingAnalyzer.py');
+  const fixturesDir = path.join(__dirname, 'fixtures', 'python');
+  const tempDir = path.join(__dirname, 'temp-python-cli');
+
+  function runAnalyzer(args, input) {
+    return JSON.parse(execFileSync(findPythonInterpreter(), [analyzerPath, ...args], { encoding: 'utf8', input }));
+  }
+
+  test.before(() => {
+    fs.mkdirSync(path.join(tempDir, 'pkg', 'node_modules'), { recursive: true });
+    for (let i = 0; i < 5; i++) {
+      fs.copyFileSync(path.join(fixturesDir, 'main.py'), path.join(tempDir, 'pkg', `module_${i}.py`));
+    }
+    fs.copyFileSync(path.join(fixturesDir, 'main.py'), path.join(tempDir, 'pkg', 'node_modules', 'vendored.py'));
+  });
+
+  test.after(() => {
+    fs.rmSync(tempDir, { recursive: true, force: true });
+  });
+
+  test('should scan directories in parallel with the same result as a sequential scan', () => {
+    const sequential = runAnalyzer([tempDir, '-c', 'customTrackFunction']);
+    const parallel = runAnalyzer([tempDir, '-c', 'customTrackFunction', '-j', '3']);
+
+    assert.strictEqual(sequential.length, 40);
+    assert.ok(sequential.every(e => !e.filePath.includes('node_modules')));
+    assert.deepStrictEqual(parallel, sequential);
+  });
+
+  test('prefilter should never drop events the visitor detects', () => {
+    const snippetsDir = path.join(tempDir, 'prefilter');
+    const snippets = {
+      'segment.py': 'analytics.track(uid, "Segment Event", {"a": 1})',
+      'mixpanel.py': 'mp.track(uid, "Mixpanel Event", {"a": 1})',
+      'rudderstack.py': 'rudder_analytics.track(uid, "Rudder Event", {"a": 1})',
+      'posthog.py': 'posthog.capture(uid, event="PostHog Event", properties={"a": 1})',
+      'amplitude.py': 'client.track(BaseEvent(event_type="Amplitude Event", user_id=uid))',
+      'snowplow_class.py': 't.track(StructuredEvent(action="Snowplow Event", category="c"))',
+      'snowplow_tracker.py': 'tracker.track(ev)',
+      'snowplow_function.py': 'trackStructEvent(category="c")',
+      'custom.py': 'customTrackFunction("Custom Event", {"a": [1, 2]})',
+      'normalized.py': '\uff41nalytics.track(uid, "Normalized Event", {})',
+      'no_tracking.py': 'def track(x):\n    return x.capture()\n'
+    };
+    fs.mkdirSync(snippetsDir, { recursive: true });
+    for (const [name, code] of Object.entries(snippets)) {
+      fs.writeFileSync(path.join(snippetsDir, name), `def handler(uid, ev):\n    ${code.replace(/\n/g, '\n    ')}\n`);
+    }
+
+    const args = [fixturesDir, snippetsDir, '-c', 'customTrackFunction', '--stats'];
+    const filtered = spawnSync(findPythonInterpreter(), [analyzerPath, ...args], { encoding: 'utf8' });
+    const unfiltered = runAnalyzer([...args, '--no-prefilter']);
+
+    assert.deepStrictEqual(JSON.parse(filtered.stdout), unfiltered);
+    assert.strictEqual(unfiltered.length, 16);
+    assert.match(filtered.stderr, /\(2 skipped by prefilter,/);
+  });
+
+  test('should skip parsing unchanged files on a warm --cache-dir re-scan', () => {
+    const cacheDir = path.join(tempDir, 'cache');
+    const args = [analyzerPath, path.join(tempDir, 'pkg'), '-c', 'customTrackFunction', '--cache-dir', cacheDir, '--stats'];
+
+    const cold = spawnSync(findPythonInterpreter(), args, { encoding: 'utf8' });
+    const warm = spawnSync(findPythonInterpreter(), args, { encoding: 'utf8' });
+
+    assert.deepStrictEqual(JSON.parse(warm.stdout), JSON.parse(cold.stdout));
+    assert.match(warm.stderr, /Analyzed 5 files \(0 skipped by prefilter, 5 cached\)/);
+  });
+
+  test('should reuse results of files whose stat is unchanged through a --manifest', () => {
+    const manifestDir = path.join(tempDir, 'manifest');
+    fs.mkdirSync(manifestDir, { recursive: true });
+    const tracked = path.join(manifestDir, 'tracked.py');
+    const plain = path.join(manifestDir, 'plain.py');
+    fs.writeFileSync(tracked, 'analytics.track(uid, "Signed Up", {"plan": "free"})\n');
+    fs.writeFileSync(plain, 'x = 1\n');
+    // Files modified within the last moments are hashed on every scan; age them past that window
+    const age = (file, seconds) => fs.utimesSync(file, new Date(Date.now() - seconds * 1000), new Date(Date.now() - seconds * 1000));
+    age(tracked, 60);
+    age(plain, 60);
+    const args = [analyzerPath, manifestDir, '--cache-dir', path.join(tempDir, 'manifest-cache'), '--manifest', path.join(tempDir, 'scan-manifest.jsonl'), '--stats'];
+    const scan = () => spawnSync(findPythonInterpreter(), args, { encoding: 'utf8' });
+
+    const cold = scan();
+    assert.match(cold.stderr, /Analyzed 2 files \(1 skipped by prefilter, 0 cached, 0 unchanged since the last scan\)/);
+    const warm = scan();
+    assert.deepStrictEqual(JSON.parse(warm.stdout), JSON.parse(cold.stdout));
+    assert.match(warm.stderr, /Analyzed 2 files \(1 skipped by prefilter, 1 cached, 2 unchanged since the last scan\)/);
+
+    // A changed file is analyzed again; a file only touched is hashed and still reused
+    fs.writeFileSync(tracked, 'analytics.track(uid, "Logged In", {"plan": "free"})\n');
+    age(tracked, 30);
+    age(plain, 30);
+    const changed = scan();
+    assert.deepStrictEqual(JSON.parse(changed.stdout).map(e => e.eventName), ['Logged In']);
+    assert.match(changed.stderr, /Analyzed 2 files \(1 skipped by prefilter, 0 cached, 1 unchanged since the last scan\)/);
+
+    const result = spawnSync(findPythonInterpreter(), [analyzerPath, manifestDir, '--manifest', path.join(tempDir, 'scan-manifest.jsonl')], { encoding: 'utf8' });
+    assert.strictEqual(result.status, 2);
+    assert.match(result.stderr, /--manifest requires --cache-dir/);
+  });
+
+  test('should skip oversized and generated files before parsing and report why', () => {
+    const skipDir = path.join(tempDir, 'skip');
+    const source = fs.readFileSync(path.join(fixturesDir, 'main.py'), 'utf8');
+    const files = {
+      'kept.py': source,
+      'events_pb2.py': source,
+      'marked.py': `# @generated by a code generator\n${source}`,
+      'vendor/sdk.py': source,
+      'vendor/allowed.py': source,
+      'large.py': source.repeat(20)
+    };
+    for (const [name, code] of Object.entries(files)) {
+      fs.mkdirSync(path.dirname(path.join(skipDir, name)), { recursive: true });
+      fs.writeFileSync(path.join(skipDir, name), code);
+    }
+
+    const reportPath = path.join(tempDir, 'skipped.json');
+    const events = runAnalyzer([
+      skipDir, '-c', 'customTrackFunction', '--skip-generated', '--max-lines', '1000',
+      '--deny', 'vendor/*', '--allow', 'vendor/allowed.py', '--skip-report', reportPath
+    ]);
+
+    const eventFiles = new Set(events.map(e => path.relative(skipDir, e.filePath)));
+    assert.deepStrictEqual([...eventFiles].sort(), ['kept.py', path.join('vendor', 'allowed.py')]);
+    assert.strictEqual(events.length, 16);
+
+    const reasons = Object.fromEntries(
+      JSON.parse(fs.readFileSync(reportPath, 'utf8')).map(({ filePath, reason }) => [path.relative(skipDir, filePath), reason])
+    );
+    assert.deepStrictEqual(Object.keys(reasons).sort(), ['events_pb2.py', 'large.py', 'marked.py', path.join('vendor', 'sdk.py')].sort());
+    assert.match(reasons['events_pb2.py'], /^generated file/);
+    assert.match(reasons['marked.py'], /@generated/);
+    assert.match(reasons['large.py'], /line limit/);
+    assert.strictEqual(reasons[path.join('vendor', 'sdk.py')], 'denied by vendor/*');
+  });
+
+  test('should keep partial results of files exceeding their budget and report why', () => {
+    const budgetDir = path.join(tempDir, 'budget');
+    fs.mkdirSync(budgetDir, { recursive: true });
+    fs.writeFileSync(path.join(budgetDir, 'chain.py'), `analytics.track(uid, "Chained", {})\nx = ${Array(100000).fill('a').join(' + ')}\n`);
+    fs.writeFileSync(path.join(budgetDir, 'nested.py'), 'analytics.track(uid, "Nested", {"a": {"b": {"c": 1}}, "d": 1})\n');
+    fs.copyFileSync(path.join(fixturesDir, 'main.py'), path.join(budgetDir, 'main.py'));
+
+    const scan = (args) => {
+      const output = execFileSync(findPythonInterpreter(), [analyzerPath, budgetDir, '--format', 'ndjson', ...args], { encoding: 'utf8', stdio: ['ignore', 'pipe', 'ignore'] });
+      const records = output.trim().split('\n').map(line => JSON.parse(line));
+      const errors = Object.fromEntries(records[records.length - 1].errors.map(({ filePath, error }) => [path.basename(filePath), error]));
+      return { events: records.filter(record => record.type === 'event'), errors };
+    };
+
+    const capped = scan(['--max-depth', '1']);
+    assert.deepStrictEqual(Object.keys(capped.errors).sort(), ['chain.py', 'nested.py']);
+    assert.strictEqual(capped.errors['chain.py'], 'BudgetExceeded: nesting too deep to parse');
+    assert.match(capped.errors['nested.py'], /^BudgetExceeded: nesting-depth cap of 1 exceeded at line 1/);
+    const nested = capped.events.find(event => event.eventName === 'Nested');
+    assert.deepStrictEqual(nested.properties, {
+      user_id: { type: 'string' },
+      a: { type: 'object', properties: { b: { type: 'object' } } },
+      d: { type: 'number' }
+    });
+    assert.strictEqual(capped.events.filter(event => path.basename(event.filePath) === 'main.py').length, 7);
+
+    const expired = scan(['--time-budget', '0.000001']);
+    assert.match(expired.errors['main.py'], /^BudgetExceeded: time budget of 1e-06s exceeded during parse$/);
+  });
+
+  test('should warn when analyze_python_code returns partial results', () => {
+    const script = [
+      'import sys',
+      `sys.path.insert(0, ${JSON.stringify(path.dirname(analyzerPath))})`,
+      'from pythonTrackingAnalyzer import analyze_python_code',
+      `print(analyze_python_code(sys.stdin.read(), 'main.py', 'customTrackFunction', max_depth=int(sys.argv[1])))`
+    ].join('\n');
+    const source = 'analytics.track(uid, "Nested", {"a": {"b": {"c": 1}}})\n';
+    const run = (maxDepth) => spawnSync(findPythonInterpreter(), ['-c', script, String(maxDepth)], { encoding: 'utf8', input: source });
+
+    const capped = run(1);
+    assert.deepStrictEqual(JSON.parse(capped.stdout).map(e => e.eventName), ['Nested']);
+    assert.match(capped.stderr, /RuntimeWarning: partial results for main\.py: BudgetExceeded: nesting-depth cap of 1 exceeded/);
+
+    const complete = run(5);
+    assert.deepStrictEqual(JSON.parse(complete.stdout).map(e => e.eventName), ['Nested']);
+    assert.strictEqual(complete.stderr, '');
+  });
+
+  test('should resolve event names defined as module constants in other files', () => {
+    const projectDir = path.join(tempDir, 'constants');
+    const files = {
+      'app/__init__.py': '',
+      'app/events/__init__.py': 'from .names import *\nfrom .kinds import Kinds as K\n',
+      'app/events/names.py': 'SIGNUP_COMPLETED = "Signup Completed"\nLOGIN: str = \'Login\'\nLEGACY_LOGIN = LOGIN\n',
+      'app/events/kinds.py': 'class Kinds:\n    CREATED = "Created"\n',
+      'app/views.py': [
+        'from app import events',
+        'from app.events import names as n, K',
+        'from .events.names import LEGACY_LOGIN',
+        'LOCAL = "Local"',
+        'analytics.track(uid, events.SIGNUP_COMPLETED, {"plan": "pro"})',
+        'analytics.track(uid, n.LOGIN)',
+        'analytics.track(uid, LEGACY_LOGIN)',
+        'analytics.track(uid, K.CREATED)',
+        'analytics.track(uid, LOCAL)',
+        'analytics.track(uid, events.UNDEFINED)',
+        ''
+      ].join('\n')
+    };
+    for (const [name, code] of Object.entries(files)) {
+      fs.mkdirSync(path.dirname(path.join(projectDir, name)), { recursive: true });
+      fs.writeFileSync(path.join(projectDir, name), code);
+    }
+    const cacheDir = path.join(tempDir, 'constants-cache');
+    const eventNames = (args) => runAnalyzer([projectDir, ...args]).map(e => e.eventName);
+
+    const expected = ['Signup Completed', 'Login', 'Login', 'Created', 'Local'];
+    assert.deepStrictEqual(eventNames([]), expected);
+    assert.deepStrictEqual(eventNames(['--cache-dir', cacheDir]), expected);
+    assert.deepStrictEqual(eventNames(['--no-constants']), []);
+
+    // Cached results are not reused once a constant they looked up changes
+    fs.writeFileSync(path.join(projectDir, 'app/events/names.py'), files['app/events/names.py'].replace('Login', 'Log In'));
+    assert.deepStrictEqual(eventNames(['--cache-dir', cacheDir]), ['Signup Completed', 'Log In', 'Log In', 'Created', 'Local']);
+  });
+
+  test('should recognize calls through aliased SDK imports and clients', () => {
+    const aliasDir = path.join(tempDir, 'aliases');
+    fs.mkdirSync(aliasDir, { recursive: true });
+    fs.writeFileSync(path.join(aliasDir, 'aliased.py'), [
+      'import os, segment.analytics as seg',
+      'from posthog import Posthog as PH',
+      'from mixpanel import Mixpanel',
+      'from snowplow_tracker import StructuredEvent as SE, Tracker',
+      'from utils import track_event as te',
+      'ph = PH("key")',
+      'client = Mixpanel("token")',
+      't = Tracker("ns")',
+      'seg.track(uid, "Segment Event", {"a": 1})',
+      'ph.capture(uid, "PostHog Event")',
+      'client.track(uid, "Mixpanel Event")',
+      't.track(SE(action="Snowplow Event", category="shop"))',
+      'te("Custom Event", {})',
+      'client = None',
+      'client.track(uid, "Not Tracked")',
+      ''
+    ].join('\n'));
+    fs.writeFileSync(path.join(aliasDir, 'passed_in.py'), 'def track(analytics, uid):\n    analytics.track(uid, "Passed In")\n');
+    const sources = (args) => runAnalyzer([aliasDir, ...args]).map(e => `${e.source}:${e.eventName}`);
+
+    assert.deepStrictEqual(sources(['-c', 'track_event']), [
+      'segment:Segment Event',
+      'posthog:PostHog Event',
+      'mixpanel:Mixpanel Event',
+      'snowplow:Snowplow Event',
+      'custom:Custom Event',
+      'segment:Passed In'
+    ]);
+
+    // Modules importing no SDK are skipped unless they mention a custom function
+    assert.deepStrictEqual(sources(['--require-sdk-import']), [
+      'segment:Segment Event',
+      'posthog:PostHog Event',
+      'mixpanel:Mixpanel Event',
+      'snowplow:Snowplow Event'
+    ]);
+    fs.writeFileSync(path.join(aliasDir, 'custom.py'), 'track_event("Only Custom", {})\n');
+    assert.deepStrictEqual(sources(['--require-sdk-import', '-c', 'track_event']).filter(s => s.startsWith('custom:')), [
+      'custom:Custom Event',
+      'custom:Only Custom'
+    ]);
+  });
+
+  test('should write results into a queryable SQLite store, replacing re-scanned files', () => {
+    const storeDir = path.join(tempDir, 'store');
+    fs.mkdirSync(path.join(storeDir, 'web'), { recursive: true });
+    fs.writeFileSync(path.join(storeDir, 'web', 'views.py'), [
+      'posthog.capture(uid, "Page Viewed", {"plan": "pro", "count": 1})',
+      'analytics.track(uid, "Signed Up", {"plan": "free"})',
+      ''
+    ].join('\n'));
+    fs.writeFileSync(path.join(storeDir, 'jobs.py'), 'posthog.capture(uid, "Job Ran", {"count": 2})\n');
+    const database = path.join(tempDir, 'results.db');
+    const storePath = path.join(path.dirname(analyzerPath), 'resultStore.py');
+    const query = (...args) => JSON.parse(execFileSync(findPythonInterpreter(), [storePath, database, ...args], { encoding: 'utf8' }));
+
+    runAnalyzer([storeDir, '--store', database]);
+    assert.deepStrictEqual(query('event', 'Signed Up').map(e => [e.source, path.basename(e.filePath), e.line]), [['segment', 'views.py', 2]]);
+    assert.deepStrictEqual(query('property', 'plan'), [
+      { eventName: 'Page Viewed', type: 'string', implementations: 1 },
+      { eventName: 'Signed Up', type: 'string', implementations: 1 }
+    ]);
+    assert.deepStrictEqual(query('calls', '--source', 'posthog', '--under', path.join(storeDir, 'web')).map(e => e.eventName), ['Page Viewed']);
+
+    // Re-scanning a file replaces its rows, whichever output format is used
+    fs.writeFileSync(path.join(storeDir, 'web', 'views.py'), 'posthog.capture(uid, "Page Opened", {"count": 1})\n');
+    execFileSync(findPythonInterpreter(), [analyzerPath, path.join(storeDir, 'web'), '--store', database, '--format', 'ndjson']);
+    assert.deepStrictEqual(query('calls', '--source', 'posthog').map(e => e.eventName), ['Job Ran', 'Page Opened']);
+    assert.deepStrictEqual(query('event', 'Signed Up'), []);
+    assert.deepStrictEqual(query('property', 'plan'), []);
+  });
+
+  test('should decode source files by their BOM or PEP 263 coding declaration', () => {
+    const encodingDir = path.join(tempDir, 'encodings');
+    fs.mkdirSync(encodingDir, { recursive: true });
+    const track = (name) => `analytics.track(uid, "${name}", {"city": "Zürich"})\n`;
+    fs.writeFileSync(path.join(encodingDir, 'latin1.py'), Buffer.from(`# -*- coding: latin-1 -*-\n${track('Café Opened')}`, 'latin1'));
+    fs.writeFileSync(path.join(encodingDir, 'bom.py'), Buffer.concat([Buffer.from([0xef, 0xbb, 0xbf]), Buffer.from(track('BOM Event'))]));
+    fs.writeFileSync(path.join(encodingDir, 'invalid.py'), Buffer.concat([Buffer.from('analytics.track(uid, "Bad '), Buffer.from([0xff]), Buffer.from(' Bytes", {})\n')]));
+
+    const events = runAnalyzer([encodingDir]);
+    const names = Object.fromEntries(events.map(e => [path.basename(e.filePath), e.eventName]));
+
+    assert.deepStrictEqual(names, {
+      'bom.py': 'BOM Event',
+      'invalid.py': 'Bad � Bytes',
+      'latin1.py': 'Café Opened'
+    });
+  });
+
+  test('should run from a precompiled bytecode bundle with the same results', () => {
+    const bundlePath = path.join(path.dirname(analyzerPath), 'bytecodeBundle.py');
+    const bytecodeDir = path.join(tempDir, 'bytecode');
+    const env = { ...process.env, ANALYZE_TRACKING_BYTECODE_DIR: bytecodeDir };
+    const args = [path.join(tempDir, 'pkg'), '-c', 'customTrackFunction'];
+    const runBundle = () => JSON.parse(execFileSync(findPythonInterpreter(), [bundlePath, ...args], { encoding: 'utf8', env }));
+
+    const built = runBundle();
+    const bundles = fs.readdirSync(bytecodeDir);
+    assert.strictEqual(bundles.length, 1);
+    assert.match(bundles[0], /^analyzer-.+\.zip$/);
+
+    assert.deepStrictEqual(built, runAnalyzer(args));
+    assert.deepStrictEqual(runBundle(), built);
+    assert.deepStrictEqual(fs.readdirSync(bytecodeDir), bundles);
+  });
+
+  test('should patch a previous scan with files changed since a git revision', () => {
+    const repoDir = path.join(tempDir, 'repo');
+    const git = (...args) => execFileSync('git', args, { cwd: repoDir, stdio: 'pipe' });
+    fs.mkdirSync(path.join(repoDir, 'app'), { recursive: true });
+    for (const name of ['modified', 'deleted', 'renamed', 'unchanged']) {
+      fs.copyFileSync(path.join(fixturesDir, 'main.py'), path.join(repoDir, 'app', `${name}.py`));
+    }
+    git('init', '-q');
+    git('add', '.');
+    git('-c', 'user.name=test', '-c', 'user.email=test@example.com', 'commit', '-qm', 'base');
+
+    const appDir = path.join(repoDir, 'app');
+    const previousPath = path.join(tempDir, 'previous.json');
+    fs.writeFileSync(previousPath, JSON.stringify(runAnalyzer([appDir, '-c', 'customTrackFunction'])));
+
+    const modifiedPath = path.join(appDir, 'modified.py');
+    fs.writeFileSync(modifiedPath, `\n\n${fs.readFileSync(modifiedPath, 'utf8')}`);
+    git('rm', '-q', 'app/deleted.py');
+    git('mv', 'app/renamed.py', 'app/moved.py');
+    fs.copyFileSync(path.join(fixturesDir, 'main.py'), path.join(appDir, 'added.py'));
+
+    const incremental = runAnalyzer([appDir, '-c', 'customTrackFunction', '--base', 'HEAD', '--previous', previousPath]);
+    const full = runAnalyzer([appDir, '-c', 'customTrackFunction']);
+
+    assert.deepStrictEqual(incremental, full);
+    assert.ok(!incremental.some(e => e.filePath.endsWith('deleted.py') || e.filePath.endsWith('renamed.py')));
+    assert.strictEqual(incremental.find(e => e.filePath === modifiedPath && e.eventName === 'User Signed Up').line, 13);
+  });
+
+  test('should patch NDJSON output spanning several repositories and reject other files as previous scans', () => {
+    const reposDir = path.join(tempDir, 'repos');
+    const commit = (repoDir) => {
+      const git = (...args) => execFileSync('git', args, { cwd: repoDir, stdio: 'pipe' });
+      git('init', '-q');
+      git('add', '.');
+      git('-c', 'user.name=test', '-c', 'user.email=test@example.com', 'commit', '-qm', 'base');
+    };
+    for (const name of ['first', 'second']) {
+      fs.mkdirSync(path.join(reposDir, name), { recursive: true });
+      fs.copyFileSync(path.join(fixturesDir, 'main.py'), path.join(reposDir, name, 'main.py'));
+    }
+    fs.writeFileSync(path.join(reposDir, 'first', 'broken.py'), 'def broken(:\n    analytics.track("Broken")\n');
+    commit(path.join(reposDir, 'first'));
+    commit(path.join(reposDir, 'second'));
+
+    const ndjson = (args) => execFileSync(findPythonInterpreter(), [analyzerPath, reposDir, '-c', 'customTrackFunction', '--string-table', '--format', 'ndjson', ...args], { encoding: 'utf8', stdio: ['ignore', 'pipe', 'ignore'] });
+    const previousPath = path.join(tempDir, 'previous.ndjson');
+    fs.writeFileSync(previousPath, ndjson([]));
+
+    const secondPath = path.join(reposDir, 'second', 'main.py');
+    fs.writeFileSync(secondPath, `\n${fs.readFileSync(secondPath, 'utf8')}`);
+
+    const incremental = ndjson(['--base', 'HEAD', '--previous', previousPath]).trim().split('\n').map(line => JSON.parse(line));
+    const full = ndjson([]).trim().split('\n').map(line => JSON.parse(line));
+    const summary = incremental.pop();
+
+    assert.deepStrictEqual(incremental, full.slice(0, -1));
+    assert.deepStrictEqual(summary.errors.map(e => path.basename(e.filePath)), ['broken.py']);
+    assert.strictEqual(summary.stats.reused, 2);
+
+    const invalidPath = path.join(tempDir, 'invalid.json');
+    fs.writeFileSync(invalidPath, JSON.stringify({ results: [] }));
+    const result = spawnSync(findPythonInterpreter(), [analyzerPath, reposDir, '--base', 'HEAD', '--previous', invalidPath], { encoding: 'utf8' });
+
+    assert.strictEqual(result.status, 1);
+    assert.match(result.stderr, /is not the output of a previous scan/);
+  });
+
+  test('should re-analyze files importing constants changed since a git revision', () => {
+    const repoDir = path.join(tempDir, 'constants-repo');
+    const git = (...args) => execFileSync('git', args, { cwd: repoDir, stdio: 'pipe' });
+    fs.mkdirSync(path.join(repoDir, 'app'), { recursive: true });
+    fs.writeFileSync(path.join(repoDir, 'app', 'events.py'), 'SIGNUP = "Signup"\n');
+    fs.writeFileSync(path.join(repoDir, 'app', '__init__.py'), 'from app.events import *\n');
+    fs.writeFileSync(path.join(repoDir, 'app', 'views.py'), 'import app\n\ndef signup(uid):\n    analytics.track(uid, app.SIGNUP)\n');
+    git('init', '-q');
+    git('add', '.');
+    git('-c', 'user.name=test', '-c', 'user.email=test@example.com', 'commit', '-qm', 'base');
+
+    const previousPath = path.join(tempDir, 'constants-previous.json');
+    fs.writeFileSync(previousPath, JSON.stringify(runAnalyzer([repoDir])));
+    fs.writeFileSync(path.join(repoDir, 'app', 'events.py'), 'SIGNUP = "Signed Up"\n');
+
+    const incremental = runAnalyzer([repoDir, '--base', 'HEAD', '--previous', previousPath]);
+
+    assert.deepStrictEqual(incremental, runAnalyzer([repoDir]));
+    assert.deepStrictEqual(incremental.map(e => e.eventName), ['Signed Up']);
+  });
+
+  test('should read NUL-delimited paths with --files-from -', () => {
+    const files = [path.join(fixturesDir, 'main.py'), path.join(fixturesDir, 'empty.py'), 'README.md'];
+    const events = runAnalyzer(['--files-from', '-', '-c', 'customTrackFunction'], files.join('\0'));
+
+    assert.strictEqual(events.length, 8);
+    assert.ok(events.every(e => e.filePath === files[0]));
+  });
+
+  test('should analyze deeply nested expressions without hitting the recursion limit', () => {
+    const sourcePath = path.join(tempDir, 'deep.py');
+    const expression = Array(1500).fill('1').join(' + ');
+    fs.writeFileSync(sourcePath, `def handler(uid):\n    total = ${expression}\n    analytics.track(uid, "Deep Event", {"total": total})\n`);
+
+    const events = runAnalyzer([sourcePath]);
+
+    assert.strictEqual(events.length, 1);
+    assert.strictEqual(events[0].functionName, 'handler');
+    assert.deepStrictEqual(events[0].properties.total, { type: 'any' });
+  });
+
+  test('should match several custom function specs in a single pass', () => {
+    const sourcePath = path.join(tempDir, 'custom_specs.py');
+    fs.writeFileSync(sourcePath, [
+      'class Checkout:',
+      '    def pay(self, uid):',
+      '        self.tracking.emit(name="Qualified Event", props={"amount": 1})',
+      '        utils.track(uid, "Positional Event", {"plan": "pro"})',
+      '        log_event("Bare Event", {"ignored": True})',
+      '        customTrackFunction("Default Event", {"ok": True})',
+      '        other.tracking.emit(name="Unmatched Event")',
+      ''
+    ].join('\n'));
+
+    const events = runAnalyzer([
+      sourcePath,
+      '-c', 'self.tracking.emit(name, props)',
+      '-c', 'utils.track(1, 2)',
+      '-c', 'log_event(0)',
+      '-c', 'customTrackFunction'
+    ]);
+
+    assert.deepStrictEqual(events.map(e => [e.eventName, Object.keys(e.properties)]), [
+      ['Qualified Event', ['amount']],
+      ['Positional Event', ['plan']],
+      ['Bare Event', []],
+      ['Default Event', ['ok']]
+    ]);
+    assert.ok(events.every(e => e.source === 'custom' && e.functionName === 'pay'));
+  });
+
+  test('should register extra providers from a --providers config', () => {
+    const providersPath = path.join(tempDir, 'providers.json');
+    const sourcePath = path.join(tempDir, 'providers_app.py');
+    fs.writeFileSync(providersPath, JSON.stringify({
+      providers: [
+        { name: 'heap', receiver: 'heap', method: 'track', eventArg: 1, propertiesArg: 2, userIdArg: 0, userIdProperty: 'identity' },
+        { name: 'internal', function: 'emit_event', eventKeyword: 'name', propertiesKeyword: 'props' }
+      ]
+    }));
+    fs.writeFileSync(sourcePath, [
+      'def handler(uid):',
+      '    heap.track(uid, "Heap Event", {"plan": "pro"})',
+      '    emit_event(name="Internal Event", props={"count": 1})',
+      '    analytics.track(uid, "Segment Event")',
+      ''
+    ].join('\n'));
+
+    const events = runAnalyzer([sourcePath, '--providers', providersPath]);
+
+    assert.deepStrictEqual(events.map(e => [e.source, e.eventName]), [
+      ['heap', 'Heap Event'],
+      ['internal', 'Internal Event'],
+      ['segment', 'Segment Event']
+    ]);
+    assert.deepStrictEqual(events[0].properties, { identity: { type: 'string' }, plan: { type: 'string' } });
+    assert.deepStrictEqual(events[1].properties, { count: { type: 'number' } });
+  });
+
+  test('should reject provider descriptions with malformed call paths or keywords', () => {
+    const providersPath = path.join(tempDir, 'invalid_providers.json');
+    const cases = [
+      [{ name: 'bad', function: 'utils.track-event', eventArg: 0 }, /function must be an identifier or a dotted path/],
+      [{ name: 'bad', function: ['track'], eventArg: 0 }, /function must be an identifier or a dotted path/],
+      [{ name: 'bad', function: 'track', eventKeyword: 0 }, /eventKeyword must be an identifier/],
+      [{ name: 'bad', function: 'track', eventArg: 0, propertiesKeyword: 'event props' }, /propertiesKeyword must be an identifier/]
+    ];
+
+    for (const [provider, message] of cases) {
+      fs.writeFileSync(providersPath, JSON.stringify([provider]));
+      const result = spawnSync(findPythonInterpreter(), [analyzerPath, path.join(fixturesDir, 'main.py'), '--providers', providersPath], { encoding: 'utf8' });
+
+      assert.strictEqual(result.status, 1);
+      assert.match(result.stderr, message);
+    }
+  });
+
+  test('should stream NDJSON records with the same events as the JSON output', () => {
+    const args = [path.join(tempDir, 'pkg'), '-c', 'customTrackFunction'];
+    const events = runAnalyzer(args);
+
+    for (const jobs of ['1', '3']) {
+      const output = execFileSync(findPythonInterpreter(), [analyzerPath, ...args, '--format', 'ndjson', '-j', jobs], { encoding: 'utf8' });
+      const records = output.trim().split('\n').map(line => JSON.parse(line));
+
+      assert.deepStrictEqual(
+        records.filter(r => r.type === 'event').map(({ type, ...event }) => event),
+        events
+      );
+      assert.deepStrictEqual(records[0], { type: 'file_start', filePath: path.join(tempDir, 'pkg', 'module_0.py') });
+      assert.deepStrictEqual(records[9], { type: 'file_end', filePath: path.join(tempDir, 'pkg', 'module_0.py'), events: 8 });
+      assert.strictEqual(records.at(-1).type, 'summary');
+      assert.strictEqual(records.at(-1).stats.events, events.length);
+    }
+  });
+
+  test('should refer to file paths and function names through a string table', () => {
+    const args = [path.join(tempDir, 'pkg'), '-c', 'customTrackFunction'];
+    const events = runAnalyzer(args);
+    const resolve = (strings, event) => ({ ...event, filePath: strings[event.filePath], functionName: strings[event.functionName] });
+
+    const { strings, events: encoded } = runAnalyzer([...args, '--string-table']);
+    assert.strictEqual(new Set(strings).size, strings.length);
+    assert.deepStrictEqual(encoded.map(event => resolve(strings, event)), events);
+
+    const output = execFileSync(findPythonInterpreter(), [analyzerPath, ...args, '--string-table', '--format', 'ndjson', '-j', '3'], { encoding: 'utf8' });
+    const records = output.trim().split('\n').map(line => JSON.parse(line));
+    const streamed = [];
+    for (const record of records.filter(r => r.type === 'string')) {
+      streamed[record.id] = record.value;
+    }
+    assert.deepStrictEqual(
+      records.filter(r => r.type === 'event').map(({ type, ...event }) => resolve(streamed, event)),
+      events
+    );
+  });
+
+  test('should round-trip the binary format to the JSON output', () => {
+    const args = [path.join(tempDir, 'pkg'), fixturesDir, '-c', 'customTrackFunction'];
+    const binaryPath = path.join(tempDir, 'results.bin');
+    const events = runAnalyzer(args);
+
+    fs.writeFileSync(binaryPath, execFileSync(findPythonInterpreter(), [analyzerPath, ...args, '--format', 'binary']));
+    assert.strictEqual(fs.readFileSync(binaryPath).subarray(0, 4).toString('latin1'), 'PTAR');
+
+    const readerPath = path.join(path.dirname(analyzerPath), 'binaryResults.py');
+    assert.deepStrictEqual(JSON.parse(execFileSync(findPythonInterpreter(), [readerPath, binaryPath], { encoding: 'utf8' })), events);
+  });
+
+  test('should profile every phase without changing the output', () => {
+    const args = [path.join(tempDir, 'pkg'), '-c', 'customTrackFunction'];
+    const profilePath = path.join(tempDir, 'profile.json');
+    const events = runAnalyzer(args);
+
+    const result = spawnSync(findPythonInterpreter(), [analyzerPath, ...args, '-j', '2', '--profile', profilePath], { encoding: 'utf8' });
+    assert.strictEqual(result.status, 0);
+    assert.deepStrictEqual(JSON.parse(result.stdout), events);
+    assert.match(result.stderr, /Profiled 5 files, \d+ bytes, \d+ AST nodes, 40 events/);
+
+    const { files, summary } = JSON.parse(fs.readFileSync(profilePath, 'utf8'));
+    assert.deepStrictEqual(files.map(f => path.basename(f.filePath)), ['module_0.py', 'module_1.py', 'module_2.py', 'module_3.py', 'module_4.py']);
+    assert.deepStrictEqual(Object.keys(summary.phases), ['read', 'prefilter', 'parse', 'walk', 'extract', 'json']);
+    assert.ok(files.every(f => f.nodes > 0 && f.events === 8 && f.wall.parse > 0));
+    assert.strictEqual(summary.nodes, files.reduce((total, f) => total + f.nodes, 0));
+    assert.ok(summary.fileWall.p50 <= summary.fileWall.p99);
+  });
+});